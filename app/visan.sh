@@ -1,3 +1,5 @@
 #!/usr/bin/env python
 from visan.main import main
-main()
+
+if __name__ == "__main__":
+    main()
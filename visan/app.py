@@ -41,9 +41,14 @@ import harp
 import coda
 
 from .frame import VisanFrame
+from .shell import GetComponentVersions
 from .intro import IntroFrame
 from .harpimport import HarpImportDialog
+from . import harpcache
+from . import startup
 from .productbrowser import ProductBrowser
+from .productbrowser.renderers import CallWhenArrayLoadersIdle
+from .productbrowser import structure
 from . import windowhandler as WindowHandler
 
 from . import VERSION
@@ -51,7 +56,8 @@ from . import VERSION
 
 class VisanApp(wx.App, InspectionMixin):
 
-    def __init__(self):
+    def __init__(self, showStartupTiming=False):
+        self.showStartupTiming = showStartupTiming
         visanhomedir = os.path.dirname(__file__)
         # setup directory locations
         self.homedir = visanhomedir
@@ -63,7 +69,8 @@ class VisanApp(wx.App, InspectionMixin):
             self.docdir = os.path.join(visanhomedir, 'doc')
         self.htmldir = os.path.join(self.docdir, 'html')
 
-        wx.App.__init__(self, redirect=(sys.platform == 'win32'))
+        with startup.Phase("initialize application"):
+            wx.App.__init__(self, redirect=(sys.platform == 'win32'))
 
         wx.SystemOptions.SetOption("mac.listctrl.always_use_generic", "1")
 
@@ -116,22 +123,39 @@ class VisanApp(wx.App, InspectionMixin):
         coda.set_option_perform_conversions(config.ReadBool('CODA/PerformConversions', True))
         coda.set_option_filter_record_fields(config.ReadBool('CODA/FilterRecordFields', True))
 
-        self.frame = VisanFrame(self, "VISAN " + VERSION, WindowHandler.GetNextPosition((800, 640)), (800, 640))
-        self.SetTopWindow(self.frame)
-        self.shell = self.frame.shell
+        # cache of HARP imports (the size is in MiB, a size of 0 disables the cache)
+        harpCacheSize = config.ReadInt('HarpCache/Size', harpcache.DEFAULT_CACHE_SIZE // (1024 * 1024))
+        harpcache.SetCache(os.path.join(userDataDir, 'harpcache'), harpCacheSize * 1024 * 1024)
+
+        # persistent index of the structure of the product types that were opened in the product browser
+        structure.SetIndexDirectory(os.path.join(userDataDir, 'productindex'))
+
+        with startup.Phase("create main window"):
+            self.frame = VisanFrame(self, "VISAN " + VERSION, WindowHandler.GetNextPosition((800, 640)), (800, 640))
+            self.SetTopWindow(self.frame)
+            self.shell = self.frame.shell
 
         self._PrefsToFileHistory()
 
-        self._SetupLogging()
+        with startup.Phase("create session log"):
+            self._SetupLogging()
 
         wx.py.dispatcher.connect(receiver=self.CheckForExit, signal='Interpreter.push')
 
-        self.frame.Show(True)
+        with startup.Phase("show main window"):
+            self.frame.Show(True)
 
         if wx.Config.Get().ReadBool('ShowIntroFrame', True):
-            self.ShowIntro()
+            with startup.Phase("create intro window"):
+                self.ShowIntro()
+
+        with startup.Phase("show splash screen"):
+            self._CreateSplashScreen()
 
-        self._CreateSplashScreen()
+        if self.showStartupTiming:
+            report = startup.GetReport()
+            sys.__stderr__.write(report)
+            self.shell.write(report)
 
         if len(sys.argv) > 1:
             # don't treat macos -psn arguments as a startup script
@@ -211,19 +235,24 @@ class VisanApp(wx.App, InspectionMixin):
                                        wildcard="All Files|*", flags=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST,
                                        parent=self.frame)
         if filename:
-            try:
-                browser = ProductBrowser(self.frame, filename)
-            except coda.CodacError as ex:
-                message = wx.MessageDialog(self.frame,
-                                           "Could not open product.\n\nCODA error message: \"%s\"" % str(ex),
-                                           "CODA error", style=wx.OK | wx.ICON_ERROR | wx.STAY_ON_TOP)
-                message.ShowModal()
-                return
-            browser.SetPosition(WindowHandler.GetNextPosition(browser.GetSize()))
-            if wx.Config.Get().Read("IconFile"):
-                browser.SetIcon(wx.Icon(wx.Config.Get().Read("IconFile")))
-            browser.Show()
-            wx.Config.Get().Write('DirectoryLocation/Products', os.path.dirname(filename))
+            # CODA is not thread safe, so the product is opened once other product browsers are no longer reading
+            # data in the background
+            CallWhenArrayLoadersIdle(self._BrowseProduct, filename)
+
+    def _BrowseProduct(self, filename):
+        try:
+            browser = ProductBrowser(self.frame, filename)
+        except coda.CodacError as ex:
+            message = wx.MessageDialog(self.frame,
+                                       "Could not open product.\n\nCODA error message: \"%s\"" % str(ex),
+                                       "CODA error", style=wx.OK | wx.ICON_ERROR | wx.STAY_ON_TOP)
+            message.ShowModal()
+            return
+        browser.SetPosition(WindowHandler.GetNextPosition(browser.GetSize()))
+        if wx.Config.Get().Read("IconFile"):
+            browser.SetIcon(wx.Icon(wx.Config.Get().Read("IconFile")))
+        browser.Show()
+        wx.Config.Get().Write('DirectoryLocation/Products', os.path.dirname(filename))
 
     def HarpImport(self, filename=None, operations=None, ingestionOptions=None, variableName=None):
         if filename is None:
@@ -240,7 +269,7 @@ class VisanApp(wx.App, InspectionMixin):
             self.shell.clearCommand()
             self.shell.interp.more = False
             self.shell.DocumentEnd()
-            command = "%s = harp.import_product(r\"%s\"" % (variableName, filename)
+            command = "%s = importproduct(r\"%s\"" % (variableName, filename)
             if operations:
                 command += ", operations='%s'" % (operations,)
             if ingestionOptions:
@@ -251,8 +280,8 @@ class VisanApp(wx.App, InspectionMixin):
             self.shell.DocumentEnd()
         else:
             try:
-                data = harp.import_product(filename, operations, ingestionOptions)
-            except harp.Error as ex:
+                data = harpcache.ImportProduct(filename, operations, ingestionOptions)
+            except (harp.Error, OSError) as ex:
                 message = wx.MessageDialog(self.frame,
                                            "Could not import product(s).\n\nHARP error message: \"%s\"" % str(ex),
                                            "HARP error", style=wx.OK | wx.ICON_ERROR | wx.STAY_ON_TOP)
@@ -293,11 +322,23 @@ class VisanApp(wx.App, InspectionMixin):
             mode |= wx.adv.SPLASH_TIMEOUT
         else:
             mode |= wx.adv.SPLASH_NO_TIMEOUT
-        splashscreen = wx.adv.SplashScreen(wx.Bitmap(os.path.join(self.datadir, 'visan-logo.png'), wx.BITMAP_TYPE_PNG),
-                                           mode, 750, self.frame, -1)
+        bitmap = wx.Bitmap(os.path.join(self.datadir, 'visan-logo.png'), wx.BITMAP_TYPE_PNG)
+        if not timeout:
+            # the versions of the components are only determined when needed, since this imports all components
+            self._DrawComponentVersions(bitmap)
+        splashscreen = wx.adv.SplashScreen(bitmap, mode, 750, self.frame, -1)
         splashscreen.Bind(wx.EVT_CLOSE, self.CloseAbout)
         wx.Yield()
 
+    def _DrawComponentVersions(self, bitmap):
+        dc = wx.MemoryDC(bitmap)
+        dc.SetFont(wx.Font(wx.FontInfo(8)))
+        dc.SetTextForeground(wx.BLACK)
+        text = ", ".join(GetComponentVersions())
+        width, height = dc.GetTextExtent(text)
+        dc.DrawText(text, max(0, (bitmap.GetWidth() - width) // 2), bitmap.GetHeight() - height - 5)
+        dc.SelectObject(wx.NullBitmap)
+
     def ShowAbout(self):
         if self.aboutIsShown:
             return
@@ -0,0 +1,159 @@
+# Copyright (C) 2002-2022 S[&]T, The Netherlands.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Batch mode of VISAN
+
+In batch mode VISAN runs a script without a user interface:
+
+    visan --batch script.py [files...]
+
+Without files the script is run once. With files the script is run once for each file, spread over a pool of worker
+processes; within the script sys.argv is [script, file] and the variable 'productfile' holds the file. Plots are
+rendered offscreen, so scripts should export them to image files (using the 'filename' keyword of plot() or wplot()).
+
+A JSON summary is written to stdout (or to the file given with --summary) with for each file whether the script
+succeeded, its wall time, and the image files that were written by plot()/wplot(). Output of the script itself is
+written to stderr. The exit status is 0 if the script succeeded for all files and 1 otherwise.
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+STARTUP_COMMANDS = ["import os", "import sys", "import numpy", "np = numpy", "import coda", "import harp",
+                    "import visan", "import visan.math", "from visan.commands import *"]
+
+
+def _RunScript(script, productfile=None):
+    """Run the script (for a single product file) and return the result for the summary."""
+    from . import commands
+
+    result = {"file": productfile, "success": False, "time": None, "output": [], "error": None}
+    oldargv = sys.argv
+    startTime = time.perf_counter()
+    commands._batch_outputs = result["output"]
+    try:
+        namespace = {"__name__": "__main__", "__file__": script, "productfile": productfile}
+        for command in STARTUP_COMMANDS:
+            exec(command, namespace)
+        sys.argv = [script] if productfile is None else [script, productfile]
+        with open(script) as f:
+            source = f.read()
+        # stdout is reserved for the summary
+        with contextlib.redirect_stdout(sys.stderr):
+            exec(compile(source, script, 'exec'), namespace)
+        result["success"] = True
+    except SystemExit as ex:
+        result["success"] = ex.code in (None, 0)
+        if not result["success"]:
+            result["error"] = "script exited with status %s" % (ex.code,)
+    except Exception:
+        result["error"] = traceback.format_exc()
+    finally:
+        result["time"] = time.perf_counter() - startTime
+        sys.argv = oldargv
+        commands._batch_outputs = None
+    return result
+
+
+def _RunScriptInWorker(script, productfile):
+    # this function is run in a worker process
+    from . import commands
+    commands._batch_mode = True
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    return _RunScript(script, productfile)
+
+
+def RunBatch(script, filenames=None, numWorkers=None):
+    """Run a script in batch mode, once or once for each of the given files, and return the summary."""
+    from . import commands
+
+    script = os.path.abspath(script)
+    if not os.path.isfile(script):
+        raise IOError("the script '%s' does not exist" % (script,))
+    startTime = time.perf_counter()
+    if not filenames:
+        commands._batch_mode = True
+        sys.path.insert(0, os.path.dirname(script))
+        results = [_RunScript(script)]
+    else:
+        if numWorkers is None:
+            numWorkers = os.cpu_count() or 1
+        numWorkers = max(1, min(numWorkers, len(filenames)))
+        results = [None] * len(filenames)
+        # use 'spawn' so each worker starts with a clean state
+        context = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(numWorkers, mp_context=context) as executor:
+            futures = dict((executor.submit(_RunScriptInWorker, script, filename), index)
+                           for index, filename in enumerate(filenames))
+            for future in concurrent.futures.as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception:
+                    # the worker process itself failed (e.g. it crashed)
+                    results[index] = {"file": filenames[index], "success": False, "time": None, "output": [],
+                                      "error": traceback.format_exc()}
+    numSucceeded = sum(1 for result in results if result["success"])
+    return {"script": script, "succeeded": numSucceeded, "failed": len(results) - numSucceeded,
+            "time": time.perf_counter() - startTime, "results": results}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="visan --batch", description="Run a VISAN/Python script without a user "
+                                     "interface, optionally once for each of the given files.")
+    parser.add_argument("script", help="VISAN/Python script to run")
+    parser.add_argument("files", nargs="*", help="files for which the script is run (one run per file)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes (default: the number of processors)")
+    parser.add_argument("--summary", default=None, help="write the JSON summary to this file instead of stdout")
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("the number of jobs should be at least 1")
+
+    try:
+        summary = RunBatch(args.script, args.files, args.jobs)
+    except IOError as ex:
+        parser.error(str(ex))
+
+    if args.summary is not None:
+        with open(args.summary, "w") as f:
+            json.dump(summary, f, indent=2)
+            f.write("\n")
+    else:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0 if summary["failed"] == 0 else 1
@@ -31,14 +31,280 @@
 VISAN command line functions and procedures
 """
 
-__all__ = ['histogramplot', 'plot', 'wplot', 'executescript', 'browseproduct', 'version']
+__all__ = ['histogramplot', 'plot', 'wplot', 'importproduct', 'executescript', 'scriptprogress', 'browseproduct',
+           'version']
 
+import glob
 import os
 import sys
+import threading
 import numpy
 import harp
+from . import harpcache
 from .harpplot import PlotDataForProduct, WorldPlotDataForProduct
 
+# set when running in batch mode (visan --batch), in which plots are always rendered offscreen
+_batch_mode = False
+# list to which the image files written by plot() and wplot() are appended in batch mode (see visan.batch)
+_batch_outputs = None
+
+# interval (in milliseconds) at which the imports of plot() and wplot() are checked when plotting product files
+PRODUCT_IMPORT_POLL_INTERVAL = 100
+
+# grid resolutions (in degrees) from which bin='auto' selects
+BIN_RESOLUTIONS = [0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+
+IMAGE_TYPES = {
+    ".tif": "tif",
+    ".tiff": "tif",
+    ".bmp": "bmp",
+    ".jpg": "jpg",
+    ".jpeg": "jpg",
+    ".png": "png",
+    ".pnm": "pnm",
+}
+
+
+def _image_type_for_filename(filename):
+    extension = os.path.splitext(str(filename))[1].lower()
+    if extension not in IMAGE_TYPES:
+        raise ValueError("parameter 'filename' should have one of the extensions %s (was: '%s')" %
+                         (', '.join(sorted(IMAGE_TYPES)), filename))
+    return IMAGE_TYPES[extension]
+
+
+def _is_filenames_argument(argument):
+    if isinstance(argument, str):
+        return True
+    return isinstance(argument, (list, tuple)) and len(argument) > 0 and all(isinstance(item, str)
+                                                                              for item in argument)
+
+
+def _filenames_for_argument(argument):
+    if isinstance(argument, str):
+        argument = [argument]
+    filenames = []
+    for pattern in argument:
+        matches = sorted(glob.glob(os.path.expanduser(pattern)))
+        if len(matches) == 0:
+            raise IOError("no product files found matching '%s'" % pattern)
+        filenames.extend(matches)
+    return filenames
+
+
+def _offscreen_argument(kwargs):
+    if _batch_mode:
+        if "offscreen" in kwargs and not kwargs["offscreen"]:
+            raise ValueError("parameter 'offscreen' can not be disabled in batch mode")
+        return True
+    return bool(kwargs.get("offscreen", False))
+
+
+def _export_image(window, filename):
+    window.ExportToImageFile(filename, _image_type_for_filename(filename))
+    if _batch_outputs is not None:
+        _batch_outputs.append(os.path.abspath(filename))
+
+
+def _in_script_thread():
+    return threading.current_thread() is not threading.main_thread()
+
+
+def _call_in_main_thread(func, *args, **kwargs):
+    # user interface functions that are called from a background script are executed on the main thread
+    from .scriptrunner import CallInMainThread
+    return CallInMainThread(func, *args, **kwargs)
+
+
+def _import_product(cache, filename, operations, options):
+    # this function is run in a worker process
+    return cache.ImportProduct(filename, operations, options)
+
+
+def _start_imports(filenames, operations, options):
+    import concurrent.futures
+    import multiprocessing
+
+    # use 'spawn' so the workers don't inherit the state of the (GUI) process
+    numWorkers = min(len(filenames), os.cpu_count() or 1)
+    executor = concurrent.futures.ProcessPoolExecutor(numWorkers, mp_context=multiprocessing.get_context("spawn"))
+    futures = [(executor.submit(_import_product, harpcache.GetCache(), filename, operations, options), filename)
+               for filename in filenames]
+    return executor, futures
+
+
+def _import_result(future, filename):
+    # a product that can not be imported should not prevent the import of the other products
+    try:
+        return future.result()
+    except Exception as ex:
+        sys.stderr.write("could not import '%s': %s\n" % (filename, ex))
+        return None
+
+
+def _import_products(filenames, operations, options):
+    """ Import products using a pool of worker processes.
+
+    Products are yielded in the order in which their import finishes. Products that can not be imported are reported
+    and skipped.
+    """
+    import concurrent.futures
+
+    executor, futures = _start_imports(filenames, operations, options)
+    filenameForFuture = dict(futures)
+    finished = False
+    try:
+        for future in concurrent.futures.as_completed(filenameForFuture):
+            product = _import_result(future, filenameForFuture[future])
+            if product is not None:
+                yield product
+        finished = True
+    finally:
+        # only an aborted import should not wait for the imports that are still running; if all imports are done,
+        # wait until the workers have stopped (a process that exits while its workers are stopping can hang)
+        executor.shutdown(wait=finished, cancel_futures=True)
+
+
+class _ProductImport(object):
+    """ Import of products by a pool of worker processes while the user interface keeps running.
+
+    A timer on the main thread passes each imported product to 'callback' and calls 'finished' once all imports are
+    done or the user has cancelled the remaining imports in the (non-modal) progress dialog.
+    """
+
+    def __init__(self, filenames, operations, options, title, callback, finished=None):
+        import wx
+
+        self.callback = callback
+        self.finished = finished
+        self.numProducts = len(filenames)
+        self.numImported = 0
+        self.done = False
+        self.cancelled = False
+        self.error = None
+        self.progressDialog = wx.ProgressDialog(title, "Importing %d products..." % self.numProducts,
+                                                maximum=self.numProducts, style=wx.PD_CAN_ABORT |
+                                                wx.PD_ELAPSED_TIME | wx.PD_REMAINING_TIME)
+        self.executor, self.pending = _start_imports(filenames, operations, options)
+        self.timer = wx.CallLater(PRODUCT_IMPORT_POLL_INTERVAL, self._Poll)
+
+    def _Poll(self):
+        for future, filename in [item for item in self.pending if item[0].done()]:
+            self.pending.remove((future, filename))
+            self.numImported += 1
+            product = _import_result(future, filename)
+            if product is not None:
+                try:
+                    self.callback(product)
+                except Exception as ex:
+                    # e.g. invalid plot properties; stop importing the remaining products
+                    self.error = ex
+                    self._Stop(cancelled=True)
+                    return
+        if len(self.pending) == 0:
+            self._Stop(cancelled=False)
+        elif not self.progressDialog.Update(self.numImported, "Imported %d of %d products" %
+                                            (self.numImported, self.numProducts))[0]:
+            self._Stop(cancelled=True)
+        else:
+            self.timer.Start(PRODUCT_IMPORT_POLL_INTERVAL)
+
+    def _Stop(self, cancelled):
+        self.done = True
+        self.cancelled = cancelled
+        # if all imports are done, wait until the workers have stopped (this only takes a moment)
+        self.executor.shutdown(wait=not cancelled, cancel_futures=True)
+        self.progressDialog.Destroy()
+        if self.finished is not None:
+            self.finished(self)
+
+    def WaitUntil(self, condition):
+        # keep the user interface running until the condition holds or all imports are done
+        import time
+        import wx
+
+        while not self.done and not condition():
+            wx.YieldIfNeeded()
+            time.sleep(0.01)
+
+
+def _bin_location_data(latitude, longitude, data, binsize, statistic):
+    # aggregate point or swath data onto a regular latitude/longitude grid
+    from .math import bin_spatial
+
+    if isinstance(binsize, str):
+        if binsize != "auto":
+            raise ValueError("parameter 'bin' should be 'auto' or a 2-element sequence of numbers (was: '%s')" %
+                             binsize)
+        # use the finest resolution for which the grid has no more cells than half the number of values
+        numValues = numpy.shape(latitude)[0]
+        for resolution in BIN_RESOLUTIONS:
+            if (180.0 / resolution) * (360.0 / resolution) <= numValues / 2:
+                break
+        binsize = (resolution, resolution)
+    try:
+        binsize = tuple(binsize)
+        dlat = float(binsize[0])
+        dlon = float(binsize[1])
+    except (TypeError, ValueError, IndexError):
+        raise TypeError("parameter 'bin' should be 'auto' or a 2-element sequence of numbers (was: '%s')" %
+                        str(binsize))
+    if len(binsize) != 2:
+        raise TypeError("parameter 'bin' should be 'auto' or a 2-element sequence of numbers (was: '%s')" %
+                        str(binsize))
+    if dlat <= 0 or dlon <= 0:
+        raise ValueError("parameter 'bin' must contain positive numbers (was: '%s')" % str(binsize))
+    if statistic is None:
+        statistic = "mean" if data is not None else "count"
+    latitudeEdges = numpy.linspace(-90, 90, max(1, int(numpy.ceil(180.0 / dlat))) + 1)
+    longitudeEdges = numpy.linspace(-180, 180, max(1, int(numpy.ceil(360.0 / dlon))) + 1)
+    grid = bin_spatial(latitude, longitude, data, latitudeEdges, longitudeEdges, statistic)
+    return (latitudeEdges[:-1] + latitudeEdges[1:]) / 2, (longitudeEdges[:-1] + longitudeEdges[1:]) / 2, grid
+
+
+def _plot_products(funcname, filenames, kwargs, datasetproperties, showprogress):
+    # plot all products in the same window (using plot() or wplot()) as soon as they are imported
+    plotfunc = globals()[funcname]
+    kwargs = dict(kwargs)
+    operations = kwargs.pop("operations", None) or ""
+    options = kwargs.pop("options", None) or ""
+    filename = kwargs.pop("filename", None)
+    window = kwargs.get("window")
+    datasetkwargs = dict((key, kwargs[key]) for key in datasetproperties if key in kwargs)
+    if not showprogress:
+        for product in _import_products(filenames, operations, options):
+            if window is None:
+                window = plotfunc(product, **kwargs)
+            else:
+                plotfunc(product, window=window, **datasetkwargs)
+        if filename is not None and window is not None:
+            _export_image(window, filename)
+        return window
+
+    # the user interface keeps running while the products are imported; the call only waits until the window has
+    # been created for the first product, the other products are added to the window once they have been imported
+    windows = [window]
+
+    def add(product):
+        if windows[0] is None:
+            windows[0] = plotfunc(product, **kwargs)
+        elif windows[0]:
+            plotfunc(product, window=windows[0], **datasetkwargs)
+
+    def finished(productImport):
+        if productImport.error is not None:
+            if windows[0] is not None:
+                # the call has already returned, so the error can only be reported
+                sys.stderr.write("could not plot product: %s\n" % (productImport.error,))
+        elif filename is not None and windows[0]:
+            _export_image(windows[0], filename)
+
+    productImport = _ProductImport(filenames, operations, options, "%s()" % funcname, add, finished)
+    productImport.WaitUntil(lambda: windows[0] is not None)
+    if productImport.error is not None:
+        raise productImport.error
+    return windows[0]
+
 
 def histogramplot(data, bins, *args, **kwargs):
     """ Draw a histogram plot.
@@ -54,14 +320,25 @@ def histogramplot(data, bins, *args, **kwargs):
     Both 'data' and 'bins' should be rank-1 arrays and the array length of
     'data' should be one less than the length of 'bins'.
 
+    If 'data' is a rank-2 array (e.g. the output of the histogram2d()
+    function) then each row of 'data' is treated as a separate histogram
+    over 'bins'. The rows will be shown as consecutive frames of an animated
+    plot. The length of the last dimension of 'data' should be one less than
+    the length of 'bins'.
+
     For customizing the plot you can use the same additional options as are
     available for the plot() function.
     """
 
     data = numpy.asarray(data)
     bins = numpy.asarray(bins)
+    if data.ndim not in (1, 2):
+        raise ValueError("parameter 'data' should be a rank-1 or rank-2 array (was: rank-%d)" % data.ndim)
+    if bins.ndim != 1 or data.shape[-1] != len(bins) - 1:
+        raise ValueError("parameter 'bins' should be a rank-1 array with one element more than the last dimension "
+                         "of 'data'")
     x = numpy.transpose(numpy.reshape(numpy.concatenate([bins[:-1], bins[1:]]), (2, len(bins) - 1))).ravel()
-    y = numpy.transpose(numpy.reshape(numpy.concatenate([data, data]), (2, len(data)))).ravel()
+    y = numpy.repeat(data, 2, axis=-1)
     plot(x, y, *args, **kwargs)
 
 
@@ -108,12 +385,30 @@ def plot(*args, **kwargs):
     will create a 2D plot for the specified variable of the HARP
     product.
 
+    >>> plot('/data/*.nc', operations='latitude>0', options='')
+
+    where the first argument is a filename, a glob pattern, or a
+    list of these, will import all matching products using HARP
+    (with the given 'operations' and ingestion 'options') and
+    plot each product in the same window as soon as it has been
+    imported. The imports are performed in parallel by a pool of
+    worker processes and a progress dialog allows the remaining
+    imports to be cancelled.
+
     >>> w = plot(data1)
     >>> plot(data2, window=w)
 
     will plot data2 in the same window 'w' as used for data1,
     instead of opening a separate window.
 
+    >>> plot(data, offscreen=True, filename='data.png')
+
+    will render the plot without opening a window (no display is
+    needed) and save the result as an image file. The image type
+    is derived from the extension of 'filename' (tif, bmp, jpg,
+    png, or pnm). The 'filename' property can also be used to save
+    an image of a regular plot window.
+
     In addition to the 'window' keyword, the plot() function also
     accepts a number of other, comma-separated optional
     properties of the form 'property=value'. Their order is
@@ -124,20 +419,25 @@ def plot(*args, **kwargs):
     window, windowtitle, size, pos, title, xrange, yrange,
     xmin, xmax, ymin, ymax, xlog, ylog, xbase, ybase, xlabel,
     ylabel, xnumticks, ynumticks, numticks, showanimationtoolbar,
-    showpropertypanel,
-    value, name, lines, linewidth, stipplepattern, points,
+    showpropertypanel, offscreen, filename,
+    value, operations, options, name, lines, linewidth, stipplepattern, points,
     pointsize, color, opacity.
 
     """
+    if _in_script_thread():
+        # 'plot' is also used as a local variable in this function, so look up the function itself explicitly
+        return _call_in_main_thread(globals()["plot"], *args, **kwargs)
+
     import wx
     from . import windowhandler as WindowHandler
-    from visan.plot import PlotFrame
+    from visan.plot import OffscreenPlotFrame, PlotFrame
 
     # validate all arguments
 
     defaultProperties = dict()
     dataSetAttributes = dict()
     dataSetLocation = []
+    filenames = None
     xdata = None
     ydata = None
     value = None
@@ -152,6 +452,11 @@ def plot(*args, **kwargs):
                 raise ValueError("plot() does not allow additional data arguments when the first argument "
                                  "is a HARP product")
             xdata, ydata, dataSetAttributes, dataSetLocation, defaultProperties = PlotDataForProduct(args[0], value)
+        elif _is_filenames_argument(args[0]):
+            if len(args) != 1:
+                raise ValueError("plot() does not allow additional data arguments when the first argument "
+                                 "is a list of product files")
+            filenames = _filenames_for_argument(args[0])
         else:
             if value is not None:
                 raise ValueError("parameter 'value' (%s) is only allowed when plotting a HARP product" % value)
@@ -173,8 +478,9 @@ def plot(*args, **kwargs):
 
     knownproperties = ["value", "window", "windowtitle", "size", "pos", "title", "xrange", "yrange", "xmin", "xmax",
                        "ymin", "ymax", "xlog", "ylog", "xbase", "ybase", "xlabel", "ylabel", "xnumticks", "ynumticks",
-                       "numticks", "showanimationtoolbar", "showpropertypanel", "name", "lines", "linewidth",
-                       "stipplepattern", "points", "pointsize", "color", "opacity"]
+                       "numticks", "showanimationtoolbar", "showpropertypanel", "offscreen", "filename", "name",
+                       "lines", "linewidth", "stipplepattern", "points", "pointsize", "color", "opacity", "operations",
+                       "options"]
 
     unknowns = [k for k in list(kwargs.keys()) if k not in knownproperties]
 
@@ -185,14 +491,27 @@ def plot(*args, **kwargs):
         raise TypeError("Invalid keywords: %s\n(Supported keywords are: %s)" %
                         (', '.join(unknowns), ', '.join(knownproperties)))
 
+    # offscreen
+    offscreen = _offscreen_argument(kwargs)
+
     # window
     window = kwargs.get("window")
     if window is not None:
-        if not isinstance(window, PlotFrame):
+        if isinstance(window, OffscreenPlotFrame):
+            offscreen = True
+        elif offscreen:
+            raise ValueError("parameter 'window' (%s) does not refer to an offscreen plot" % window)
+        elif not isinstance(window, PlotFrame):
             raise ValueError("parameter 'window' (%s) does not refer to a plot window" % window)
-        if not window:
+        elif not window:
             raise ValueError("parameter 'window' refers to a window that no longer exists")
 
+    # filename
+    filename = kwargs.get("filename")
+    if filename is not None:
+        # check the image type before anything is plotted
+        _image_type_for_filename(filename)
+
     # windowtitle
     windowtitle = kwargs.get("windowtitle")
     if windowtitle is not None:
@@ -215,17 +534,20 @@ def plot(*args, **kwargs):
             raise TypeError("parameter 'size' should be a 2-element sequence of numbers (was: '%s')" % str(size))
         if x <= 0 or y <= 0:
             raise ValueError("parameter 'size' must contain positive numbers (was: '%s')" % str(size))
-        xmax = wx.SystemSettings.GetMetric(wx.SYS_SCREEN_X)
-        if x > xmax:
-            raise ValueError("x component of 'size' parameter must not exceed maximum screen width ('%g' > '%g')" %
-                             (x, xmax))
-        ymax = wx.SystemSettings.GetMetric(wx.SYS_SCREEN_Y)
-        if y > ymax:
-            raise ValueError("y component of 'size' parameter must not exceed maximum screen heigth ('%g' > '%g')" %
-                             (y, ymax))
+        if not offscreen:
+            xmax = wx.SystemSettings.GetMetric(wx.SYS_SCREEN_X)
+            if x > xmax:
+                raise ValueError("x component of 'size' parameter must not exceed maximum screen width "
+                                 "('%g' > '%g')" % (x, xmax))
+            ymax = wx.SystemSettings.GetMetric(wx.SYS_SCREEN_Y)
+            if y > ymax:
+                raise ValueError("y component of 'size' parameter must not exceed maximum screen heigth "
+                                 "('%g' > '%g')" % (y, ymax))
 
     # pos
     pos = kwargs.get("pos")
+    if pos is not None and offscreen:
+        raise ValueError("parameter 'pos' is not applicable to offscreen plots")
     if pos is not None:
         try:
             pos = tuple(pos)
@@ -261,17 +583,29 @@ def plot(*args, **kwargs):
     if kwargs.get("numticks") is not None and kwargs.get("ynumticks") is not None:
         raise ValueError("it is not allowed to specify both 'numticks' and 'ynumticks' in a single call")
 
+    if filenames is not None:
+        return _plot_products("plot", filenames, kwargs, ["value", "name", "lines", "linewidth", "stipplepattern",
+                                                          "points", "pointsize", "color", "opacity"], not offscreen)
+    for key in ["operations", "options"]:
+        if kwargs.get(key) is not None:
+            raise ValueError("parameter '%s' is only allowed when plotting product files" % key)
+
     # process arguments
 
     if window is None:
         if size is None:
             size = WindowHandler.GetDefaultSize()
-        if pos is None:
-            pos = WindowHandler.GetNextPosition(size)
-        plot = PlotFrame(size=size, pos=pos)
+        if offscreen:
+            plot = OffscreenPlotFrame(size=size)
+        else:
+            if pos is None:
+                pos = WindowHandler.GetNextPosition(size)
+            plot = PlotFrame(size=size, pos=pos)
     else:
         plot = window
         if size is not None:
+            if offscreen:
+                raise ValueError("parameter 'size' can not be changed for an existing offscreen plot")
             plot.SetSize(size)
         if pos is not None:
             plot.Move(pos)
@@ -385,6 +719,9 @@ def plot(*args, **kwargs):
         raise
     plot.Thaw()
 
+    if filename is not None:
+        _export_image(plot, filename)
+
     return plot
 
 
@@ -441,6 +778,31 @@ def wplot(*args, **kwargs):
     will create a worldmap plot for the specified variable of the
     HARP product.
 
+    >>> wplot(['orbit1.nc', 'orbit2.nc'], operations='latitude>0')
+
+    where the first argument is a filename, a glob pattern, or a
+    list of these, will import all matching products using HARP
+    (with the given 'operations' and ingestion 'options') and
+    plot each product in the same world map window as soon as it
+    has been imported. The imports are performed in parallel by a
+    pool of worker processes and a progress dialog allows the
+    remaining imports to be cancelled.
+
+    >>> wplot(latitude, longitude, data, bin=(0.5, 0.5))
+
+    will aggregate point or swath data onto a regular latitude/longitude
+    grid with cells of 0.5 x 0.5 degrees and plot the result as grid
+    data. Use bin='auto' to let the grid resolution be chosen based on
+    the number of values. The 'binstatistic' property determines how the
+    values within a grid cell are combined ('mean', 'count', 'min', or
+    'max'; default is 'mean', or 'count' if there is no data).
+
+    >>> wplot(latitude, longitude, data, offscreen=True, filename='map.png')
+
+    will render the world plot without opening a window (no display
+    is needed) and save the result as an image file. The image type
+    is derived from the extension of 'filename'.
+
     The wplot() function also accepts a number of comma-separated
     optional properties of the form 'property=value'. Their order
     is arbitrary, but they must always appear after any data
@@ -450,14 +812,18 @@ def wplot(*args, **kwargs):
     window, windowtitle, size, pos, title, centerlat,
     centerlon, zoom, projection, projectionlat, projectionlon,
     showanimationtoolbar, showpropertypanel, showcolorbar,
-    value, colortable, colorrange, colorbartitle, numcolorlabels,
-    opacity, linewidth, pointsize, drawpath, drawlocation,
-    heightfactor, minheightvalue, maxheightvalue, deltaradius.
+    offscreen, filename, value, operations, options, colortable,
+    colorrange, colorbartitle, numcolorlabels, opacity, linewidth, pointsize, drawpath, drawlocation,
+    heightfactor, minheightvalue, maxheightvalue, deltaradius, bin,
+    binstatistic.
 
     """
+    if _in_script_thread():
+        return _call_in_main_thread(wplot, *args, **kwargs)
+
     import wx
     from . import windowhandler as WindowHandler
-    from visan.plot import WorldPlotFrame
+    from visan.plot import OffscreenWorldPlotFrame, WorldPlotFrame
 
     kPointData = 0
     kSwathData = 1
@@ -467,6 +833,7 @@ def wplot(*args, **kwargs):
 
     defaultProperties = dict()
     dataSetAttributes = dict()
+    filenames = None
     latitude = None
     longitude = None
     data = None
@@ -492,6 +859,11 @@ def wplot(*args, **kwargs):
                                  "HARP product")
             datatype, data, latitude, longitude, dataSetAttributes, defaultProperties = \
                 WorldPlotDataForProduct(args[0], plotPoints or plotLines, value)
+        elif _is_filenames_argument(args[0]):
+            if len(args) != 1:
+                raise ValueError("wplot() does not allow additional data arguments when the first argument is a "
+                                 "list of product files")
+            filenames = _filenames_for_argument(args[0])
         else:
             if value is not None:
                 raise ValueError("parameter 'value' (%s) is only allowed when plotting a HARP product" % value)
@@ -535,9 +907,10 @@ def wplot(*args, **kwargs):
 
     knownproperties = ["window", "windowtitle", "size", "pos", "title", "centerlat", "centerlon", "zoom", "projection",
                        "projectionlat", "projectionlon", "showanimationtoolbar", "showpropertypanel", "showcolorbar",
-                       "value", "colortable", "colorrange", "colorbartitle", "numcolorlabels", "opacity", "linewidth",
-                       "pointsize", "drawpath", "drawlocation", "heightfactor", "minheightvalue", "maxheightvalue",
-                       "deltaradius"]
+                       "offscreen", "filename", "value", "colortable", "colorrange", "colorbartitle", "numcolorlabels",
+                       "opacity", "linewidth", "pointsize", "drawpath", "drawlocation", "heightfactor",
+                       "minheightvalue", "maxheightvalue", "deltaradius", "operations", "options", "bin",
+                       "binstatistic"]
 
     unknowns = [k for k in list(kwargs.keys()) if k not in knownproperties]
 
@@ -547,14 +920,27 @@ def wplot(*args, **kwargs):
         raise TypeError("Invalid keywords: %s\n(Supported keywords are: %s)" %
                         (', '.join(unknowns), ', '.join(knownproperties)))
 
+    # offscreen
+    offscreen = _offscreen_argument(kwargs)
+
     # window
     window = kwargs.get("window")
     if window is not None:
-        if not isinstance(window, WorldPlotFrame):
+        if isinstance(window, OffscreenWorldPlotFrame):
+            offscreen = True
+        elif offscreen:
+            raise ValueError("parameter 'window' (%s) does not refer to an offscreen plot" % window)
+        elif not isinstance(window, WorldPlotFrame):
             raise ValueError("parameter 'window' (%s) does not refer to a wplot window" % window)
-        if not window:
+        elif not window:
             raise ValueError("parameter 'window' refers to a window that no longer exists")
 
+    # filename
+    filename = kwargs.get("filename")
+    if filename is not None:
+        # check the image type before anything is plotted
+        _image_type_for_filename(filename)
+
     # windowtitle
     windowtitle = kwargs.get("windowtitle")
     if windowtitle is not None:
@@ -577,17 +963,20 @@ def wplot(*args, **kwargs):
             raise TypeError("parameter 'size' should be a 2-element sequence of numbers (was: '%s')" % str(size))
         if x <= 0 or y <= 0:
             raise ValueError("parameter 'size' must contain positive numbers (was: '%s')" % str(size))
-        xmax = wx.SystemSettings.GetMetric(wx.SYS_SCREEN_X)
-        if x > xmax:
-            raise ValueError("x component of 'size' parameter must not exceed maximum screen width ('%g' > '%g')" %
-                             (x, xmax))
-        ymax = wx.SystemSettings.GetMetric(wx.SYS_SCREEN_Y)
-        if y > ymax:
-            raise ValueError("y component of 'size' parameter must not exceed maximum screen heigth ('%g' > '%g')" %
-                             (y, ymax))
+        if not offscreen:
+            xmax = wx.SystemSettings.GetMetric(wx.SYS_SCREEN_X)
+            if x > xmax:
+                raise ValueError("x component of 'size' parameter must not exceed maximum screen width "
+                                 "('%g' > '%g')" % (x, xmax))
+            ymax = wx.SystemSettings.GetMetric(wx.SYS_SCREEN_Y)
+            if y > ymax:
+                raise ValueError("y component of 'size' parameter must not exceed maximum screen heigth "
+                                 "('%g' > '%g')" % (y, ymax))
 
     # pos
     pos = kwargs.get("pos")
+    if pos is not None and offscreen:
+        raise ValueError("parameter 'pos' is not applicable to offscreen plots")
     if pos is not None:
         try:
             pos = tuple(pos)
@@ -609,17 +998,45 @@ def wplot(*args, **kwargs):
             raise ValueError("y component of 'pos' parameter must not exceed maximum screen heigth ('%g' > '%g')" %
                              (y, ymax))
 
+    if filenames is not None:
+        return _plot_products("wplot", filenames, kwargs, ["value", "colortable", "colorrange", "colorbartitle",
+                                                           "numcolorlabels", "opacity", "linewidth", "pointsize",
+                                                           "drawpath", "drawlocation", "heightfactor",
+                                                           "minheightvalue", "maxheightvalue", "deltaradius", "bin",
+                                                           "binstatistic"],
+                              not offscreen)
+    for key in ["operations", "options"]:
+        if kwargs.get(key) is not None:
+            raise ValueError("parameter '%s' is only allowed when plotting product files" % key)
+
+    # bin
+    if kwargs.get("bin") is not None:
+        if len(args) == 0 or datatype == kGridData:
+            raise ValueError("parameter 'bin' is only allowed when plotting point or swath data")
+        if plotLines:
+            raise ValueError("parameter 'bin' can not be combined with 'drawpath'")
+        latitude, longitude, data = _bin_location_data(latitude, longitude, data, kwargs.get("bin"),
+                                                       kwargs.get("binstatistic"))
+        datatype = kGridData
+    elif kwargs.get("binstatistic") is not None:
+        raise ValueError("parameter 'binstatistic' is only allowed in combination with 'bin'")
+
     # process arguments
 
     if window is None:
         if size is None:
             size = WindowHandler.GetDefaultSize()
-        if pos is None:
-            pos = WindowHandler.GetNextPosition(size)
-        plot = WorldPlotFrame(size=size, pos=pos)
+        if offscreen:
+            plot = OffscreenWorldPlotFrame(size=size)
+        else:
+            if pos is None:
+                pos = WindowHandler.GetNextPosition(size)
+            plot = WorldPlotFrame(size=size, pos=pos)
     else:
         plot = window
         if size is not None:
+            if offscreen:
+                raise ValueError("parameter 'size' can not be changed for an existing offscreen plot")
             plot.SetSize(size)
         if pos is not None:
             plot.Move(pos)
@@ -738,18 +1155,45 @@ def wplot(*args, **kwargs):
         raise
     plot.Thaw()
 
-    # TODO: Is this still applicable?
-    # The Yield and Refresh are needed to make sure that colortable changes are shown.
-    # Somehow the plot is not rendered using the new colortable after the Thaw.
-    # We have to let the current Refresh result in a Render (using wx.Yield())
-    # and then ask for a new render using Refresh()
-    wx.Yield()
-    plot.Refresh()
+    if not offscreen:
+        # TODO: Is this still applicable?
+        # The Yield and Refresh are needed to make sure that colortable changes are shown.
+        # Somehow the plot is not rendered using the new colortable after the Thaw.
+        # We have to let the current Refresh result in a Render (using wx.Yield())
+        # and then ask for a new render using Refresh()
+        wx.Yield()
+        plot.Refresh()
+
+    if filename is not None:
+        _export_image(plot, filename)
 
     return plot
 
 
-def executescript(filename, globals=None, mainargs=None):
+def importproduct(filename, operations="", options=""):
+    """ Import a product using HARP.
+
+    This routine works the same as harp.import_product(), but keeps a
+    copy of each imported product in an on-disk cache.
+
+    >>> product = importproduct(filename, operations, options)
+
+    imports the product file located at the path indicated by 'filename'
+    (with the given HARP 'operations' and ingestion 'options'). If the same
+    product file (with the same size and modification time) was already
+    imported with the same operations and options, the variables of the
+    product are memory mapped from the cache instead of ingesting the file
+    again.
+
+    The cache is also used by plot() and wplot() when these are given
+    product files. Least recently used products are removed from the cache
+    when its size limit is reached.
+
+    """
+    return harpcache.ImportProduct(filename, operations, options)
+
+
+def executescript(filename, globals=None, mainargs=None, background=False):
     """ Execute a script.
 
     This routine runs an external python script.
@@ -791,7 +1235,42 @@ def executescript(filename, globals=None, mainargs=None):
     Note that if a 'mainargs' keyword parameter is provided, the 'globals'
     parameter to executescript() (if present) will be ignored.
 
+
+    A long running script can be run in the background by passing
+    'background=True':
+
+    >>> run = executescript(filename, background=True)
+
+    This returns immediately, so you can continue working in VISAN while the
+    script runs. The script is run in a separate thread; calls to plot(),
+    wplot(), histogramplot() and browseproduct() from the script are executed
+    by the main VISAN thread. All output of the script (e.g. of print() or of
+    warnings) and its errors are written to the shell. The progress of the script is shown in a small
+    window that can be used to cancel the script. A script can report its
+    progress with scriptprogress(), which is also the point at which a
+    cancelled script is stopped (as are calls to the plot functions).
+    The returned object can be used to cancel the script (run.Cancel()) or to
+    wait for it to finish (run.Wait()); VISAN keeps running while it waits.
+    Since the working directory and command line arguments are shared by the
+    whole application, 'background' can not be combined with 'mainargs'.
+
     """
+    if background:
+        if _batch_mode:
+            raise ValueError("parameter 'background' is not supported in batch mode")
+        if mainargs is not None:
+            raise ValueError("parameter 'mainargs' can not be combined with 'background'")
+        if not os.path.isfile(filename):
+            raise IOError("Error executing VISAN/Python script, the path '%s' does not point to a file\n" % filename)
+        from .scriptrunner import ScriptRun
+        print(("Executing VISAN/Python script '%s' in the background\n" % filename))
+        if globals is None:
+            # like a script that is run directly, the script has access to the globals of this module
+            globals = dict(sys.modules[__name__].__dict__)
+        run = ScriptRun(filename, globals)
+        run.Start()
+        return run
+
     if os.path.exists(filename):
         if os.path.isfile(filename):
             print(("Executing VISAN/Python script '%s':\n" % filename))
@@ -820,6 +1299,32 @@ def executescript(filename, globals=None, mainargs=None):
         raise IOError("Error executing VISAN/Python script, the file '%s' does not exist\n" % filename)
 
 
+def scriptprogress(current, total=None, message=None):
+    """ Report the progress of a script that runs in the background.
+
+    >>> scriptprogress(current, total, message)
+
+    shows the progress 'current' out of 'total' (and the optional 'message')
+    in the progress window of a script that was started with
+    executescript(filename, background=True). If 'total' is not given, the
+    progress window only indicates that the script is still running.
+
+    If the user has cancelled the script, this function raises an exception
+    that stops the script. Calling this function regularly (e.g. once per
+    product in a loop over products) therefore allows a script to be cancelled.
+
+    When the script is not run in the background this function does nothing.
+    """
+    if not _in_script_thread():
+        return
+    from .scriptrunner import GetCurrentRun
+    run = GetCurrentRun()
+    if run is None:
+        return
+    run.CheckCancelled()
+    run.progress = (current, total, message)
+
+
 def browseproduct(filename):
     """ Open the Product Browser with a specific product.
 
@@ -831,6 +1336,11 @@ def browseproduct(filename):
     execption will be thrown.
 
     """
+    if _batch_mode:
+        raise RuntimeError("the Product Browser is not available in batch mode")
+    if _in_script_thread():
+        return _call_in_main_thread(browseproduct, filename)
+
     if os.path.exists(filename):
         if os.path.isfile(filename):
             import wx
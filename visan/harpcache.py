@@ -0,0 +1,209 @@
+# Copyright (C) 2002-2022 S[&]T, The Netherlands.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Persistent on-disk cache of HARP imports
+
+Each imported product is stored in its own directory with one .npy file per variable, so that a repeated import of
+the same product (with the same operations and ingestion options) only needs to memory map these files. The cache is
+keyed on the absolute path, size, and modification time of the product file, the operations, the ingestion options,
+and the HARP version. When the total size of the cache exceeds its maximum size, the least recently used entries are
+removed.
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+
+import numpy
+import harp
+
+DEFAULT_CACHE_SIZE = 2048 * 1024 * 1024
+
+_METADATA_FILE = "product.pickle"
+_VARIABLE_ATTRIBUTES = ["unit", "valid_min", "valid_max", "description", "enum"]
+
+
+def _DefaultCacheDirectory():
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        basedir = os.environ["LOCALAPPDATA"]
+    else:
+        basedir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(basedir, "visan", "harp")
+
+
+def _GetDirectorySize(path):
+    size = 0
+    for filename in os.listdir(path):
+        size += os.path.getsize(os.path.join(path, filename))
+    return size
+
+
+class HarpImportCache(object):
+    """
+    Size-bounded cache of imported HARP products.
+
+    A cache object only holds its directory and maximum size (in bytes), so it can be passed to worker processes.
+    """
+
+    def __init__(self, directory=None, maxSize=DEFAULT_CACHE_SIZE):
+        if directory is None:
+            directory = _DefaultCacheDirectory()
+        self.directory = directory
+        self.maxSize = maxSize
+
+    def ImportProduct(self, filename, operations="", options=""):
+        operations = operations or ""
+        options = options or ""
+        if self.maxSize <= 0 or not isinstance(filename, (str, os.PathLike)) or not os.path.isfile(filename):
+            # only single product files are cached (globs and lists of files are passed on to HARP as is)
+            return harp.import_product(filename, operations, options)
+        try:
+            entryDir = os.path.join(self.directory, self._GetKey(filename, operations, options))
+        except OSError:
+            # the file was removed after it was checked; let HARP report the error
+            return harp.import_product(filename, operations, options)
+        try:
+            product = self._Load(entryDir)
+        except Exception:
+            # a missing or incomplete entry is treated as a cache miss
+            product = None
+        if product is not None:
+            # mark the entry as most recently used
+            os.utime(entryDir)
+            return product
+        product = harp.import_product(filename, operations, options)
+        try:
+            self._Store(entryDir, product)
+            self.Reduce()
+        except Exception:
+            # not being able to cache a product should never prevent the import itself
+            pass
+        return product
+
+    def Clear(self):
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def Reduce(self):
+        # remove the least recently used entries until the cache fits within its maximum size
+        if not os.path.isdir(self.directory):
+            return
+        entries = []
+        totalSize = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                continue
+            entryDir = os.path.join(self.directory, name)
+            try:
+                size = _GetDirectorySize(entryDir)
+                entries.append((os.path.getmtime(entryDir), size, entryDir))
+            except OSError:
+                # entry was removed (or is being written) by another process
+                continue
+            totalSize += size
+        entries.sort()
+        for mtime, size, entryDir in entries:
+            if totalSize <= self.maxSize:
+                break
+            shutil.rmtree(entryDir, ignore_errors=True)
+            totalSize -= size
+
+    def _GetKey(self, filename, operations, options):
+        filename = os.path.abspath(filename)
+        stat = os.stat(filename)
+        key = repr((filename, stat.st_size, stat.st_mtime_ns, operations, options, harp.version()))
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _Load(self, entryDir):
+        metadataFile = os.path.join(entryDir, _METADATA_FILE)
+        if not os.path.exists(metadataFile):
+            return None
+        with open(metadataFile, "rb") as f:
+            metadata = pickle.load(f)
+        product = harp.Product()
+        for name, value in metadata["attributes"]:
+            setattr(product, name, value)
+        for index, (name, dimension, attributes, isObject) in enumerate(metadata["variables"]):
+            dataFile = os.path.join(entryDir, "%d.npy" % index)
+            if isObject:
+                # arrays of strings can not be memory mapped
+                data = numpy.load(dataFile, allow_pickle=True)
+            else:
+                # use copy-on-write so modifications of the data never end up in the cache
+                data = numpy.load(dataFile, mmap_mode="c")
+            product[name] = harp.Variable(data, dimension, **attributes)
+        return product
+
+    def _Store(self, entryDir, product):
+        # write the entry to a temporary directory first so other processes never see incomplete entries
+        tempDir = "%s.%d.tmp" % (entryDir, os.getpid())
+        os.makedirs(tempDir)
+        try:
+            metadata = {"attributes": [], "variables": []}
+            for name in vars(product):
+                value = getattr(product, name)
+                if not name.startswith("_") and not isinstance(value, harp.Variable):
+                    metadata["attributes"].append((name, value))
+            for index, name in enumerate(product):
+                variable = product[name]
+                data = numpy.asarray(variable.data)
+                attributes = dict()
+                for attribute in _VARIABLE_ATTRIBUTES:
+                    value = getattr(variable, attribute, None)
+                    if value is not None:
+                        attributes[attribute] = value
+                numpy.save(os.path.join(tempDir, "%d.npy" % index), data, allow_pickle=data.dtype.hasobject)
+                metadata["variables"].append((name, list(variable.dimension), attributes, data.dtype.hasobject))
+            with open(os.path.join(tempDir, _METADATA_FILE), "wb") as f:
+                pickle.dump(metadata, f, pickle.HIGHEST_PROTOCOL)
+            os.rename(tempDir, entryDir)
+        except Exception:
+            shutil.rmtree(tempDir, ignore_errors=True)
+            # the entry may have been stored concurrently by another process
+            if not os.path.exists(os.path.join(entryDir, _METADATA_FILE)):
+                raise
+
+
+_cache = HarpImportCache()
+
+
+def GetCache():
+    return _cache
+
+
+def SetCache(directory=None, maxSize=DEFAULT_CACHE_SIZE):
+    global _cache
+    _cache = HarpImportCache(directory, maxSize)
+
+
+def ImportProduct(filename, operations="", options=""):
+    return _cache.ImportProduct(filename, operations, options)
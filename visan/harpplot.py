@@ -68,28 +68,52 @@ def get_prefered_value(values, unprefered_patterns):
     return None
 
 
-def get_attributes(product):
-    # we return all scalars and 1D (time dependent) variables
-    def attr_value(value, variable):
-        if hasattr(variable, "unit"):
-            if " since " in variable.unit:
-                # this is a time value
-                base, epoch = variable.unit.split(" since ")
-                if base in ["s", "seconds", "days"]:
-                    if base == "days":
-                        value *= 86400
-                    formats = "yyyy-MM-dd HH:mm:ss.SSSSSS|yyyy-MM-dd HH:mm:ss|yyyy-MM-dd"
-                    value = value + coda.time_string_to_double(formats, epoch)
-                    return coda.time_to_string(value)
-            return "%s [%s]" % (str(value), variable.unit)
+class AttributeFormatter(object):
+    # converts values of a variable to display strings; a time epoch is only parsed once per variable
+    def __init__(self, variable):
+        self.unit = getattr(variable, "unit", None)
+        self.epoch = None
+        self.scale = 1
+        if self.unit is not None and " since " in self.unit:
+            # this is a time value
+            base, epoch = self.unit.split(" since ")
+            if base in ["s", "seconds", "days"]:
+                if base == "days":
+                    self.scale = 86400
+                formats = "yyyy-MM-dd HH:mm:ss.SSSSSS|yyyy-MM-dd HH:mm:ss|yyyy-MM-dd"
+                self.epoch = coda.time_string_to_double(formats, epoch)
+
+    def __call__(self, value):
+        if self.epoch is not None:
+            return coda.time_to_string(value * self.scale + self.epoch)
+        if self.unit is not None:
+            return "%s [%s]" % (str(value), self.unit)
         return str(value)
 
+
+class TimeDependentAttribute(object):
+    # list of attribute values for each time (keyframe) that only gets formatted when an item is requested
+    def __init__(self, variable):
+        self.data = variable.data
+        self.formatter = AttributeFormatter(variable)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.formatter(value) for value in self.data[index]]
+        return self.formatter(self.data[index])
+
+
+def get_attributes(product):
+    # we return all scalars and 1D (time dependent) variables
     attr = {}
     for name in list(product):
         if len(product[name].dimension) == 0:
-            attr[name] = attr_value(product[name].data, product[name])
+            attr[name] = AttributeFormatter(product[name])(product[name].data)
         elif len(product[name].dimension) == 1 and product[name].dimension[0] == 'time':
-            attr[name] = [attr_value(value, product[name]) for value in product[name].data]
+            attr[name] = TimeDependentAttribute(product[name])
     return attr
 
 
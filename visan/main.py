@@ -31,16 +31,32 @@
 Startup code for VISAN.
 """
 
+import multiprocessing
 import os
 import sys
 
 
 def main():
+    process = multiprocessing.current_process()
+    if multiprocessing.parent_process() is not None or getattr(process, "_inheriting", False):
+        # worker processes that are started with the 'spawn' method re-run the main script of the parent (while
+        # the worker is still bootstrapping, which is when '_inheriting' is set); this should never start another
+        # VISAN instance (or batch run) from within the worker
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        # run a script without creating the user interface
+        from .batch import main as batchmain
+        sys.exit(batchmain(sys.argv[2:]))
     try:
         import traceback
+        from . import startup
         sys.argv[0] = "visan"
-        from .app import VisanApp
-        app = VisanApp()
+        showStartupTiming = "--startup-timing" in sys.argv[1:]
+        if showStartupTiming:
+            sys.argv.remove("--startup-timing")
+        with startup.Phase("import application modules"):
+            from .app import VisanApp
+        app = VisanApp(showStartupTiming)
         app.MainLoop()
     except Exception:
         type, value, sys.last_traceback = sys.exc_info()
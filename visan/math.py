@@ -31,6 +31,8 @@
 A collection of mathematical functions for VISAN.
 
   histogram()
+  histogram2d()
+  bin_spatial()
   fit()
   lfit()
   gammap()
@@ -40,45 +42,206 @@ A collection of mathematical functions for VISAN.
   wgs84_to_ecef()
 """
 
+import math
+
 import numpy as np
 import numpy.linalg as linalg
-from functools import reduce
 
+# fit() uses an approximation for the goodness of fit probability of series with more degrees of freedom than this
+CHI_SQUARE_EXACT_MAX_DOF = 200
+
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+
+def _chunks(a, weights):
+    # Yields (values, weights) pairs; 'a' (and 'weights') can be single arrays or iterators over arrays
+    if hasattr(a, '__next__'):
+        if weights is None:
+            for chunk in a:
+                yield chunk, None
+        else:
+            if not hasattr(weights, '__next__'):
+                raise ValueError("Argument 'weights' should be an iterator if 'a' is an iterator")
+            for chunk, chunkweights in zip(a, weights):
+                yield chunk, chunkweights
+    else:
+        yield a, weights
+
+
+def _bin_indices(a, bins, weights):
+    a = np.ravel(np.asarray(a))
+    if weights is not None:
+        weights = np.ravel(np.asarray(weights, dtype=float))
+        if weights.size != a.size:
+            raise ValueError("Arrays 'a' and 'weights' have different length")
+    return np.searchsorted(bins, a), weights
 
-def histogram(a, bins, mode='inner'):
+
+def histogram(a, bins, mode='inner', weights=None):
     """ Create a histogram for a set of values using a specified set of bins.
 
     This function creates a histogram for the values in the array 'a'.
     The bins are defined by the edge values in the 'bins' array.
     The values in 'bins' should be stored in ascending order.
+    A value v is counted in bin i if bins[i] < v <= bins[i+1].
 
     If mode is 'inner' then len(bins)-1 bins will be used. If mode is 'outer'
     then two more bins are added; one for all values below bins[0] and one for
     the values in 'a' higher then bins[-1].
 
-    Both 'a' and 'bins' should be one dimensional arrays.
+    If 'weights' is given, it should have the same size as 'a' and each value
+    contributes its weight to the bin count (instead of 1).
+
+    Both 'a' and 'bins' should be one dimensional arrays. Alternatively 'a'
+    (and 'weights') can be an iterator (e.g. a generator) that produces
+    arrays; the counts are then accumulated over all produced arrays, so the
+    complete dataset never needs to be in memory at once.
 
     Example:
 
     >>> histogram([2.1, 4.5, 5, 7.8, 2.5, 6.1, 9.9, 5.1, 5.2, 7.2], arange(11))
     array([0, 2, 0, 1, 3, 1, 2, 0, 1, 0])
     """
-    def accumulate(n, i):
-        n[i] += 1
-        return n
-    a = np.asarray(a)
-    bins = np.asarray(bins)
-    indices = np.searchsorted(bins.flat, a.flat)
-    n = reduce(accumulate, indices, np.zeros(len(bins.flat) + 1))
+    if mode not in ('inner', 'outer'):
+        raise ValueError("Invalid value for 'mode' argument")
+    bins = np.ravel(np.asarray(bins))
+    n = np.zeros(len(bins) + 1)
+    for chunk, chunkweights in _chunks(a, weights):
+        indices, chunkweights = _bin_indices(chunk, bins, chunkweights)
+        n += np.bincount(indices, chunkweights, minlength=len(n))
     if mode == 'inner':
         return n[1:-1]
-    elif mode == 'outer':
-        return n
-    else:
+    return n
+
+
+def histogram2d(a, b, abins, bbins, mode='inner', weights=None):
+    """ Create a two dimensional histogram for pairs of values using specified sets of bins.
+
+    This function counts the value pairs (a[i], b[i]) in the two dimensional
+    bins that are defined by the edge values in the 'abins' and 'bbins'
+    arrays (e.g. value versus latitude). The binning rules for each dimension
+    are the same as for the histogram() function.
+
+    The result is a two dimensional array with shape
+    (len(abins)-1, len(bbins)-1) if mode is 'inner' and
+    (len(abins)+1, len(bbins)+1) if mode is 'outer'.
+
+    If 'weights' is given, it should have the same size as 'a' and 'b'.
+
+    Just as for histogram(), 'a', 'b' (and 'weights') can also be iterators
+    that produce arrays, in which case the counts are accumulated over all
+    produced arrays.
+
+    Example:
+
+    >>> histogram2d(ozone, latitude, arange(200, 500, 10), arange(-90, 91, 10))
+    """
+    if mode not in ('inner', 'outer'):
         raise ValueError("Invalid value for 'mode' argument")
+    abins = np.ravel(np.asarray(abins))
+    bbins = np.ravel(np.asarray(bbins))
+    n = np.zeros((len(abins) + 1, len(bbins) + 1))
+    if hasattr(a, '__next__'):
+        if not hasattr(b, '__next__'):
+            raise ValueError("Argument 'b' should be an iterator if 'a' is an iterator")
+        chunks = zip(_chunks(a, weights), b)
+    else:
+        chunks = [((a, weights), b)]
+    for (achunk, chunkweights), bchunk in chunks:
+        aindices, chunkweights = _bin_indices(achunk, abins, chunkweights)
+        bindices = _bin_indices(bchunk, bbins, None)[0]
+        if aindices.size != bindices.size:
+            raise ValueError("Arrays 'a' and 'b' have different length")
+        indices = aindices * n.shape[1] + bindices
+        n += np.bincount(indices, chunkweights, minlength=n.size).reshape(n.shape)
+    if mode == 'inner':
+        return n[1:-1, 1:-1]
+    return n
+
+
+def _bin_centers(latitude, longitude):
+    # center of each set of corner coordinates, using the mean unit vector so the dateline is handled correctly
+    latitude = np.radians(latitude)
+    longitude = np.radians(longitude)
+    x = np.mean(np.cos(latitude) * np.cos(longitude), axis=-1)
+    y = np.mean(np.cos(latitude) * np.sin(longitude), axis=-1)
+    z = np.mean(np.sin(latitude), axis=-1)
+    return np.degrees(np.arctan2(z, np.hypot(x, y))), np.degrees(np.arctan2(y, x))
 
 
-def fit(x, y, sigy=None, error=False):
+def bin_spatial(latitude, longitude, data, latitude_edges, longitude_edges, statistic='mean'):
+    """ Aggregate values onto a regular latitude/longitude grid.
+
+    Each value data[i] is assigned to the grid cell that contains the
+    location (latitude[i], longitude[i]). The grid cells are defined by the
+    (ascending) edge values in the 'latitude_edges' and 'longitude_edges'
+    arrays. If 'latitude' and 'longitude' are two dimensional, the last
+    dimension is taken to contain the corner coordinates of each area and the
+    center of the area is used as location. Values that are NaN or that fall
+    outside the grid are ignored.
+
+    The 'statistic' parameter determines how the values in a grid cell are
+    combined and should be one of 'mean', 'count', 'min', or 'max'. For
+    'count' the 'data' parameter may be None.
+
+    The result is a two dimensional array with shape
+    (len(latitude_edges)-1, len(longitude_edges)-1). Grid cells without
+    values are NaN (or 0 for 'count').
+
+    Example:
+
+    >>> grid = bin_spatial(lat, lon, no2, arange(-90, 91, 0.5), arange(-180, 181, 0.5))
+    """
+    if statistic not in ('mean', 'count', 'min', 'max'):
+        raise ValueError("Invalid value for 'statistic' argument")
+    latitude = np.asarray(latitude, dtype=float)
+    longitude = np.asarray(longitude, dtype=float)
+    if latitude.shape != longitude.shape:
+        raise ValueError("Arrays 'latitude' and 'longitude' have different shapes")
+    if latitude.ndim == 2:
+        latitude, longitude = _bin_centers(latitude, longitude)
+    latitude = np.ravel(latitude)
+    longitude = np.ravel(longitude)
+    latitude_edges = np.ravel(np.asarray(latitude_edges, dtype=float))
+    longitude_edges = np.ravel(np.asarray(longitude_edges, dtype=float))
+    shape = (len(latitude_edges) - 1, len(longitude_edges) - 1)
+    if data is None:
+        if statistic != 'count':
+            raise ValueError("Argument 'data' is required for statistic '%s'" % statistic)
+        data = np.zeros(latitude.shape)
+    else:
+        data = np.ravel(np.asarray(data, dtype=float))
+        if data.size != latitude.size:
+            raise ValueError("Arrays 'data' and 'latitude' have different length")
+
+    # cell index of each value (values on the last edge are included in the last cell)
+    latitude_indices = np.searchsorted(latitude_edges, latitude, side='right') - 1
+    latitude_indices[latitude == latitude_edges[-1]] = shape[0] - 1
+    longitude_indices = np.searchsorted(longitude_edges, longitude, side='right') - 1
+    longitude_indices[longitude == longitude_edges[-1]] = shape[1] - 1
+    valid = ((latitude_indices >= 0) & (latitude_indices < shape[0]) & (longitude_indices >= 0) &
+             (longitude_indices < shape[1]) & ~np.isnan(data))
+    indices = latitude_indices[valid] * shape[1] + longitude_indices[valid]
+    data = data[valid]
+
+    count = np.bincount(indices, minlength=shape[0] * shape[1])
+    if statistic == 'count':
+        return count.reshape(shape).astype(float)
+    grid = np.full(shape[0] * shape[1], np.nan)
+    if statistic == 'mean':
+        filled = count > 0
+        grid[filled] = np.bincount(indices, data, minlength=grid.size)[filled] / count[filled]
+    elif indices.size > 0:
+        # reduce the sorted values of each cell in one pass
+        order = np.argsort(indices, kind='stable')
+        indices = indices[order]
+        starts = np.flatnonzero(np.diff(indices, prepend=-1))
+        reduce = np.minimum if statistic == 'min' else np.maximum
+        grid[indices[starts]] = reduce.reduceat(data[order], starts)
+    return grid.reshape(shape)
+
+
+def fit(x, y, sigy=None, error=False, axis=None):
     """ Perform a linear fit on a range of x and y values.
 
     This function fits a set of data points x, y with individual standard
@@ -95,23 +258,66 @@ def fit(x, y, sigy=None, error=False):
     and the normalization of chi-square is to unit standard deviation for all
     points.
 
+    Data points for which x, y, or sigy is NaN are ignored.
+
+    For series with more than 200 degrees of freedom (data points minus 2)
+    'q' is calculated using the Wilson-Hilferty approximation.
+
     Example:
 
     >>> a, b, err = fit([1.1, 1.95, 3.05], [1, 2.01, 2.95], error=True)
+
+    If 'axis' is given, a separate line is fitted for each series of values
+    along that axis of 'y' (e.g. a trend over time for each cell of a grid).
+    'x' (and 'sigy') should then either have the same shape as 'y' or be a
+    rank-1 array with the length of 'y' along 'axis'. All fits are performed
+    at once and 'a', 'b', and the error statistics are returned as arrays with
+    the shape of 'y' without 'axis'. Fits for series with less than 2 valid
+    data points result in NaN values.
+
+    >>> a, b = fit(time, data, axis=0)
     """
     # This routine is based on an algorithm from Numerical Recipes
     x = np.asarray(x).astype(float)
     y = np.asarray(y).astype(float)
-    if x.size != y.size:
-        ValueError("Arrays 'x' and 'y' have different length")
-    if x.size < 2:
-        raise ValueError("Arrays 'x' and 'y' should have at least 2 elements")
-    useWeights = False
     if sigy is not None:
-        sigy = np.asarray(sigy)
-        if sigy.size != y.size:
+        sigy = np.asarray(sigy).astype(float)
+    if axis is None:
+        if x.size != y.size:
+            raise ValueError("Arrays 'x' and 'y' have different length")
+        if x.size < 2:
+            raise ValueError("Arrays 'x' and 'y' should have at least 2 elements")
+        if sigy is not None and sigy.size != y.size:
             raise ValueError("Arrays 'sigy' and 'y' have different length")
-        useWeights = True
+        result = _fit(x.ravel(), y.ravel(), None if sigy is None else sigy.ravel(), error)
+        # return scalars for a single fit
+        if error:
+            return (result[0][()], result[1][()], dict((key, value[()]) for key, value in result[2].items()))
+        return (result[0][()], result[1][()])
+
+    # fit along the last axis
+    y = np.moveaxis(y, axis, -1)
+    length = y.shape[-1]
+    if x.ndim == 1:
+        if x.size != length:
+            raise ValueError("Array 'x' should have the same length as 'y' along axis %d" % axis)
+    else:
+        if x.shape != np.moveaxis(y, -1, axis).shape:
+            raise ValueError("Array 'x' should be a rank-1 array or have the same shape as 'y'")
+        x = np.moveaxis(x, axis, -1)
+    if sigy is not None:
+        if sigy.ndim == 1:
+            if sigy.size != length:
+                raise ValueError("Array 'sigy' should have the same length as 'y' along axis %d" % axis)
+        else:
+            if sigy.shape != np.moveaxis(y, -1, axis).shape:
+                raise ValueError("Array 'sigy' should be a rank-1 array or have the same shape as 'y'")
+            sigy = np.moveaxis(sigy, axis, -1)
+    return _fit(x, y, sigy, error)
+
+
+def _fit(x, y, sigy, error):
+    # linear fit along the last axis of x, y, and sigy (which should be broadcastable to the same shape)
 
     # We need to minimize:
     #
@@ -123,47 +329,85 @@ def fit(x, y, sigy=None, error=False):
     #  dchi2/db = 0 = -2 * sum( x[i] * (y[i] - a - b * x[i]) / sig[i]^2 ; i=1..N)
     #
     # which provides us with a linear equation that we can use to solve a and b
+    #
+    # Invalid (NaN) data points get a weight of 0 (and their values are replaced by 0).
 
-    if useWeights:
-        weights = 1 / (np.square(sigy.flat))
-        S = np.sum(weights)
-        Sx = np.dot(x.flat, weights)
-        Sy = np.dot(y.flat, weights)
-        t = x.flat - Sx / S
-        tw = t * weights
-        Stt = np.dot(tw, t)
-        b = np.dot(tw, y.flat) / Stt
-    else:
-        S = x.size
-        Sx = np.sum(x.flat)
-        Sy = np.sum(y.flat)
-        t = x.flat - Sx / S
-        Stt = np.dot(t, t)
-        b = np.dot(t, y.flat) / Stt
-
-    a = (Sy - Sx * b) / S
-
-    if not error:
-        return (a, b)
-
-    siga = np.sqrt((1 + Sx * Sx / (S * Stt)) / S)
-    sigb = np.sqrt(1 / Stt)
-    chi2 = 0.0
-    q = 1.0
-    if useWeights:
-        chi = (y - a - b * x.flat) / sigy.flat
-        chi2 = np.dot(chi, chi)
-        if x.size > 2:
-            q = gammaq(0.5 * (x.size - 2), 0.5 * chi2)
+    if sigy is None:
+        x, y = np.broadcast_arrays(x, y)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        weights = valid.astype(float)
     else:
-        chi = y.flat - a - b * x.flat
-        chi2 = np.dot(chi, chi)
-        if x.size > 2:
-            sigdat = np.sqrt(chi2 / (x.size - 2))
+        x, y, sigy = np.broadcast_arrays(x, y, sigy)
+        valid = ~(np.isnan(x) | np.isnan(y) | np.isnan(sigy))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = np.where(valid, 1 / np.square(np.where(valid, sigy, 1)), 0.0)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    n = np.sum(valid, axis=-1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        S = np.sum(weights, axis=-1)
+        Sx = np.sum(weights * x, axis=-1)
+        Sy = np.sum(weights * y, axis=-1)
+        t = np.where(valid, x - (Sx / S)[..., np.newaxis], 0.0)
+        tw = t * weights
+        Stt = np.sum(tw * t, axis=-1)
+        b = np.sum(tw * y, axis=-1) / Stt
+        a = (Sy - Sx * b) / S
+        a = np.where(n >= 2, a, np.nan)
+        b = np.where(n >= 2, b, np.nan)
+
+        if not error:
+            return (a, b)
+
+        siga = np.sqrt((1 + Sx * Sx / (S * Stt)) / S)
+        sigb = np.sqrt(1 / Stt)
+        chi = np.where(valid, y - a[..., np.newaxis] - b[..., np.newaxis] * x, 0.0)
+        if sigy is not None:
+            chi = chi * np.sqrt(weights)
+        chi2 = np.sum(chi * chi, axis=-1)
+        q = np.ones(np.shape(chi2))
+        if sigy is not None:
+            # use rank-1 arrays so this also works for a single fit (where n and chi2 are 0-d arrays)
+            n1 = np.atleast_1d(n)
+            chi21 = np.atleast_1d(chi2)
+            q1 = np.atleast_1d(q)
+            mask = (n1 > 2) & np.isfinite(chi21)
+            if np.any(mask):
+                q1[mask] = _chiSquareQ(n1[mask] - 2, chi21[mask])
+            q = q1.reshape(np.shape(chi2))
+        else:
+            sigdat = np.where(n > 2, np.sqrt(chi2 / (n - 2)), 1.0)
             siga *= sigdat
             sigb *= sigdat
-
-    return (a, b, {'siga': siga, 'sigb': sigb, 'chi2': chi2, 'q': float(q)})
+        siga = np.where(n >= 2, siga, np.nan)
+        sigb = np.where(n >= 2, sigb, np.nan)
+        chi2 = np.where(n >= 2, chi2, np.nan)
+        q = np.where(n >= 2, q, np.nan)
+
+    return (a, b, {'siga': siga, 'sigb': sigb, 'chi2': chi2, 'q': q})
+
+
+def _chiSquareQ(dof, chi2):
+    # probability that a chi-square distributed value with 'dof' degrees of freedom is larger than 'chi2'
+    dof = np.asarray(dof, dtype=float)
+    chi2 = np.asarray(chi2, dtype=float)
+    # gammaq() does not converge for many degrees of freedom; there the Wilson-Hilferty approximation (which
+    # transforms the chi-square distribution to an approximately normal distribution) is accurate
+    approximate = dof > CHI_SQUARE_EXACT_MAX_DOF
+    if not np.all(approximate):
+        try:
+            exact = gammaq(0.5 * dof[~approximate], 0.5 * chi2[~approximate])
+        except ValueError:
+            approximate[:] = True
+    q = np.empty(dof.shape)
+    if not np.all(approximate):
+        q[~approximate] = exact
+    if np.any(approximate):
+        k = dof[approximate]
+        z = ((chi2[approximate] / k) ** (1.0 / 3.0) - (1 - 2 / (9 * k))) / np.sqrt(2 / (9 * k))
+        q[approximate] = 0.5 * _erfc(z / np.sqrt(2))
+    return q
 
 
 def lfit(x, y, F, sigy=None, error=False):
@@ -234,9 +478,9 @@ def gammap(a, x):
     a = np.asarray(a).astype(float)
     x = np.asarray(x).astype(float)
 
-    if np.sometrue(x < 0):
+    if np.any(x < 0):
         raise ValueError("Parameter 'x' may not contain negative value(s)")
-    if np.sometrue(a <= 0):
+    if np.any(a <= 0):
         raise ValueError("Parameter 'a' may not have value(s) <= 0")
     if np.shape(a) != np.shape(x):
         raise ValueError("Parameters 'a' and 'x' should have the same shape")
@@ -258,9 +502,9 @@ def gammaq(a, x):
     a = np.asarray(a).astype(float)
     x = np.asarray(x).astype(float)
 
-    if np.sometrue(x < 0):
+    if np.any(x < 0):
         raise ValueError("Parameter 'x' may not contain negative value(s)")
-    if np.sometrue(a <= 0):
+    if np.any(a <= 0):
         raise ValueError("Parameter 'a' may not have value(s) <= 0")
     if np.shape(a) != np.shape(x):
         raise ValueError("Parameters 'a' and 'x' should have the same shape")
@@ -290,7 +534,7 @@ def _gammaBySeries(a, x):
         ap += 1
         d *= x / ap
         s += d
-        if np.alltrue(np.fabs(d) < np.fabs(s) * EPS):
+        if np.all(np.fabs(d) < np.fabs(s) * EPS):
             return s * np.exp(-x + a * np.log(x) - lnga)
     raise ValueError("Parameter 'a' has value(s) that are too large")
 
@@ -318,7 +562,7 @@ def _gammaByContinuedFractions(a, x):
         d = 1.0 / d
         dl = d * c
         h *= dl
-        if (np.alltrue(np.fabs(dl - 1.0) < EPS)):
+        if (np.all(np.fabs(dl - 1.0) < EPS)):
             return h * np.exp(-x + a * np.log(x) - lnga)
     raise ValueError("Parameter 'a' has value(s) that are too large")
 
@@ -327,7 +571,7 @@ def gammaln(x):
     """Returns the value of ln(Gamma(x))."""
     # We use Lanczos approximation
     x = np.asarray(x).astype(float)
-    if np.sometrue(x <= 0):
+    if np.any(x <= 0):
         raise ValueError("Parameter 'x' may not have value(s) <= 0")
 
     c = (1.000000000000000174663,
@@ -31,5 +31,5 @@
 VISAN plotting functionality
 """
 
-from .plotframe import PlotFrame
-from .worldplotframe import WorldPlotFrame
+from .plotframe import OffscreenPlotFrame, PlotFrame
+from .worldplotframe import OffscreenWorldPlotFrame, WorldPlotFrame
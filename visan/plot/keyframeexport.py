@@ -0,0 +1,245 @@
+# Copyright (C) 2002-2022 S[&]T, The Netherlands.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Export of the keyframes of an animated world plot to a numbered sequence of image files
+
+The keyframes are divided into contiguous ranges that are rendered in parallel by a pool of worker processes.
+Each worker rebuilds the world plot in an offscreen render window from the data and the properties of the original
+plot and then renders its range of keyframes.
+The plot only keeps weak references to its input data, so if some of that data is no longer available the keyframes
+are rendered by the original plot window instead.
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+import tempfile
+import time
+
+
+def _ExportColorTables(frame, tempdir):
+    colorTableFiles = []
+    for dataSetId in range(frame.GetNumDataSets()):
+        colorTableFile = os.path.join(tempdir, "colortable%d.txt" % dataSetId)
+        frame.GetColorTable(dataSetId).Export(colorTableFile)
+        colorTableFiles.append(colorTableFile)
+    return colorTableFiles
+
+
+def _GetDataSetSources(frame):
+    # resolve the weak references to the input arrays; returns None if any of the arrays has been freed
+    sources = []
+    for source in frame.dataSetSources:
+        arrays = []
+        for arrayRef in source[1:]:
+            array = None if arrayRef is None else arrayRef()
+            if array is None and arrayRef is not None:
+                return None
+            arrays.append(array)
+        sources.append(source[:1] + tuple(arrays))
+    return sources
+
+
+def _GetPlotState(frame, sources, firstKeyframe, lastKeyframe, colorTableFiles):
+    plotWindow = frame.plotWindow
+    size = plotWindow.GetSize()
+    state = {
+        'size': (int(size[0]), int(size[1])),
+        'title': frame.GetPlotTitle(),
+        'projection': frame.GetProjection(),
+        'projectionCenterLatitude': frame.GetProjectionCenterLatitude(),
+        'projectionCenterLongitude': frame.GetProjectionCenterLongitude(),
+        'viewCenterLatitude': frame.GetViewCenterLatitude(),
+        'viewCenterLongitude': frame.GetViewCenterLongitude(),
+        'viewZoom': frame.GetViewZoom(),
+        'showColorBar': plotWindow.showColorBar,
+        'dataSetForColorBar': frame.GetSelectedDataSet(),
+        'dataSets': [],
+    }
+    for dataSetId, source in enumerate(sources):
+        numKeyframes = frame.plotWindow.GetNumKeyframesForDataSet(dataSetId)
+        keyframeOffset = 0
+        if source[0] == "grid":
+            # only pass the grids that are needed for the requested range of keyframes
+            keyframeOffset = min(firstKeyframe, numKeyframes - 1)
+            keyframeEnd = min(lastKeyframe, numKeyframes - 1) + 1
+            source = source[:3] + (source[3][keyframeOffset:keyframeEnd],)
+        state['dataSets'].append({
+            'source': source,
+            'numKeyframes': numKeyframes,
+            'keyframeOffset': keyframeOffset,
+            'colorTableFile': colorTableFiles[dataSetId],
+            'colorRange': tuple(frame.GetColorRange(dataSetId)),
+            'colorBarTitle': frame.GetColorBarTitle(dataSetId),
+            'numColorBarLabels': frame.GetNumColorBarLabels(dataSetId),
+            'label': frame.GetDataSetLabel(dataSetId),
+            'opacity': frame.GetOpacity(dataSetId),
+            'lineWidth': frame.GetLineWidth(dataSetId),
+            'pointSize': frame.GetPointSize(dataSetId),
+            'referenceHeight': frame.GetReferenceHeight(dataSetId),
+            'heightFactor': frame.GetHeightFactor(dataSetId),
+            'minHeightValue': frame.GetMinHeightValue(dataSetId),
+            'maxHeightValue': frame.GetMaxHeightValue(dataSetId),
+        })
+    return state
+
+
+def _CreatePlot(state):
+    from .worldplotframe import OffscreenWorldPlotFrame
+
+    plot = OffscreenWorldPlotFrame(size=state['size'])
+    plotWindow = plot.plotWindow
+    for dataSetId, dataSet in enumerate(state['dataSets']):
+        source = dataSet['source']
+        if source[0] == "point":
+            plot.AddPointData(*source[1:])
+        elif source[0] == "line":
+            plot.AddLineData(*source[1:])
+        elif source[0] == "swath":
+            plot.AddSwathData(*source[1:])
+        else:
+            plot.AddGridData(*source[1:])
+        plotWindow.GetColorTable(dataSetId).Import(dataSet['colorTableFile'])
+        plotWindow.SetColorRange(dataSetId, *dataSet['colorRange'])
+        plotWindow.SetColorBarTitle(dataSetId, dataSet['colorBarTitle'])
+        plotWindow.SetNumColorBarLabels(dataSetId, dataSet['numColorBarLabels'])
+        plotWindow.SetDataSetLabel(dataSetId, dataSet['label'])
+        plotWindow.SetOpacity(dataSetId, dataSet['opacity'])
+        plotWindow.SetLineWidth(dataSetId, dataSet['lineWidth'])
+        plotWindow.SetPointSize(dataSetId, dataSet['pointSize'])
+        plotWindow.SetReferenceHeight(dataSetId, dataSet['referenceHeight'])
+        plotWindow.SetHeightFactor(dataSetId, dataSet['heightFactor'])
+        plotWindow.SetMinHeightValue(dataSetId, dataSet['minHeightValue'])
+        plotWindow.SetMaxHeightValue(dataSetId, dataSet['maxHeightValue'])
+    plotWindow.SetPlotTitle(state['title'])
+    if state['dataSetForColorBar'] >= 0:
+        plotWindow.SetDataSetForColorBar(state['dataSetForColorBar'])
+    plotWindow.ShowColorBar(state['showColorBar'])
+    plotWindow.SetProjection(state['projection'])
+    plotWindow.SetProjectionCenterLatitude(state['projectionCenterLatitude'])
+    plotWindow.SetProjectionCenterLongitude(state['projectionCenterLongitude'])
+    plotWindow.SetViewCenter(state['viewCenterLatitude'], state['viewCenterLongitude'])
+    plotWindow.SetViewZoom(state['viewZoom'])
+    return plot
+
+
+def _RenderKeyframes(state, keyframes, filenames, imageType):
+    plot = _CreatePlot(state)
+    try:
+        for keyframe, filename in zip(keyframes, filenames):
+            for dataSetId, dataSet in enumerate(state['dataSets']):
+                localKeyframe = min(keyframe, dataSet['numKeyframes'] - 1) - dataSet['keyframeOffset']
+                plot.plotWindow.dataSets[dataSetId].SetKeyframe(localKeyframe)
+            plot.ExportToImageFile(filename, imageType)
+    finally:
+        plot.Destroy()
+    return len(keyframes)
+
+
+def ExportKeyframes(frame, filenamePattern, imageType, firstKeyframe=0, lastKeyframe=None, numProcesses=None,
+                    progress=None):
+    """ Export a range of keyframes of a world plot to a numbered sequence of image files.
+
+    'filenamePattern' should contain a printf style integer conversion (e.g. 'frame%04d.png') that will be replaced by
+    the keyframe number. If 'lastKeyframe' is None, all keyframes starting at 'firstKeyframe' are exported.
+    'numProcesses' is the number of worker processes to use (the default is the number of cpus). With a single process,
+    or when the input data of the plot is no longer available, the keyframes are rendered by the plot window of
+    'frame' itself.
+    'progress' is an optional callable that is called as progress(numExported, numTotal) and that can return False to
+    cancel the export.
+
+    Returns a tuple with the number of exported keyframes and the achieved number of frames per second.
+    """
+    numKeyframes = frame.GetNumKeyframes()
+    if lastKeyframe is None:
+        lastKeyframe = numKeyframes - 1
+    if firstKeyframe < 0 or lastKeyframe >= numKeyframes or firstKeyframe > lastKeyframe:
+        raise ValueError("invalid keyframe range [%d, %d] (plot has %d keyframes)" %
+                         (firstKeyframe, lastKeyframe, numKeyframes))
+    try:
+        filenamePattern % firstKeyframe
+    except TypeError:
+        raise ValueError("parameter 'filenamePattern' should contain an integer conversion such as '%%04d' (was: '%s')"
+                         % filenamePattern)
+    if numProcesses is None:
+        numProcesses = multiprocessing.cpu_count()
+    sources = None
+    if numProcesses > 1:
+        sources = _GetDataSetSources(frame)
+        if sources is None:
+            numProcesses = 1
+
+    keyframes = list(range(firstKeyframe, lastKeyframe + 1))
+    filenames = [filenamePattern % keyframe for keyframe in keyframes]
+    numExported = 0
+    startTime = time.time()
+
+    if numProcesses <= 1:
+        currentKeyframe = frame.GetKeyframe()
+        try:
+            for keyframe, filename in zip(keyframes, filenames):
+                frame.plotWindow.SetKeyframe(keyframe)
+                frame.plotWindow.ExportToImageFile(filename, imageType)
+                numExported += 1
+                if progress is not None and progress(numExported, len(keyframes)) is False:
+                    break
+        finally:
+            frame.plotWindow.SetKeyframe(currentKeyframe)
+    else:
+        # use a few chunks per process so progress is reported regularly while keeping the setup cost per chunk low
+        numChunks = min(len(keyframes), 2 * numProcesses)
+        chunkSize = (len(keyframes) + numChunks - 1) // numChunks
+        # 'spawn' makes sure the workers do not inherit the GUI state (and OpenGL contexts) of this process
+        context = multiprocessing.get_context("spawn")
+        with tempfile.TemporaryDirectory() as tempdir:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=numProcesses, mp_context=context)
+            cancelled = False
+            try:
+                colorTableFiles = _ExportColorTables(frame, tempdir)
+                futures = []
+                for start in range(0, len(keyframes), chunkSize):
+                    chunk = keyframes[start:start + chunkSize]
+                    state = _GetPlotState(frame, sources, chunk[0], chunk[-1], colorTableFiles)
+                    futures.append(executor.submit(_RenderKeyframes, state, chunk, filenames[start:start + chunkSize],
+                                                   imageType))
+                for future in concurrent.futures.as_completed(futures):
+                    numExported += future.result()
+                    if progress is not None and progress(numExported, len(keyframes)) is False:
+                        cancelled = True
+                        break
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+            if cancelled:
+                # account for chunks that were already running when the export was cancelled
+                numExported = sum(future.result() for future in futures if future.done() and not future.cancelled())
+
+    elapsedTime = time.time() - startTime
+    framesPerSecond = numExported / elapsedTime if elapsedTime > 0 else 0.0
+    return numExported, framesPerSecond
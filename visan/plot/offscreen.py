@@ -0,0 +1,107 @@
+# Copyright (C) 2002-2022 S[&]T, The Netherlands.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Offscreen (headless) counterparts of the wx based plot window components
+"""
+
+from vtkmodules.vtkRenderingCore import vtkRenderWindow
+from vtkmodules.vtkRenderingUI import vtkGenericRenderWindowInteractor
+
+
+class OffscreenRenderWindowInteractor(object):
+    """
+    Stand-in for wxVTKRenderWindowInteractor that renders into an offscreen vtkRenderWindow.
+
+    Only the subset of the wx window interface that is used by the plot windows is provided.
+    Rendering is not triggered by Refresh(); it happens explicitly when an image is exported.
+    Just like wxVTKRenderWindowInteractor, unknown attributes are forwarded to the underlying
+    vtkGenericRenderWindowInteractor.
+    """
+
+    def __init__(self, size=(800, 494)):
+        self._size = (int(size[0]), int(size[1]))
+        renderWindow = vtkRenderWindow()
+        renderWindow.SetOffScreenRendering(1)
+        renderWindow.SetSize(self._size[0], self._size[1])
+        self._Iren = vtkGenericRenderWindowInteractor()
+        self._Iren.SetRenderWindow(renderWindow)
+
+    def __getattr__(self, attr):
+        if attr == '_Iren':
+            raise AttributeError(attr)
+        if hasattr(self._Iren, attr):
+            return getattr(self._Iren, attr)
+        raise AttributeError(self.__class__.__name__ + " has no attribute named " + attr)
+
+    def GetSize(self):
+        return self._size
+
+    def GetDPIScaleFactor(self):
+        return 1.0
+
+    def PostEvent(self, event):
+        # there is no event loop to deliver events to
+        pass
+
+    def Refresh(self):
+        pass
+
+    def Freeze(self):
+        pass
+
+    def Thaw(self):
+        pass
+
+    def Destroy(self):
+        self._Iren.GetRenderWindow().Finalize()
+
+
+class OffscreenPanel(object):
+    """
+    Stand-in for the property panels of a plot frame; there are no controls to update offscreen.
+    """
+
+    def SelectDataSet(self, dataSetId):
+        pass
+
+    def UpdateAttributes(self):
+        pass
+
+    def UpdateColorBar(self):
+        pass
+
+    def UpdateControls(self):
+        pass
+
+    def UpdateDataSetList(self):
+        pass
+
+    def UpdateLocation(self):
+        pass
@@ -35,215 +35,20 @@ import numpy
 from .animationtoolbar import AnimationToolbar, EVT_KEYFRAME_CHANGED
 from .plotdatasetpanel import PlotDataSetPanel
 from .plotpropertypanel import PlotPropertyPanel
-from .plotwindow import PlotWindow, EVT_PLOTDATA_CHANGED, EVT_PLOTAXIS_CHANGED
+from .offscreen import OffscreenPanel
+from .plotwindow import OffscreenPlotWindow, PlotWindow, EVT_PLOTDATA_CHANGED, EVT_PLOTAXIS_CHANGED
 from .typedsavefiledialog import TypedSaveFileDialog
 
 windowCount = 1
 
 
-class PlotFrame(wx.Frame):
+class BasePlotFrame(object):
+    """
+    Plot handle functionality that is shared between the interactive plot frame and the offscreen plot.
 
-    def __init__(self, parent=None, id=-1, title=None, pos=wx.DefaultPosition, size=(800, 494)):
-        if parent is None:
-            # use top level wxWindow
-            try:
-                parent = wx.GetApp().GetTopWindow()
-            except Exception:
-                # If there is no top level window, just create parentless plot window
-                pass
-        if title is None:
-            # determine title
-            global windowCount
-            title = "VISAN 2D Plot"
-            if windowCount > 1:
-                title += " - %d" % windowCount
-            windowCount += 1
-        super(PlotFrame, self).__init__(parent, id, title, pos, size)
-
-        # Set icon if possible
-        if wx.Config.Get().Read("IconFile"):
-            self.SetIcon(wx.Icon(wx.Config.Get().Read("IconFile")))
-
-        # Set initial state
-        self.closingDown = False
-        self.filename = ""
-        self.dataSetAttributes = []
-        self.dataSetLocation = []
-
-        # Create and configure all widgets
-        self.CreateMenuBar()
-        self.CreateControls()
-        self.CreateLayout()
-
-        # Other Event Listeneres
-        self.Bind(wx.EVT_CLOSE, self.OnClose)
-
-        # Give the plotwindow the initial focus (since this might not happen automatically for e.g. Mac OS X)
-        self.plotWindow.SetFocus()
-
-        self.Show()
-        wx.Yield()
-
-    def __repr__(self):
-        return "<visan plot handle>"
-
-    def CreateMenuBar(self):
-        menubar = wx.MenuBar()
-
-        filemenu = wx.Menu()
-
-        item = filemenu.Append(wx.ID_SAVE, "&Save Image...\tCtrl-S", "Save the image to an image file")
-        self.Bind(wx.EVT_MENU, self.OnSave, item)
-
-        filemenu.AppendSeparator()
-
-        item = filemenu.Append(wx.ID_CLOSE, "&Close\tCtrl-W", "Close this Window")
-        self.Bind(wx.EVT_MENU, self.OnClose, item)
-
-        menubar.Append(filemenu, "&File")
-
-        viewmenu = wx.Menu()
-
-        self.viewPropertiesMenuItem = viewmenu.AppendCheckItem(wx.ID_ANY, "&Properties",
-                                                               "Toggle the display of the Property Panel")
-        self.Bind(wx.EVT_MENU, self.OnViewProps, self.viewPropertiesMenuItem)
-        self.viewPropertiesMenuItem.Enable(True)
-
-        self.viewSliderMenuItem = viewmenu.AppendCheckItem(wx.ID_ANY, "&Animation Toolbar",
-                                                           "Toggle the display of the Animation Toolbar")
-        self.Bind(wx.EVT_MENU, self.OnViewSlider, self.viewSliderMenuItem)
-        self.viewSliderMenuItem.Enable(False)
-
-        menubar.Append(viewmenu, "&View")
-
-        self.SetMenuBar(menubar)
-
-    def CreateControls(self):
-        # Create a split panel
-        splitterstyle = wx.SP_LIVE_UPDATE
-        if wx.Platform == "__WXMAC__":
-            splitterstyle |= wx.SP_3DSASH
-        self.splitPanel = wx.SplitterWindow(self, -1, style=splitterstyle)
-        self.splitPanel.Bind(wx.EVT_SIZE, self.OnSplitPanelSize)
-
-        # Create the plot window
-        self.plotWindow = PlotWindow(self.splitPanel, -1)
-        self.plotWindow.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
-        self.plotWindow.Bind(EVT_PLOTDATA_CHANGED, self.OnPlotDataChanged)
-        self.plotWindow.Bind(EVT_PLOTAXIS_CHANGED, self.OnPlotAxisChanged)
-        self.plotWindow.Enable(1)
-
-        # Create the animation toolbar
-        self.animationToolbar = AnimationToolbar(self, self.plotWindow)
-        self.animationToolbar.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
-        self.animationToolbar.Bind(EVT_KEYFRAME_CHANGED, self.OnKeyframeChanged)
-
-        # Create the property panel
-        # Create a parent wxWindow for the notebook to give a proper background colour for the area behind the tabs
-        self.propertyPanel = wx.Window(self.splitPanel, -1)
-        # Set the background 'explicitly' to have it stick
-        self.propertyPanel.SetBackgroundColour(self.propertyPanel.GetBackgroundColour())
-        self.propertyPanel.Bind(wx.EVT_SIZE, self.OnPropertyPanelSize)
-
-        # Create the property notebook
-        self.propertyNotebook = wx.Notebook(self.propertyPanel, -1)
-        # Don't add size handler for propertyNotebook: re-layout of propertyNotebook doesn't work on Windows
-
-        # Create the content for the property notebook
-        self.dataSetPropertyTab = PlotDataSetPanel(self.propertyNotebook, self)
-        self.dataSetPropertyTab.Bind(wx.EVT_SIZE, self.OnDataSetPropertyTabSize)
-        self.plotPropertyTab = PlotPropertyPanel(self.propertyNotebook, self.plotWindow)
-        self.plotPropertyTab.Bind(wx.EVT_SIZE, self.OnPlotPropertyTabSize)
-
-        # Add the content to the notebook
-        self.propertyNotebook.AddPage(self.dataSetPropertyTab, "Datasets")
-        self.propertyNotebook.AddPage(self.plotPropertyTab, "Plot")
-
-        # Initialize split panel
-        self.splitPanel.SetMinimumPaneSize(50)
-        self.splitPanel.Initialize(self.plotWindow)
-
-    def CreateLayout(self):
-        self.propertyPanelSizer = wx.BoxSizer(wx.HORIZONTAL)
-        self.propertyPanelSizer.Add(self.propertyNotebook, 1, wx.EXPAND)
-        self.propertyPanel.SetSizerAndFit(self.propertyPanelSizer)
-
-        self.splitPanelSizer = wx.BoxSizer(wx.HORIZONTAL)
-        self.splitPanelSizer.Add(self.plotWindow, 1, wx.EXPAND)
-        self.splitPanelSizer.Add((self.splitPanel.GetSashSize(), -1), 0, wx.EXPAND)
-        self.splitPanelSizer.Add(self.propertyPanel, 0, wx.EXPAND)
-        self.splitPanelSizer.Show(1, False)
-        self.splitPanelSizer.Show(2, False)
-        self.splitPanel.SetSizer(self.splitPanelSizer)
-
-        self.plotWindow.SetMinSize((80, 50))
-
-        self.verticalSizer = wx.BoxSizer(wx.VERTICAL)
-        self.verticalSizer.Add(self.splitPanel, 1, wx.EXPAND)
-        self.verticalSizer.Add(self.animationToolbar, 0, wx.EXPAND)
-
-        # Hide the animation toolbar by default (so it must be shown explicitly)
-        self.verticalSizer.Hide(self.animationToolbar)
-
-        # Hide the property panel by default (so it must be shown explicitly)
-        self.propertyPanel.Hide()
-
-        self.SetSizer(self.verticalSizer)
-        self.Layout()
-        self.UpdateMinSize()
-
-    def UpdateMinSize(self):
-        self.SetMinSize(self.GetBestSize())
-        currentsize = self.GetSize()
-        minsize = self.GetMinSize()
-        if currentsize.x < minsize.x or currentsize.y < minsize.y:
-            if currentsize.x < minsize.x:
-                currentsize.x = minsize.x
-            if currentsize.y < minsize.y:
-                currentsize.y = minsize.y
-            self.SetSize(currentsize)
-
-    def AdjustSplitPanelSashPosition(self):
-        # Update sash position in splitter window
-        # Try to keep the size of the property pane the same
-        sashPosition = -(self.propertyPanel.GetSize()[0] + self.splitPanel.GetSashSize())
-        self.splitPanel.SetSashPosition(sashPosition)
-
-    def ShowAnimationToolbar(self, show=True):
-        try:
-            show = bool(show)
-        except ValueError:
-            raise TypeError("Show Animation Toolbar parameter should be a boolean (was: '%s')" % str(show))
-        self.viewSliderMenuItem.Check(show)
-
-        self.verticalSizer.Show(self.animationToolbar, show)
-        self.Layout()
-
-        self.UpdateMinSize()
-        self.Refresh()
-
-    def ShowPropertyPanel(self, show=True):
-        try:
-            show = bool(show)
-        except ValueError:
-            raise TypeError("Show Property Panel parameter should be a boolean (was: '%s')" % str(show))
-        self.viewPropertiesMenuItem.Check(show)
-
-        if show:
-            self.splitPanel.SplitVertically(self.plotWindow, self.propertyPanel)
-            self.splitPanelSizer.Show(1, True)
-            self.splitPanelSizer.Show(2, True)
-            self.propertyPanel.Show()
-            self.propertyPanel.Fit()
-            self.AdjustSplitPanelSashPosition()
-        else:
-            self.splitPanel.Unsplit(self.propertyPanel)
-            self.splitPanelSizer.Show(1, False)
-            self.splitPanelSizer.Show(2, False)
-        self.splitPanel.Layout()
-
-        self.UpdateMinSize()
-        self.Refresh()
+    Subclasses should provide the 'plotWindow', 'dataSetPropertyTab', 'plotPropertyTab', 'dataSetAttributes' and
+    'dataSetLocation' attributes and a ShowAnimationToolbar() method.
+    """
 
     def AddDataSet(self, xdata, ydata):
         xarray = None
@@ -306,15 +111,7 @@ class PlotFrame(wx.Frame):
 
         if xarray.ndim == 2 or yarray.ndim == 2:
             self.ShowAnimationToolbar(True)
-            if xarray.ndim == 2:
-                numDataSets = xarray.shape[0]
-            else:
-                numDataSets = yarray.shape[0]
-            dataSetId = None
-            for i in range(numDataSets):
-                xdata = xarray[i,:] if xarray.ndim == 2 else xarray
-                ydata = yarray[i,:] if yarray.ndim == 2 else yarray
-                dataSetId = self.plotWindow.AddDataSet(xdata, ydata, dataSetId=dataSetId)
+            dataSetId = self.plotWindow.AddKeyframes(xarray, yarray)
             self.plotWindow.SetAxisRange(0, *self.plotWindow.GetDataXRange())
             self.plotWindow.SetAxisRange(1, *self.plotWindow.GetDataYRange())
         else:
@@ -594,6 +391,211 @@ class PlotFrame(wx.Frame):
     def ExportToImageFile(self, filename, imageType):
         self.plotWindow.ExportToImageFile(filename, imageType)
 
+
+class PlotFrame(BasePlotFrame, wx.Frame):
+
+    def __init__(self, parent=None, id=-1, title=None, pos=wx.DefaultPosition, size=(800, 494)):
+        if parent is None:
+            # use top level wxWindow
+            try:
+                parent = wx.GetApp().GetTopWindow()
+            except Exception:
+                # If there is no top level window, just create parentless plot window
+                pass
+        if title is None:
+            # determine title
+            global windowCount
+            title = "VISAN 2D Plot"
+            if windowCount > 1:
+                title += " - %d" % windowCount
+            windowCount += 1
+        super(PlotFrame, self).__init__(parent, id, title, pos, size)
+
+        # Set icon if possible
+        if wx.Config.Get().Read("IconFile"):
+            self.SetIcon(wx.Icon(wx.Config.Get().Read("IconFile")))
+
+        # Set initial state
+        self.closingDown = False
+        self.filename = ""
+        self.dataSetAttributes = []
+        self.dataSetLocation = []
+
+        # Create and configure all widgets
+        self.CreateMenuBar()
+        self.CreateControls()
+        self.CreateLayout()
+
+        # Other Event Listeneres
+        self.Bind(wx.EVT_CLOSE, self.OnClose)
+
+        # Give the plotwindow the initial focus (since this might not happen automatically for e.g. Mac OS X)
+        self.plotWindow.SetFocus()
+
+        self.Show()
+        wx.Yield()
+
+    def __repr__(self):
+        return "<visan plot handle>"
+
+    def CreateMenuBar(self):
+        menubar = wx.MenuBar()
+
+        filemenu = wx.Menu()
+
+        item = filemenu.Append(wx.ID_SAVE, "&Save Image...\tCtrl-S", "Save the image to an image file")
+        self.Bind(wx.EVT_MENU, self.OnSave, item)
+
+        filemenu.AppendSeparator()
+
+        item = filemenu.Append(wx.ID_CLOSE, "&Close\tCtrl-W", "Close this Window")
+        self.Bind(wx.EVT_MENU, self.OnClose, item)
+
+        menubar.Append(filemenu, "&File")
+
+        viewmenu = wx.Menu()
+
+        self.viewPropertiesMenuItem = viewmenu.AppendCheckItem(wx.ID_ANY, "&Properties",
+                                                               "Toggle the display of the Property Panel")
+        self.Bind(wx.EVT_MENU, self.OnViewProps, self.viewPropertiesMenuItem)
+        self.viewPropertiesMenuItem.Enable(True)
+
+        self.viewSliderMenuItem = viewmenu.AppendCheckItem(wx.ID_ANY, "&Animation Toolbar",
+                                                           "Toggle the display of the Animation Toolbar")
+        self.Bind(wx.EVT_MENU, self.OnViewSlider, self.viewSliderMenuItem)
+        self.viewSliderMenuItem.Enable(False)
+
+        menubar.Append(viewmenu, "&View")
+
+        self.SetMenuBar(menubar)
+
+    def CreateControls(self):
+        # Create a split panel
+        splitterstyle = wx.SP_LIVE_UPDATE
+        if wx.Platform == "__WXMAC__":
+            splitterstyle |= wx.SP_3DSASH
+        self.splitPanel = wx.SplitterWindow(self, -1, style=splitterstyle)
+        self.splitPanel.Bind(wx.EVT_SIZE, self.OnSplitPanelSize)
+
+        # Create the plot window
+        self.plotWindow = PlotWindow(self.splitPanel, -1)
+        self.plotWindow.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
+        self.plotWindow.Bind(EVT_PLOTDATA_CHANGED, self.OnPlotDataChanged)
+        self.plotWindow.Bind(EVT_PLOTAXIS_CHANGED, self.OnPlotAxisChanged)
+        self.plotWindow.Enable(1)
+
+        # Create the animation toolbar
+        self.animationToolbar = AnimationToolbar(self, self.plotWindow)
+        self.animationToolbar.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
+        self.animationToolbar.Bind(EVT_KEYFRAME_CHANGED, self.OnKeyframeChanged)
+
+        # Create the property panel
+        # Create a parent wxWindow for the notebook to give a proper background colour for the area behind the tabs
+        self.propertyPanel = wx.Window(self.splitPanel, -1)
+        # Set the background 'explicitly' to have it stick
+        self.propertyPanel.SetBackgroundColour(self.propertyPanel.GetBackgroundColour())
+        self.propertyPanel.Bind(wx.EVT_SIZE, self.OnPropertyPanelSize)
+
+        # Create the property notebook
+        self.propertyNotebook = wx.Notebook(self.propertyPanel, -1)
+        # Don't add size handler for propertyNotebook: re-layout of propertyNotebook doesn't work on Windows
+
+        # Create the content for the property notebook
+        self.dataSetPropertyTab = PlotDataSetPanel(self.propertyNotebook, self)
+        self.dataSetPropertyTab.Bind(wx.EVT_SIZE, self.OnDataSetPropertyTabSize)
+        self.plotPropertyTab = PlotPropertyPanel(self.propertyNotebook, self.plotWindow)
+        self.plotPropertyTab.Bind(wx.EVT_SIZE, self.OnPlotPropertyTabSize)
+
+        # Add the content to the notebook
+        self.propertyNotebook.AddPage(self.dataSetPropertyTab, "Datasets")
+        self.propertyNotebook.AddPage(self.plotPropertyTab, "Plot")
+
+        # Initialize split panel
+        self.splitPanel.SetMinimumPaneSize(50)
+        self.splitPanel.Initialize(self.plotWindow)
+
+    def CreateLayout(self):
+        self.propertyPanelSizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.propertyPanelSizer.Add(self.propertyNotebook, 1, wx.EXPAND)
+        self.propertyPanel.SetSizerAndFit(self.propertyPanelSizer)
+
+        self.splitPanelSizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.splitPanelSizer.Add(self.plotWindow, 1, wx.EXPAND)
+        self.splitPanelSizer.Add((self.splitPanel.GetSashSize(), -1), 0, wx.EXPAND)
+        self.splitPanelSizer.Add(self.propertyPanel, 0, wx.EXPAND)
+        self.splitPanelSizer.Show(1, False)
+        self.splitPanelSizer.Show(2, False)
+        self.splitPanel.SetSizer(self.splitPanelSizer)
+
+        self.plotWindow.SetMinSize((80, 50))
+
+        self.verticalSizer = wx.BoxSizer(wx.VERTICAL)
+        self.verticalSizer.Add(self.splitPanel, 1, wx.EXPAND)
+        self.verticalSizer.Add(self.animationToolbar, 0, wx.EXPAND)
+
+        # Hide the animation toolbar by default (so it must be shown explicitly)
+        self.verticalSizer.Hide(self.animationToolbar)
+
+        # Hide the property panel by default (so it must be shown explicitly)
+        self.propertyPanel.Hide()
+
+        self.SetSizer(self.verticalSizer)
+        self.Layout()
+        self.UpdateMinSize()
+
+    def UpdateMinSize(self):
+        self.SetMinSize(self.GetBestSize())
+        currentsize = self.GetSize()
+        minsize = self.GetMinSize()
+        if currentsize.x < minsize.x or currentsize.y < minsize.y:
+            if currentsize.x < minsize.x:
+                currentsize.x = minsize.x
+            if currentsize.y < minsize.y:
+                currentsize.y = minsize.y
+            self.SetSize(currentsize)
+
+    def AdjustSplitPanelSashPosition(self):
+        # Update sash position in splitter window
+        # Try to keep the size of the property pane the same
+        sashPosition = -(self.propertyPanel.GetSize()[0] + self.splitPanel.GetSashSize())
+        self.splitPanel.SetSashPosition(sashPosition)
+
+    def ShowAnimationToolbar(self, show=True):
+        try:
+            show = bool(show)
+        except ValueError:
+            raise TypeError("Show Animation Toolbar parameter should be a boolean (was: '%s')" % str(show))
+        self.viewSliderMenuItem.Check(show)
+
+        self.verticalSizer.Show(self.animationToolbar, show)
+        self.Layout()
+
+        self.UpdateMinSize()
+        self.Refresh()
+
+    def ShowPropertyPanel(self, show=True):
+        try:
+            show = bool(show)
+        except ValueError:
+            raise TypeError("Show Property Panel parameter should be a boolean (was: '%s')" % str(show))
+        self.viewPropertiesMenuItem.Check(show)
+
+        if show:
+            self.splitPanel.SplitVertically(self.plotWindow, self.propertyPanel)
+            self.splitPanelSizer.Show(1, True)
+            self.splitPanelSizer.Show(2, True)
+            self.propertyPanel.Show()
+            self.propertyPanel.Fit()
+            self.AdjustSplitPanelSashPosition()
+        else:
+            self.splitPanel.Unsplit(self.propertyPanel)
+            self.splitPanelSizer.Show(1, False)
+            self.splitPanelSizer.Show(2, False)
+        self.splitPanel.Layout()
+
+        self.UpdateMinSize()
+        self.Refresh()
+
     def OnClose(self, event):
         # Make sure this wxFrame is not closing down
         if self.closingDown:
@@ -662,3 +664,49 @@ class PlotFrame(wx.Frame):
         if dialog.ShowModal() == wx.ID_OK:
             wx.Config.Get().Write('DirectoryLocation/Export', os.path.dirname(dialog.filename))
             self.ExportToImageFile(dialog.filename, dialog.ext)
+
+
+class OffscreenPlotFrame(BasePlotFrame):
+    """
+    Plot handle that renders into an offscreen render window instead of a wx frame.
+
+    This allows plots to be created and exported to image files without a display or a running wx event loop.
+    """
+
+    def __init__(self, size=(800, 494)):
+        self.title = ""
+        self.dataSetAttributes = []
+        self.dataSetLocation = []
+        self.plotWindow = OffscreenPlotWindow(size=size)
+        self.dataSetPropertyTab = OffscreenPanel()
+        self.plotPropertyTab = OffscreenPanel()
+
+    def __repr__(self):
+        return "<visan offscreen plot handle>"
+
+    def GetTitle(self):
+        return self.title
+
+    def SetTitle(self, title):
+        self.title = title
+
+    def ShowAnimationToolbar(self, show=True):
+        pass
+
+    def ShowPropertyPanel(self, show=True):
+        pass
+
+    def SetKeyframe(self, keyframe):
+        self.plotWindow.SetKeyframe(keyframe)
+
+    def Freeze(self):
+        pass
+
+    def Thaw(self):
+        pass
+
+    def Refresh(self):
+        pass
+
+    def Destroy(self):
+        self.plotWindow.Destroy()
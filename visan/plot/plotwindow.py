@@ -30,6 +30,7 @@
 import numpy
 import vtk
 from vtk.util.numpy_support import numpy_to_vtk
+from .offscreen import OffscreenRenderWindowInteractor
 from .wxVTKRenderWindowInteractor import wxVTKRenderWindowInteractor
 import wx
 
@@ -46,10 +47,24 @@ COLORMAP = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0], [1.0, 0.0, 1.0],
             [0.5, 0.0, 0.0], [0.0, 0.5, 0.0], [0.0, 0.0, 0.5]]
 
 
-class PlotWindow(wxVTKRenderWindowInteractor):
+def _ToVTKArray(data):
+    # Contiguous float64/float32 buffers are wrapped without copying (the vtk array keeps a reference to the numpy
+    # array); all other data is converted to a contiguous float64 array first.
+    array = numpy.asarray(data)
+    if array.dtype.type not in (numpy.float64, numpy.float32) or not array.dtype.isnative:
+        array = numpy.asarray(array, dtype=numpy.double)
+    return numpy_to_vtk(numpy.ascontiguousarray(array.ravel()))
+
+
+class BasePlotWindow(object):
+    """
+    Plot window functionality that is shared between the wx window and the offscreen renderer.
+
+    This class should be combined with a render window interactor class (see PlotWindow and OffscreenPlotWindow).
+    """
 
     def __init__(self, *args, **kwargs):
-        super(PlotWindow, self).__init__(*args, **kwargs)
+        super(BasePlotWindow, self).__init__(*args, **kwargs)
         # TODO: Still needed?
         # self.UseCaptureMouseOn()
         self.keyframe = 0
@@ -62,7 +77,7 @@ class PlotWindow(wxVTKRenderWindowInteractor):
         self.actor.GetProperty().SetColor(0.0, 0.0, 0.0)
 
         def onPlotAxisChanged(caller, event, calldata=None):
-            wx.PostEvent(self, PlotAxisChangedEvent())
+            self.PostEvent(PlotAxisChangedEvent())
         self.actor.AddObserver("XRangeChanged", onPlotAxisChanged)
         self.actor.AddObserver("YRangeChanged", onPlotAxisChanged)
 
@@ -85,8 +100,8 @@ class PlotWindow(wxVTKRenderWindowInteractor):
         return self.actor.GetTitle()
 
     def AddDataSet(self, xdata, ydata, dataSetId=None):
-        xdata = numpy_to_vtk(numpy.asarray(xdata, dtype=numpy.double))
-        ydata = numpy_to_vtk(numpy.asarray(ydata, dtype=numpy.double))
+        xdata = _ToVTKArray(xdata)
+        ydata = _ToVTKArray(ydata)
         if dataSetId is None:
             plotData = vtkXYPlotData()
             plotData.AddData(xdata, ydata)
@@ -103,20 +118,53 @@ class PlotWindow(wxVTKRenderWindowInteractor):
             self.actor.CalculateDataRanges()
         self.Refresh()
 
-        wx.PostEvent(self, PlotDataChangedEvent())
+        self.PostEvent(PlotDataChangedEvent())
+
+        return dataSetId
+
+    def AddKeyframes(self, xdata, ydata, dataSetId=None):
+        """
+        Add a block of keyframes to a (new) dataset at once.
+
+        'xdata' and 'ydata' should be 1-D or 2-D arrays (with at least one of them 2-D) where each row of a 2-D array
+        provides the values for one keyframe and a 1-D array is shared by all keyframes.
+        """
+        xdata = numpy.asarray(xdata)
+        ydata = numpy.asarray(ydata)
+        numKeyframes = xdata.shape[0] if xdata.ndim == 2 else ydata.shape[0]
+        numItems = ydata.shape[-1]
+        xdata = _ToVTKArray(xdata)
+        ydata = _ToVTKArray(ydata)
+        if dataSetId is None:
+            plotData = vtkXYPlotData()
+            plotData.AddKeyframes(xdata, ydata, numKeyframes, numItems)
+            plotProperty = vtk.vtkProperty2D()
+            plotProperty.SetColor(COLORMAP[len(self.dataSets) % 11])
+            self.actor.AddData(plotData, plotProperty)
+            self.dataSets.append(plotData)
+            self.dataSetProperties.append(plotProperty)
+            dataSetId = len(self.dataSets) - 1
+        else:
+            self.dataSets[dataSetId].AddKeyframes(xdata, ydata, numKeyframes, numItems)
+        if self.dataSets[dataSetId].GetNumberOfKeyframes() > self.numKeyframes:
+            self.numKeyframes = self.dataSets[dataSetId].GetNumberOfKeyframes()
+        self.actor.CalculateDataRanges()
+        self.Refresh()
+
+        self.PostEvent(PlotDataChangedEvent())
 
         return dataSetId
 
     def UpdateDataSet(self, dataSetId, xdata, ydata):
-        xdata = numpy_to_vtk(numpy.asarray(xdata, dtype=numpy.double))
-        ydata = numpy_to_vtk(numpy.asarray(ydata, dtype=numpy.double))
+        xdata = _ToVTKArray(xdata)
+        ydata = _ToVTKArray(ydata)
         self.dataSets[dataSetId].SetData(xdata, ydata)
         # recalculate number of keyframes
         self.numKeyframes = max(dataSet.GetNumberOfKeyframes() for dataSet in self.dataSets)
         self.actor.CalculateDataRanges()
         self.Refresh()
 
-        wx.PostEvent(self, PlotDataChangedEvent())
+        self.PostEvent(PlotDataChangedEvent())
 
         return dataSetId
 
@@ -308,3 +356,13 @@ class PlotWindow(wxVTKRenderWindowInteractor):
         writer.SetFileName(filename)
         self.GetRenderWindow().Render()
         writer.Write()
+
+
+class PlotWindow(BasePlotWindow, wxVTKRenderWindowInteractor):
+
+    def PostEvent(self, event):
+        wx.PostEvent(self, event)
+
+
+class OffscreenPlotWindow(BasePlotWindow, OffscreenRenderWindowInteractor):
+    pass
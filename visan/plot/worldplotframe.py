@@ -28,6 +28,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 import os
+import weakref
 
 import wx
 import numpy
@@ -36,232 +37,29 @@ from .animationtoolbar import AnimationToolbar, EVT_KEYFRAME_CHANGED
 from .typedsavefiledialog import TypedSaveFileDialog
 from .worldplotdatasetpanel import WorldPlotDataSetPanel, EVT_CURRENTDATASET_CHANGED
 from .worldplotpropertypanel import WorldPlotPropertyPanel
-from .worldplotwindow import WorldPlotWindow, EVT_WORLDPLOTDATA_CHANGED, EVT_WORLDVIEW_CHANGED, PROJECTIONS
+from .keyframeexport import ExportKeyframes
+from .offscreen import OffscreenPanel
+from .worldplotwindow import OffscreenWorldPlotWindow, WorldPlotWindow, EVT_WORLDPLOTDATA_CHANGED, \
+    EVT_WORLDVIEW_CHANGED, PROJECTIONS
 
 windowCount = 1
 
 
-class WorldPlotFrame(wx.Frame):
+def _WeakSource(kind, *arrays):
+    # only keep weak references to the input arrays, so a plot does not keep (possibly huge) arrays alive
+    return (kind,) + tuple(None if array is None else weakref.ref(array) for array in arrays)
 
-    def __init__(self, parent=None, id=-1, title=None, pos=wx.DefaultPosition, size=(800, 494)):
-        if parent is None:
-            # use top level wxWindow
-            try:
-                parent = wx.GetApp().GetTopWindow()
-            except Exception:
-                # If there is no top level window, just create parentless plot window
-                pass
-        if title is None:
-            # determine title
-            global windowCount
-            title = "VISAN World Plot"
-            if windowCount > 1:
-                title += " - %d" % windowCount
-            windowCount += 1
-        wx.Frame.__init__(self, parent, id, title, pos, size)
 
-        # Set icon if possible
-        if wx.Config.Get().Read("IconFile"):
-            self.SetIcon(wx.Icon(wx.Config.Get().Read("IconFile")))
-
-        # Set initial state
-        self.closingDown = False
-        self.filename = ""
-        self.dataSetAttributes = []
+class BaseWorldPlotFrame(object):
+    """
+    World plot handle functionality that is shared between the interactive world plot frame and the offscreen world
+    plot.
 
-        # Create and configure all widgets
-        self.CreateMenuBar()
-        self.CreateControls()
-        self.CreateLayout()
-
-        # Other Event Listeneres
-        self.Bind(wx.EVT_CLOSE, self.OnClose)
-
-        # Give the plotwindow the initial focus (since this might not happen automatically for e.g. Mac OS X)
-        self.plotWindow.SetFocus()
-
-        self.Show()
-        wx.Yield()
-
-    def __repr__(self):
-        return "<visan worldplot handle>"
-
-    def CreateMenuBar(self):
-        menubar = wx.MenuBar()
-
-        filemenu = wx.Menu()
-
-        item = filemenu.Append(wx.ID_SAVE, "&Save Image...\tCtrl-S", "Save the image to an image file")
-        self.Bind(wx.EVT_MENU, self.OnSave, item)
-
-        filemenu.AppendSeparator()
-
-        item = filemenu.Append(wx.ID_CLOSE, "&Close\tCtrl-W", "Close this Window")
-        self.Bind(wx.EVT_MENU, self.OnClose, item)
-
-        menubar.Append(filemenu, "&File")
-
-        viewmenu = wx.Menu()
-
-        self.viewPropertiesMenuItem = viewmenu.AppendCheckItem(wx.ID_ANY, "&Properties",
-                                                               "Toggle the display of the Property Panel")
-        self.viewPropertiesMenuItem.Enable(True)
-        self.Bind(wx.EVT_MENU, self.OnViewProps, self.viewPropertiesMenuItem)
-
-        viewmenu.AppendSeparator()
-
-        self.viewColorBarMenuItem = viewmenu.AppendCheckItem(wx.ID_ANY, "&Color Bar",
-                                                             "Toggle the display of the Color Bar")
-        self.Bind(wx.EVT_MENU, self.OnViewColorBar, self.viewColorBarMenuItem)
-
-        self.viewSliderMenuItem = viewmenu.AppendCheckItem(wx.ID_ANY, "&Animation Toolbar",
-                                                           "Toggle the display of the Animation Toolbar")
-        self.viewSliderMenuItem.Enable(False)
-        self.Bind(wx.EVT_MENU, self.OnViewSlider, self.viewSliderMenuItem)
-
-        menubar.Append(viewmenu, "&View")
-
-        self.SetMenuBar(menubar)
-
-    def CreateControls(self):
-        # Create a split panel
-        splitterstyle = wx.SP_LIVE_UPDATE
-        if wx.Platform == "__WXMAC__":
-            splitterstyle |= wx.SP_3DSASH
-        self.splitPanel = wx.SplitterWindow(self, -1, style=splitterstyle)
-
-        # Create the plot window
-        self.plotWindow = WorldPlotWindow(self.splitPanel, -1)
-        datadir = str(wx.Config.Get().Read('DirectoryLocation/ApplicationData'))
-        self.plotWindow.SetCoastLineFile(os.path.join(datadir, "gshhs_l.b"))
-        self.plotWindow.SetPoliticalBorderFile(os.path.join(datadir, "wdb_borders_l.b"))
-        self.plotWindow.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
-        self.plotWindow.Bind(EVT_WORLDPLOTDATA_CHANGED, self.OnPlotDataChanged)
-        self.plotWindow.Bind(EVT_WORLDVIEW_CHANGED, self.OnWorldViewChanged)
-
-        # Create the animation toolbar
-        self.animationToolbar = AnimationToolbar(self, self.plotWindow)
-        self.animationToolbar.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
-        self.animationToolbar.Bind(EVT_KEYFRAME_CHANGED, self.OnKeyframeChanged)
-
-        # Create the property panel
-        # Create a parent wxWindow for the notebook to allow for a background colour for the area behind the tabs
-        self.propertyPanel = wx.Window(self.splitPanel, -1)
-        # Set the background 'explicitly' to have it stick; TODO: still needed?
-        self.propertyPanel.SetBackgroundColour(self.propertyPanel.GetBackgroundColour())
-        self.propertyPanel.Bind(wx.EVT_SIZE, self.OnPropertyPanelSize)
-
-        # Create the property notebook
-        self.propertyNotebook = wx.Notebook(self.propertyPanel, -1)
-        # Don't add size handler for propertyNotebook: re-layout of propertyNotebook doesn't work on Windows
-
-        # Create the content for the property notebook
-        self.dataSetPropertyTab = WorldPlotDataSetPanel(self.propertyNotebook, self, self.plotWindow)
-        self.dataSetPropertyTab.Bind(wx.EVT_SIZE, self.OnDataSetPropertyTabSize)
-        self.dataSetPropertyTab.Bind(EVT_CURRENTDATASET_CHANGED, self.OnCurrentDataSetChanged)
-        self.plotPropertyTab = WorldPlotPropertyPanel(self.propertyNotebook, self.plotWindow)
-        self.plotPropertyTab.Bind(wx.EVT_SIZE, self.OnPlotPropertyTabSize)
-
-        # Add the content to the notebook
-        self.propertyNotebook.AddPage(self.dataSetPropertyTab, "Datasets")
-        self.propertyNotebook.AddPage(self.plotPropertyTab, "Plot")
-
-        # Initialize split panel
-        self.splitPanel.SetMinimumPaneSize(50)
-        self.splitPanel.Initialize(self.plotWindow)
-        self.splitPanel.Bind(wx.EVT_SIZE, self.OnSplitPanelSize)
-
-    def CreateLayout(self):
-        self.propertyPanelSizer = wx.BoxSizer(wx.HORIZONTAL)
-        self.propertyPanelSizer.Add(self.propertyNotebook, 1, wx.EXPAND)
-        self.propertyPanel.SetSizerAndFit(self.propertyPanelSizer)
-
-        self.splitPanelSizer = wx.BoxSizer(wx.HORIZONTAL)
-        self.splitPanelSizer.Add(self.plotWindow, 1, wx.EXPAND)
-        self.splitPanelSizer.Add((self.splitPanel.GetSashSize(), -1), 0, wx.EXPAND)
-        self.splitPanelSizer.Add(self.propertyPanel, 0, wx.EXPAND)
-        self.splitPanelSizer.Show(1, False)
-        self.splitPanelSizer.Show(2, False)
-        self.splitPanel.SetSizer(self.splitPanelSizer)
-
-        self.plotWindow.SetMinSize((80, 50))
-
-        self.verticalSizer = wx.BoxSizer(wx.VERTICAL)
-        self.verticalSizer.Add(self.splitPanel, 1, wx.EXPAND)
-        self.verticalSizer.Add(self.animationToolbar, 0, wx.EXPAND)
-
-        # Hide the animation toolbar by default (so it must be shown explicitly)
-        self.verticalSizer.Hide(self.animationToolbar)
-
-        # Hide the property panel by default (so it must be shown explicitly)
-        self.propertyPanel.Hide()
-
-        self.SetSizer(self.verticalSizer)
-        self.Layout()
-        self.UpdateMinSize()
-
-    def UpdateMinSize(self):
-        self.SetMinSize(self.GetBestSize())
-        currentsize = self.GetSize()
-        minsize = self.GetMinSize()
-        if currentsize.x < minsize.x or currentsize.y < minsize.y:
-            if currentsize.x < minsize.x:
-                currentsize.x = minsize.x
-            if currentsize.y < minsize.y:
-                currentsize.y = minsize.y
-            self.SetSize(currentsize)
-
-    def AdjustSplitPanelSashPosition(self):
-        # Update sash position in splitter window
-        # Try to keep the size of the property pane the same
-        sashPosition = -(self.propertyPanel.GetSize()[0] + self.splitPanel.GetSashSize())
-        self.splitPanel.SetSashPosition(sashPosition)
-
-    def ShowAnimationToolbar(self, show=True):
-        try:
-            show = bool(show)
-        except ValueError:
-            raise TypeError("Show Animation Toolbar parameter should be a boolean (was: '%s')" % str(show))
-        self.viewSliderMenuItem.Check(show)
-        if show:
-            self.viewSliderMenuItem.Enable()
-
-        self.verticalSizer.Show(self.animationToolbar, show)
-        self.Layout()
-
-        self.UpdateMinSize()
-        self.Refresh()
-
-    def ShowPropertyPanel(self, show=True):
-        try:
-            show = bool(show)
-        except ValueError:
-            raise TypeError("Show Property Panel parameter should be a boolean (was: '%s')" % str(show))
-        self.viewPropertiesMenuItem.Check(show)
-
-        if show:
-            self.splitPanel.SplitVertically(self.plotWindow, self.propertyPanel)
-            self.splitPanelSizer.Show(1, True)
-            self.splitPanelSizer.Show(2, True)
-            self.propertyPanel.Show()
-            self.propertyPanel.Fit()
-            self.AdjustSplitPanelSashPosition()
-        else:
-            self.splitPanel.Unsplit(self.propertyPanel)
-            self.splitPanelSizer.Show(1, False)
-            self.splitPanelSizer.Show(2, False)
-        self.splitPanel.Layout()
-
-        self.UpdateMinSize()
-        self.Refresh()
-
-    def ShowColorBar(self, show=True):
-        try:
-            show = bool(show)
-        except ValueError:
-            raise TypeError("Show Color Bar parameter should be a boolean (was: '%s')" % str(show))
-        self.viewColorBarMenuItem.Check(show)
-        self.plotWindow.ShowColorBar(show)
+    Subclasses should provide the 'plotWindow', 'dataSetPropertyTab', 'plotPropertyTab', 'dataSetAttributes' and
+    'dataSetSources' attributes and the ShowAnimationToolbar() and ShowColorBar() methods.
+    The 'dataSetSources' list keeps weak references to the input arrays of each data set, which allows the plot to be
+    recreated in another process as long as the arrays are still alive (see ExportKeyframesToImageFiles()).
+    """
 
     def SelectDataSet(self, dataSetId):
         if dataSetId < 0 or dataSetId >= self.plotWindow.GetNumDataSets():
@@ -324,6 +122,7 @@ class WorldPlotFrame(wx.Frame):
 
         # create empty attribute entry for this data set
         self.dataSetAttributes.extend([dict()])
+        self.dataSetSources.append(_WeakSource("point", latitudeArray, longitudeArray, dataArray))
 
         dataSetId = self.plotWindow.AddPointData(latitudeArray, longitudeArray, dataArray)
 
@@ -364,6 +163,7 @@ class WorldPlotFrame(wx.Frame):
 
         # create empty attribute entry for this data set
         self.dataSetAttributes.extend([dict()])
+        self.dataSetSources.append(_WeakSource("line", latitudeArray, longitudeArray))
 
         dataSetId = self.plotWindow.AddLineData(latitudeArray, longitudeArray)
 
@@ -398,7 +198,7 @@ class WorldPlotFrame(wx.Frame):
                 raise TypeError("plot latitude argument cannot be converted to numpy array. %s" % str(cornerLatitude))
         if latitudeArray.ndim == 1:
             # convert single swath to swath array
-            latitudeArray = numpy.resize(latitudeArray, [1, len(latitudeArray)])
+            latitudeArray = latitudeArray[numpy.newaxis]
         if latitudeArray.ndim != 2:
             raise ValueError("plot cornerLatitude argument cannot be a %d-dimensional numpy array" % latitudeArray.ndim)
         if latitudeArray.shape[1] != 2 and latitudeArray.shape[1] != 4:
@@ -417,7 +217,7 @@ class WorldPlotFrame(wx.Frame):
                 raise TypeError("plot longitude argument cannot be converted to numpy array. %s" % str(cornerLongitude))
         if longitudeArray.ndim == 1:
             # convert single swath to swath array
-            longitudeArray = numpy.resize(longitudeArray, [1, len(longitudeArray)])
+            longitudeArray = longitudeArray[numpy.newaxis]
         if longitudeArray.ndim != 2:
             raise ValueError("plot cornerLongitude argument cannot be a %d-dimensional numpy array" %
                              longitudeArray.ndim)
@@ -429,21 +229,13 @@ class WorldPlotFrame(wx.Frame):
 
         if latitudeArray.shape[1] == 2:
             # convert bounding rect coordinates to bounding polygons
-            newLat = numpy.zeros(shape=(latitudeArray.shape[0], 4))
-            newLon = numpy.zeros(shape=newLat.shape)
-            newLat[:, 0] = latitudeArray[:, 0]
-            newLon[:, 0] = longitudeArray[:, 0]
-            newLat[:, 1] = latitudeArray[:, 0]
-            newLon[:, 1] = longitudeArray[:, 1]
-            newLat[:, 2] = latitudeArray[:, 1]
-            newLon[:, 2] = longitudeArray[:, 1]
-            newLat[:, 3] = latitudeArray[:, 1]
-            newLon[:, 3] = longitudeArray[:, 0]
-            latitudeArray = newLat
-            longitudeArray = newLon
+            # corners are (lat0, lon0), (lat0, lon1), (lat1, lon1), (lat1, lon0)
+            latitudeArray = numpy.take(latitudeArray, [0, 0, 1, 1], axis=1).astype(numpy.double, copy=False)
+            longitudeArray = numpy.take(longitudeArray, [0, 1, 1, 0], axis=1).astype(numpy.double, copy=False)
 
         # create empty attribute entry for this data set
         self.dataSetAttributes.extend([dict()])
+        self.dataSetSources.append(_WeakSource("swath", latitudeArray, longitudeArray, dataArray))
 
         dataSetId = self.plotWindow.AddSwathData(latitudeArray, longitudeArray, dataArray)
 
@@ -466,7 +258,7 @@ class WorldPlotFrame(wx.Frame):
                 raise TypeError("plot data argument cannot be converted to numpy array. %s" % str(data))
         if dataArray.ndim == 2:
             # convert single grid to array with one grid element
-            dataArray = numpy.resize(dataArray, [1, dataArray.shape[0], dataArray.shape[1]])
+            dataArray = dataArray[numpy.newaxis]
         if dataArray.ndim != 3:
             raise ValueError("plot data argument cannot be a %d-dimensional numpy array" % dataArray.ndim)
 
@@ -513,11 +305,10 @@ class WorldPlotFrame(wx.Frame):
 
         # create empty attribute entry for this data set
         self.dataSetAttributes.extend([dict()])
+        self.dataSetSources.append(_WeakSource("grid", latitudeArray, longitudeArray, dataArray))
 
-        dataSetId = self.plotWindow.AddGridData(latitudeArray, longitudeArray, dataArray[0])
+        dataSetId = self.plotWindow.AddGridData(latitudeArray, longitudeArray, dataArray)
         if dataArray.shape[0] > 1:
-            for i in range(1, dataArray.shape[0]):
-                self.plotWindow.AddGridData(latitudeArray, longitudeArray, dataArray[i], dataSetId=dataSetId)
             self.ShowAnimationToolbar()
 
         self.ShowColorBar()
@@ -845,6 +636,242 @@ class WorldPlotFrame(wx.Frame):
         self.animationToolbar.UpdateNumKeyframes()
         self.animationToolbar.SetKeyframe(keyframe)
 
+    def ExportToImageFile(self, filename, imageType):
+        self.plotWindow.ExportToImageFile(filename, imageType)
+
+    def ExportKeyframesToImageFiles(self, filenamePattern, imageType, firstKeyframe=0, lastKeyframe=None,
+                                    numProcesses=None, progress=None):
+        return ExportKeyframes(self, filenamePattern, imageType, firstKeyframe, lastKeyframe, numProcesses, progress)
+
+
+class WorldPlotFrame(BaseWorldPlotFrame, wx.Frame):
+
+    def __init__(self, parent=None, id=-1, title=None, pos=wx.DefaultPosition, size=(800, 494)):
+        if parent is None:
+            # use top level wxWindow
+            try:
+                parent = wx.GetApp().GetTopWindow()
+            except Exception:
+                # If there is no top level window, just create parentless plot window
+                pass
+        if title is None:
+            # determine title
+            global windowCount
+            title = "VISAN World Plot"
+            if windowCount > 1:
+                title += " - %d" % windowCount
+            windowCount += 1
+        wx.Frame.__init__(self, parent, id, title, pos, size)
+
+        # Set icon if possible
+        if wx.Config.Get().Read("IconFile"):
+            self.SetIcon(wx.Icon(wx.Config.Get().Read("IconFile")))
+
+        # Set initial state
+        self.closingDown = False
+        self.filename = ""
+        self.dataSetAttributes = []
+        self.dataSetSources = []
+
+        # Create and configure all widgets
+        self.CreateMenuBar()
+        self.CreateControls()
+        self.CreateLayout()
+
+        # Other Event Listeneres
+        self.Bind(wx.EVT_CLOSE, self.OnClose)
+
+        # Give the plotwindow the initial focus (since this might not happen automatically for e.g. Mac OS X)
+        self.plotWindow.SetFocus()
+
+        self.Show()
+        wx.Yield()
+
+    def __repr__(self):
+        return "<visan worldplot handle>"
+
+    def CreateMenuBar(self):
+        menubar = wx.MenuBar()
+
+        filemenu = wx.Menu()
+
+        item = filemenu.Append(wx.ID_SAVE, "&Save Image...\tCtrl-S", "Save the image to an image file")
+        self.Bind(wx.EVT_MENU, self.OnSave, item)
+
+        self.exportAnimationMenuItem = filemenu.Append(wx.ID_ANY, "&Export Animation...",
+                                                       "Save all frames of the animation to numbered image files")
+        self.Bind(wx.EVT_MENU, self.OnExportAnimation, self.exportAnimationMenuItem)
+        self.exportAnimationMenuItem.Enable(False)
+
+        filemenu.AppendSeparator()
+
+        item = filemenu.Append(wx.ID_CLOSE, "&Close\tCtrl-W", "Close this Window")
+        self.Bind(wx.EVT_MENU, self.OnClose, item)
+
+        menubar.Append(filemenu, "&File")
+
+        viewmenu = wx.Menu()
+
+        self.viewPropertiesMenuItem = viewmenu.AppendCheckItem(wx.ID_ANY, "&Properties",
+                                                               "Toggle the display of the Property Panel")
+        self.viewPropertiesMenuItem.Enable(True)
+        self.Bind(wx.EVT_MENU, self.OnViewProps, self.viewPropertiesMenuItem)
+
+        viewmenu.AppendSeparator()
+
+        self.viewColorBarMenuItem = viewmenu.AppendCheckItem(wx.ID_ANY, "&Color Bar",
+                                                             "Toggle the display of the Color Bar")
+        self.Bind(wx.EVT_MENU, self.OnViewColorBar, self.viewColorBarMenuItem)
+
+        self.viewSliderMenuItem = viewmenu.AppendCheckItem(wx.ID_ANY, "&Animation Toolbar",
+                                                           "Toggle the display of the Animation Toolbar")
+        self.viewSliderMenuItem.Enable(False)
+        self.Bind(wx.EVT_MENU, self.OnViewSlider, self.viewSliderMenuItem)
+
+        menubar.Append(viewmenu, "&View")
+
+        self.SetMenuBar(menubar)
+
+    def CreateControls(self):
+        # Create a split panel
+        splitterstyle = wx.SP_LIVE_UPDATE
+        if wx.Platform == "__WXMAC__":
+            splitterstyle |= wx.SP_3DSASH
+        self.splitPanel = wx.SplitterWindow(self, -1, style=splitterstyle)
+
+        # Create the plot window
+        self.plotWindow = WorldPlotWindow(self.splitPanel, -1)
+        datadir = str(wx.Config.Get().Read('DirectoryLocation/ApplicationData'))
+        self.plotWindow.SetCoastLineFile(os.path.join(datadir, "gshhs_l.b"))
+        self.plotWindow.SetPoliticalBorderFile(os.path.join(datadir, "wdb_borders_l.b"))
+        self.plotWindow.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
+        self.plotWindow.Bind(EVT_WORLDPLOTDATA_CHANGED, self.OnPlotDataChanged)
+        self.plotWindow.Bind(EVT_WORLDVIEW_CHANGED, self.OnWorldViewChanged)
+
+        # Create the animation toolbar
+        self.animationToolbar = AnimationToolbar(self, self.plotWindow)
+        self.animationToolbar.Bind(wx.EVT_KEY_DOWN, self.OnKeyDown)
+        self.animationToolbar.Bind(EVT_KEYFRAME_CHANGED, self.OnKeyframeChanged)
+
+        # Create the property panel
+        # Create a parent wxWindow for the notebook to allow for a background colour for the area behind the tabs
+        self.propertyPanel = wx.Window(self.splitPanel, -1)
+        # Set the background 'explicitly' to have it stick; TODO: still needed?
+        self.propertyPanel.SetBackgroundColour(self.propertyPanel.GetBackgroundColour())
+        self.propertyPanel.Bind(wx.EVT_SIZE, self.OnPropertyPanelSize)
+
+        # Create the property notebook
+        self.propertyNotebook = wx.Notebook(self.propertyPanel, -1)
+        # Don't add size handler for propertyNotebook: re-layout of propertyNotebook doesn't work on Windows
+
+        # Create the content for the property notebook
+        self.dataSetPropertyTab = WorldPlotDataSetPanel(self.propertyNotebook, self, self.plotWindow)
+        self.dataSetPropertyTab.Bind(wx.EVT_SIZE, self.OnDataSetPropertyTabSize)
+        self.dataSetPropertyTab.Bind(EVT_CURRENTDATASET_CHANGED, self.OnCurrentDataSetChanged)
+        self.plotPropertyTab = WorldPlotPropertyPanel(self.propertyNotebook, self.plotWindow)
+        self.plotPropertyTab.Bind(wx.EVT_SIZE, self.OnPlotPropertyTabSize)
+
+        # Add the content to the notebook
+        self.propertyNotebook.AddPage(self.dataSetPropertyTab, "Datasets")
+        self.propertyNotebook.AddPage(self.plotPropertyTab, "Plot")
+
+        # Initialize split panel
+        self.splitPanel.SetMinimumPaneSize(50)
+        self.splitPanel.Initialize(self.plotWindow)
+        self.splitPanel.Bind(wx.EVT_SIZE, self.OnSplitPanelSize)
+
+    def CreateLayout(self):
+        self.propertyPanelSizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.propertyPanelSizer.Add(self.propertyNotebook, 1, wx.EXPAND)
+        self.propertyPanel.SetSizerAndFit(self.propertyPanelSizer)
+
+        self.splitPanelSizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.splitPanelSizer.Add(self.plotWindow, 1, wx.EXPAND)
+        self.splitPanelSizer.Add((self.splitPanel.GetSashSize(), -1), 0, wx.EXPAND)
+        self.splitPanelSizer.Add(self.propertyPanel, 0, wx.EXPAND)
+        self.splitPanelSizer.Show(1, False)
+        self.splitPanelSizer.Show(2, False)
+        self.splitPanel.SetSizer(self.splitPanelSizer)
+
+        self.plotWindow.SetMinSize((80, 50))
+
+        self.verticalSizer = wx.BoxSizer(wx.VERTICAL)
+        self.verticalSizer.Add(self.splitPanel, 1, wx.EXPAND)
+        self.verticalSizer.Add(self.animationToolbar, 0, wx.EXPAND)
+
+        # Hide the animation toolbar by default (so it must be shown explicitly)
+        self.verticalSizer.Hide(self.animationToolbar)
+
+        # Hide the property panel by default (so it must be shown explicitly)
+        self.propertyPanel.Hide()
+
+        self.SetSizer(self.verticalSizer)
+        self.Layout()
+        self.UpdateMinSize()
+
+    def UpdateMinSize(self):
+        self.SetMinSize(self.GetBestSize())
+        currentsize = self.GetSize()
+        minsize = self.GetMinSize()
+        if currentsize.x < minsize.x or currentsize.y < minsize.y:
+            if currentsize.x < minsize.x:
+                currentsize.x = minsize.x
+            if currentsize.y < minsize.y:
+                currentsize.y = minsize.y
+            self.SetSize(currentsize)
+
+    def AdjustSplitPanelSashPosition(self):
+        # Update sash position in splitter window
+        # Try to keep the size of the property pane the same
+        sashPosition = -(self.propertyPanel.GetSize()[0] + self.splitPanel.GetSashSize())
+        self.splitPanel.SetSashPosition(sashPosition)
+
+    def ShowAnimationToolbar(self, show=True):
+        try:
+            show = bool(show)
+        except ValueError:
+            raise TypeError("Show Animation Toolbar parameter should be a boolean (was: '%s')" % str(show))
+        self.viewSliderMenuItem.Check(show)
+        if show:
+            self.viewSliderMenuItem.Enable()
+
+        self.verticalSizer.Show(self.animationToolbar, show)
+        self.Layout()
+
+        self.UpdateMinSize()
+        self.Refresh()
+
+    def ShowPropertyPanel(self, show=True):
+        try:
+            show = bool(show)
+        except ValueError:
+            raise TypeError("Show Property Panel parameter should be a boolean (was: '%s')" % str(show))
+        self.viewPropertiesMenuItem.Check(show)
+
+        if show:
+            self.splitPanel.SplitVertically(self.plotWindow, self.propertyPanel)
+            self.splitPanelSizer.Show(1, True)
+            self.splitPanelSizer.Show(2, True)
+            self.propertyPanel.Show()
+            self.propertyPanel.Fit()
+            self.AdjustSplitPanelSashPosition()
+        else:
+            self.splitPanel.Unsplit(self.propertyPanel)
+            self.splitPanelSizer.Show(1, False)
+            self.splitPanelSizer.Show(2, False)
+        self.splitPanel.Layout()
+
+        self.UpdateMinSize()
+        self.Refresh()
+
+    def ShowColorBar(self, show=True):
+        try:
+            show = bool(show)
+        except ValueError:
+            raise TypeError("Show Color Bar parameter should be a boolean (was: '%s')" % str(show))
+        self.viewColorBarMenuItem.Check(show)
+        self.plotWindow.ShowColorBar(show)
+
     def OnClose(self, event):
         # Make sure this wxFrame is not closing down
         if self.closingDown:
@@ -871,6 +898,7 @@ class WorldPlotFrame(wx.Frame):
         self.dataSetPropertyTab.UpdateDataSetList()
         self.animationToolbar.UpdateNumKeyframes()
         self.viewSliderMenuItem.Enable(self.plotWindow.GetNumKeyframes() > 1)
+        self.exportAnimationMenuItem.Enable(self.plotWindow.GetNumKeyframes() > 1)
 
     def OnWorldViewChanged(self, event):
         self.plotPropertyTab.UpdateControls()
@@ -882,6 +910,14 @@ class WorldPlotFrame(wx.Frame):
 
         self.plotWindow.SetKeyframe(event.keyframe)
         self.dataSetPropertyTab.UpdateAttributes()
+        # build the next keyframe while the current one is shown
+        wx.CallAfter(self.PrefetchKeyframe, event.keyframe + 1)
+
+    def PrefetchKeyframe(self, keyframe):
+        # Make sure this wxFrame still exists and is not closing down
+        if not self or self.closingDown:
+            return
+        self.plotWindow.PrefetchKeyframe(keyframe)
 
     def OnCurrentDataSetChanged(self, event):
         # Make sure this wxFrame is not closing down
@@ -923,4 +959,92 @@ class WorldPlotFrame(wx.Frame):
                                      typeinfo=imagetypeinfo)
         if dialog.ShowModal() == wx.ID_OK:
             wx.Config.Get().Write('DirectoryLocation/Export', os.path.dirname(dialog.filename))
-            self.plotWindow.ExportToImageFile(dialog.filename, dialog.ext)
+            self.ExportToImageFile(dialog.filename, dialog.ext)
+
+    def OnExportAnimation(self, event):
+        imagetypeinfo = [("TIFF", "tif"), ("Windows Bitmap", "bmp"), ("JPEG", "jpg"), ("PNG", "png"), ("PNM", "pnm")]
+        dialog = TypedSaveFileDialog(self, title="Export Animation",
+                                     initialdir=str(wx.Config.Get().Read('DirectoryLocation/Export')),
+                                     typeinfo=imagetypeinfo)
+        if dialog.ShowModal() != wx.ID_OK:
+            return
+        wx.Config.Get().Write('DirectoryLocation/Export', os.path.dirname(dialog.filename))
+
+        # frame numbers are inserted before the extension (e.g. 'ozone.png' -> 'ozone_0000.png')
+        base, ext = os.path.splitext(dialog.filename)
+        numKeyframes = self.plotWindow.GetNumKeyframes()
+        numDigits = max(4, len(str(numKeyframes - 1)))
+        filenamePattern = base.replace("%", "%%") + "_%0" + str(numDigits) + "d" + ext
+
+        progressDialog = wx.ProgressDialog("Export Animation", "Exporting %d frames..." % numKeyframes,
+                                           maximum=numKeyframes, parent=self,
+                                           style=wx.PD_APP_MODAL | wx.PD_CAN_ABORT | wx.PD_ELAPSED_TIME |
+                                           wx.PD_REMAINING_TIME)
+
+        def progress(numExported, numTotal):
+            return progressDialog.Update(numExported)[0]
+
+        try:
+            numExported, framesPerSecond = self.ExportKeyframesToImageFiles(filenamePattern, dialog.ext,
+                                                                            progress=progress)
+        finally:
+            progressDialog.Destroy()
+        wx.MessageBox(parent=self, message="Exported %d of %d frames (%.1f frames per second)" %
+                      (numExported, numKeyframes, framesPerSecond), caption="Export Animation",
+                      style=wx.OK | wx.ICON_INFORMATION)
+
+
+class OffscreenWorldPlotFrame(BaseWorldPlotFrame):
+    """
+    World plot handle that renders into an offscreen render window instead of a wx frame.
+
+    This allows world plots to be created and exported to image files without a display or a running wx event loop.
+    """
+
+    def __init__(self, size=(800, 494)):
+        self.title = ""
+        self.dataSetAttributes = []
+        self.dataSetSources = []
+        self.plotWindow = OffscreenWorldPlotWindow(size=size)
+        datadir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+        self.plotWindow.SetCoastLineFile(os.path.join(datadir, "gshhs_l.b"))
+        self.plotWindow.SetPoliticalBorderFile(os.path.join(datadir, "wdb_borders_l.b"))
+        self.dataSetPropertyTab = OffscreenPanel()
+        self.plotPropertyTab = OffscreenPanel()
+
+    def __repr__(self):
+        return "<visan offscreen worldplot handle>"
+
+    def GetTitle(self):
+        return self.title
+
+    def SetTitle(self, title):
+        self.title = title
+
+    def ShowAnimationToolbar(self, show=True):
+        pass
+
+    def ShowPropertyPanel(self, show=True):
+        pass
+
+    def ShowColorBar(self, show=True):
+        try:
+            show = bool(show)
+        except ValueError:
+            raise TypeError("Show Color Bar parameter should be a boolean (was: '%s')" % str(show))
+        self.plotWindow.ShowColorBar(show)
+
+    def SetKeyframe(self, keyframe):
+        self.plotWindow.SetKeyframe(keyframe)
+
+    def Freeze(self):
+        pass
+
+    def Thaw(self):
+        pass
+
+    def Refresh(self):
+        pass
+
+    def Destroy(self):
+        self.plotWindow.Destroy()
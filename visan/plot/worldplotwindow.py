@@ -29,7 +29,8 @@
 
 import numpy
 import vtk
-from vtk.util.numpy_support import numpy_to_vtk
+from vtk.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+from .offscreen import OffscreenRenderWindowInteractor
 from .wxVTKRenderWindowInteractor import wxVTKRenderWindowInteractor
 import wx
 
@@ -64,10 +65,16 @@ PROJECTION_IDS = {
     PROJECTION_3D: 7,
 }
 
-class WorldPlotWindow(wxVTKRenderWindowInteractor):
+class BaseWorldPlotWindow(object):
+    """
+    World plot window functionality that is shared between the wx window and the offscreen renderer.
+
+    This class should be combined with a render window interactor class (see WorldPlotWindow and
+    OffscreenWorldPlotWindow).
+    """
 
     def __init__(self, *args, **kwargs):
-        super(WorldPlotWindow, self).__init__(*args, **kwargs)
+        super(BaseWorldPlotWindow, self).__init__(*args, **kwargs)
 
         self.keyframe = 0
         self.numKeyframes = 1
@@ -101,7 +108,7 @@ class WorldPlotWindow(wxVTKRenderWindowInteractor):
         self.renderer3D.AddActor(actor3D)
 
         def onWorldViewChanged(caller, event, calldata=None):
-            wx.PostEvent(self, WorldViewChangedEvent())
+            self.PostEvent(WorldViewChangedEvent())
         self.style2D.AddObserver("WorldViewChanged", onWorldViewChanged)
         self.style3D.AddObserver("WorldViewChanged", onWorldViewChanged)
 
@@ -231,7 +238,7 @@ class WorldPlotWindow(wxVTKRenderWindowInteractor):
             self.numKeyframes = data.GetNumberOfKeyframes()
         self.Refresh()
 
-        wx.PostEvent(self, WorldPlotDataChangedEvent())
+        self.PostEvent(WorldPlotDataChangedEvent())
 
         return len(self.dataSets) - 1
 
@@ -253,7 +260,7 @@ class WorldPlotWindow(wxVTKRenderWindowInteractor):
             if pointData.GetNumberOfKeyframes() > self.numKeyframes:
                 self.numKeyframes = pointData.GetNumberOfKeyframes()
             self.Refresh()
-            wx.PostEvent(self, WorldPlotDataChangedEvent())
+            self.PostEvent(WorldPlotDataChangedEvent())
         return dataSetId
 
     def AddLineData(self, latitude, longitude, dataSetId=None):
@@ -272,7 +279,7 @@ class WorldPlotWindow(wxVTKRenderWindowInteractor):
             if lineData.GetNumberOfKeyframes() > self.numKeyframes:
                 self.numKeyframes = lineData.GetNumberOfKeyframes()
             self.Refresh()
-            wx.PostEvent(self, WorldPlotDataChangedEvent())
+            self.PostEvent(WorldPlotDataChangedEvent())
         return dataSetId
 
     def AddSwathData(self, cornerLatitude, cornerLongitude, data=None, dataSetId=None):
@@ -282,8 +289,8 @@ class WorldPlotWindow(wxVTKRenderWindowInteractor):
             swathData = self.dataSets[dataSetId]
             if swathData.__class__.__name__ != "vtkWorldPlotSwathData":
                 raise Exception("swathData can only be added to existing swathData")
-        cornerLatitude = numpy_to_vtk(numpy.asarray(cornerLatitude, dtype=numpy.double))
-        cornerLongitude = numpy_to_vtk(numpy.asarray(cornerLongitude, dtype=numpy.double))
+        cornerLatitude = numpy_to_vtk(numpy.ascontiguousarray(cornerLatitude, dtype=numpy.double))
+        cornerLongitude = numpy_to_vtk(numpy.ascontiguousarray(cornerLongitude, dtype=numpy.double))
         if data is not None:
             data = numpy_to_vtk(numpy.asarray(data, dtype=numpy.double))
         swathData.AddData(cornerLatitude, cornerLongitude, data)
@@ -293,7 +300,7 @@ class WorldPlotWindow(wxVTKRenderWindowInteractor):
             if swathData.GetNumberOfKeyframes() > self.numKeyframes:
                 self.numKeyframes = swathData.GetNumberOfKeyframes()
             self.Refresh()
-            wx.PostEvent(self, WorldPlotDataChangedEvent())
+            self.PostEvent(WorldPlotDataChangedEvent())
         return dataSetId
 
     def AddGridData(self, latitude, longitude, data, dataSetId=None):
@@ -305,17 +312,28 @@ class WorldPlotWindow(wxVTKRenderWindowInteractor):
                 raise Exception("gridData can only be added to existing gridData")
         latitude = numpy_to_vtk(numpy.asarray(latitude, dtype=numpy.double))
         longitude = numpy_to_vtk(numpy.asarray(longitude, dtype=numpy.double))
-        data = numpy_to_vtk(numpy.ravel(numpy.asarray(data, dtype=numpy.double)))
-        gridData.AddData(latitude, longitude, data)
+        # data can be a single grid or a block of grids [numGrids, numLatitudes, numLongitudes]
+        # the block is passed as a whole (without a copy for contiguous double data); the geometry for each grid is
+        # only created when it is shown
+        data = numpy.asarray(data, dtype=numpy.double)
+        numKeyframes = data.shape[0] if data.ndim == 3 else 1
+        data = numpy_to_vtk(numpy.ascontiguousarray(data).ravel())
+        gridData.AddKeyframes(latitude, longitude, data, numKeyframes)
         if dataSetId is None:
             return self.AddWorldPlotData(gridData)
         else:
             if gridData.GetNumberOfKeyframes() > self.numKeyframes:
                 self.numKeyframes = gridData.GetNumberOfKeyframes()
             self.Refresh()
-            wx.PostEvent(self, WorldPlotDataChangedEvent())
+            self.PostEvent(WorldPlotDataChangedEvent())
         return dataSetId
 
+    def PrefetchKeyframe(self, keyframe):
+        # create the geometry of a keyframe in advance for the datasets that build it on demand
+        for dataSet in self.dataSets:
+            if isinstance(dataSet, vtkWorldPlotGridData):
+                dataSet.PrefetchKeyframe(keyframe)
+
     def GetNumKeyframesForDataSet(self, dataSetId):
         return self.dataSets[dataSetId].GetNumberOfKeyframes()
 
@@ -523,6 +541,28 @@ class WorldPlotWindow(wxVTKRenderWindowInteractor):
         else:
             return self.style2D.GetViewZoom()
 
+    def ProjectCoordinates(self, latitude, longitude):
+        # Map arrays of latitude/longitude values to normalized 2D coordinates of the current projection
+        shape = numpy.shape(latitude)
+        latitude = numpy_to_vtk(numpy.ascontiguousarray(latitude, dtype=numpy.double).ravel())
+        longitude = numpy_to_vtk(numpy.ascontiguousarray(longitude, dtype=numpy.double).ravel())
+        x = vtk.vtkDoubleArray()
+        y = vtk.vtkDoubleArray()
+        vtkProjFilter.NormalizedProjection2D(PROJECTION_IDS[self.projection], self.projCenterLatitude,
+                                             self.projCenterLongitude, latitude, longitude, x, y)
+        return vtk_to_numpy(x).reshape(shape), vtk_to_numpy(y).reshape(shape)
+
+    def DeprojectCoordinates(self, x, y):
+        # Map arrays of normalized 2D coordinates of the current projection to latitude/longitude values
+        shape = numpy.shape(x)
+        x = numpy_to_vtk(numpy.ascontiguousarray(x, dtype=numpy.double).ravel())
+        y = numpy_to_vtk(numpy.ascontiguousarray(y, dtype=numpy.double).ravel())
+        latitude = vtk.vtkDoubleArray()
+        longitude = vtk.vtkDoubleArray()
+        vtkProjFilter.NormalizedDeprojection2D(PROJECTION_IDS[self.projection], self.projCenterLatitude,
+                                               self.projCenterLongitude, x, y, latitude, longitude)
+        return vtk_to_numpy(latitude).reshape(shape), vtk_to_numpy(longitude).reshape(shape)
+
     def SetColorRange(self, dataSetId, minValue, maxValue):
         self.dataSets[dataSetId].GetColorTable().SetColorRange(minValue, maxValue)
         self.Refresh()
@@ -626,12 +666,6 @@ class WorldPlotWindow(wxVTKRenderWindowInteractor):
         self.GetRenderWindow().Render()
         writer.Write()
 
-    def OnSize(self, event):
-        self.UpdateColorBarSize()
-        if self.projection != PROJECTION_3D:
-            self.UpdateStyle2D()
-        event.Skip()
-
     def UpdateStyle2D(self):
         # Update 2D interactor style with new window size
         w, h = self.GetSize()
@@ -656,3 +690,19 @@ class WorldPlotWindow(wxVTKRenderWindowInteractor):
         self.colorBarRenderer.SetViewport(0, 0, 1, relativeHeight)
         self.renderer2D.SetViewport(0, relativeHeight, 1, 1)
         self.renderer3D.SetViewport(0, relativeHeight, 1, 1)
+
+
+class WorldPlotWindow(BaseWorldPlotWindow, wxVTKRenderWindowInteractor):
+
+    def PostEvent(self, event):
+        wx.PostEvent(self, event)
+
+    def OnSize(self, event):
+        self.UpdateColorBarSize()
+        if self.projection != PROJECTION_3D:
+            self.UpdateStyle2D()
+        event.Skip()
+
+
+class OffscreenWorldPlotWindow(BaseWorldPlotWindow, OffscreenRenderWindowInteractor):
+    pass
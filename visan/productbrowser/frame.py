@@ -36,14 +36,22 @@ import os
 import sys
 import math
 import struct
+import time
 import weakref
 
 from . import model
 from . import renderers
+from . import structure
 
 
 # CONSTANTS
 _maxLineLength = 256
+# maximum number of search results that are shown
+_maxSearchResults = 50
+# time (in seconds) spent on building the path index before control is returned to the user interface
+_pathIndexStepDuration = 0.02
+# delay (in milliseconds) between two steps of building the path index
+_pathIndexStepInterval = 10
 
 
 # EXCEPTION HIERARCHY
@@ -186,13 +194,14 @@ class NavigationController(Observable):
 
         self.ignoreFocus = False
 
-    def Initialize(self, view, cursor):
+    def Initialize(self, view, cursor, structureIndex=None):
         self.view = view
 
         try:
             self.productRootNode = model.NodeFactory(cursor)
             self.productRootNode.cursor = cursor
             self.productRootNode.name = "|product|"
+            self.productRootNode.structure = structureIndex
             self.productRootNode.initialize()
 
         except coda.CodacError as ex:
@@ -239,7 +248,18 @@ class NavigationController(Observable):
                 wx.CallAfter(view.SelectItem, index)
                 return True
 
+    def _WhenArrayLoadersIdle(self, window, method, *args):
+        # CODA is not thread safe, so navigation is handled once the data that is being read in the background is
+        # available; by then 'window' may have been destroyed, in which case the navigation is dropped
+        def call():
+            if window:
+                method(*args)
+        renderers.CallWhenArrayLoadersIdle(call)
+
     def OnItemDeselected(self, view, parent, index):
+        self._WhenArrayLoadersIdle(view, self._OnItemDeselected, view, parent, index)
+
+    def _OnItemDeselected(self, view, parent, index):
         # pop all views to the right of this view
         self.view.PopUntil(view)
 
@@ -266,6 +286,9 @@ class NavigationController(Observable):
         self.ignoreFocus = False
 
     def OnItemSelected(self, view, parent, index):
+        self._WhenArrayLoadersIdle(view, self._OnItemSelected, view, parent, index)
+
+    def _OnItemSelected(self, view, parent, index):
         self.ignoreFocus = True
 
         # try to access the selected node.
@@ -339,6 +362,10 @@ class NavigationController(Observable):
             self.ignoreFocus = False
 
     def OnChildFocus(self, view, parent):
+        if not self.ignoreFocus:
+            self._WhenArrayLoadersIdle(view, self._OnChildFocus, view, parent)
+
+    def _OnChildFocus(self, view, parent):
         if not self.ignoreFocus:
             self.ignoreFocus = True
 
@@ -360,6 +387,9 @@ class NavigationController(Observable):
             self.ignoreFocus = False
 
     def Back(self):
+        self._WhenArrayLoadersIdle(self.frame, self._Back)
+
+    def _Back(self):
         if self.autoExpanding:
             return
 
@@ -394,6 +424,9 @@ class NavigationController(Observable):
             self.ignoreFocus = False
 
     def Forward(self):
+        self._WhenArrayLoadersIdle(self.frame, self._Forward)
+
+    def _Forward(self):
         if self.autoExpanding:
             return
 
@@ -1255,11 +1288,7 @@ class NodeDataView(wx.Panel):
             except renderers.RenderError as ex:
                 view.Destroy()
                 view = renderers.UnavailableRenderer(self)
-
-                message = wx.MessageDialog(self.frame(), "Could not instantiate renderer.\nPlease check product "
-                                           "sanity, e.g. using codacheck.\n\nError message: \"%s\"" % (str(ex),),
-                                           "Render error", style=wx.OK | wx.ICON_ERROR | wx.STAY_ON_TOP)
-                message.ShowModal()
+                renderers.ShowRenderError(self.frame(), str(ex))
 
             # if multiple renderers are qualified, create a toggle
             # button for each renderer and cache the views.
@@ -1303,11 +1332,7 @@ class NodeDataView(wx.Panel):
                 except renderers.RenderError as ex:
                     view.Destroy()
                     view = renderers.UnavailableRenderer(self)
-
-                    message = wx.MessageDialog(self.frame(), "Could not instantiate renderer.\nPlease check product "
-                                               "sanity, e.g. using codacheck.\n\nError message: \"%s\"" % (str(ex),),
-                                               "Render error", style=wx.OK | wx.ICON_ERROR | wx.STAY_ON_TOP)
-                    message.ShowModal()
+                    renderers.ShowRenderError(self.frame(), str(ex))
 
                 # add view to cache.
                 self.views[nextView] = view
@@ -1359,6 +1384,81 @@ class PathView(wx.TextCtrl, Observable):
             self.SetValue("")
 
 
+class PathSearchCtrl(wx.SearchCtrl):
+
+    def __init__(self, parent, pathView):
+        wx.SearchCtrl.__init__(self, parent, -1, "", size=(200, -1), style=wx.TE_PROCESS_ENTER)
+        self.SetDescriptiveText("Search fields")
+        self.ShowCancelButton(True)
+
+        # weakref to avoid garbage cycle.
+        self.pathView = weakref.ref(pathView)
+        self.paths = []
+        self.complete = False
+        self.results = {}
+
+        menu = wx.Menu()
+        self.regexItem = menu.AppendCheckItem(-1, "Regular expression")
+        self.SetMenu(menu)
+
+        self.Bind(wx.EVT_TEXT_ENTER, self.OnSearch)
+        self.Bind(wx.EVT_SEARCHCTRL_SEARCH_BTN, self.OnSearch)
+        self.Bind(wx.EVT_SEARCHCTRL_CANCEL_BTN, self.OnCancel)
+
+    def SetPaths(self, paths, complete):
+        self.paths = paths
+        self.complete = complete
+
+    def OnCancel(self, event):
+        self.SetValue("")
+
+    def OnSearch(self, event):
+        pattern = self.GetValue()
+        if len(pattern) == 0:
+            return
+
+        try:
+            matches = structure.SearchPaths(self.paths, pattern, self.regexItem.IsChecked())
+        except re.error as ex:
+            message = wx.MessageDialog(self, "Invalid regular expression:\n%s" % (str(ex),), "Search Error",
+                                       style=wx.OK | wx.ICON_ERROR | wx.STAY_ON_TOP)
+            message.ShowModal()
+            return
+
+        if len(matches) == 1 and self.complete:
+            self.GotoPath(matches[0])
+            return
+
+        menu = wx.Menu()
+        self.results = {}
+        for path in matches[:_maxSearchResults]:
+            item = menu.Append(-1, path)
+            self.results[item.GetId()] = path
+        if len(matches) > _maxSearchResults:
+            menu.Append(-1, "(%d more matches)" % (len(matches) - _maxSearchResults,)).Enable(False)
+        elif len(matches) == 0:
+            menu.Append(-1, "(no matches)").Enable(False)
+        if not self.complete:
+            menu.Append(-1, "(still indexing fields)").Enable(False)
+        menu.Bind(wx.EVT_MENU, self.OnSelectResult)
+        self.PopupMenu(menu, (0, self.GetSize()[1]))
+        menu.Destroy()
+
+    def OnSelectResult(self, event):
+        try:
+            path = self.results[event.GetId()]
+        except KeyError:
+            return
+        self.GotoPath(path)
+
+    def GotoPath(self, path):
+        # navigate via the path view, so the path is handled exactly like a path that is entered by the user
+        pathView = self.pathView()
+        if pathView:
+            pathView.SetValue(path)
+            wx.CallAfter(pathView.notifyObservers)
+
+
 class PathDropTarget(wx.TextDropTarget, Observable):
 
     def __init__(self):
@@ -1385,6 +1485,8 @@ class ProductBrowser(wx.Frame):
             model.InitIcons()
             ProductBrowser.initialised = True
 
+        # CODA is not thread safe, so a product browser should be created from a call that is passed to
+        # renderers.CallWhenArrayLoadersIdle() (another product browser may still be reading data in the background)
         if 8 * struct.calcsize("P") == 32:
             # On a 32-bit platform we open a product without using mmap.
             # This allows us to have multiple large product files open without
@@ -1403,6 +1505,7 @@ class ProductBrowser(wx.Frame):
             coda.cursor_set_product(self.cursor, self.product)
 
             self.closing = False
+            self.pathIndexTimer = None
 
             # register node renderers
             self.RegisterRenderers()
@@ -1454,11 +1557,14 @@ class ProductBrowser(wx.Frame):
                                         size=(23, 23))
         copyCmdButton.Bind(wx.EVT_BUTTON, self.OnCopyCmd)
 
+        self.searchCtrl = PathSearchCtrl(panel, self.pathView)
+
         pathSizer = wx.BoxSizer(wx.HORIZONTAL)
         pathSizer.Add(backButton, 0, wx.ALIGN_CENTER | wx.LEFT | wx.RIGHT, 5)
         pathSizer.Add(forwardButton, 0, wx.ALIGN_CENTER | wx.RIGHT, 5)
         pathSizer.Add(self.pathView, 1, wx.RIGHT, 5)
         pathSizer.Add(copyCmdButton, 0, wx.ALIGN_CENTER | wx.RIGHT, 5)
+        pathSizer.Add(self.searchCtrl, 0, wx.ALIGN_CENTER | wx.RIGHT, 5)
 
         splitterstyle = wx.SP_LIVE_UPDATE | wx.SIMPLE_BORDER
         if wx.Platform == "__WXMAC__":
@@ -1486,7 +1592,9 @@ class ProductBrowser(wx.Frame):
         # the position of this line of code is important: Initialize() will cause
         # a call to notifyObservers(). therefore, all observers that want to be
         # notified of this initial event should register before this line.
-        self.navigationController.Initialize(navigationView, cursor)
+        structureIndex = structure.GetStructureIndex(product)
+        self.navigationController.Initialize(navigationView, cursor, structureIndex)
+        self.StartPathIndex(product, structureIndex)
 
         splitter.SplitHorizontally(navigationView, self.nodeView, -300)
 
@@ -1498,6 +1606,49 @@ class ProductBrowser(wx.Frame):
         panel.SetSizer(sizer)
         self.SetSizeHints(400, 300)
 
+    def StartPathIndex(self, product, structureIndex):
+        self.structureIndex = structureIndex
+        if structureIndex is not None and structureIndex.paths is not None:
+            # the paths are already known for this product type
+            self.searchCtrl.SetPaths(structureIndex.paths, True)
+            return
+
+        # the paths are collected in small steps, so the product can be browsed while the index is being built
+        try:
+            self.pathGenerator = structure.GeneratePaths(coda.get_product_root_type(product))
+        except coda.CodacError:
+            return
+        self.indexedPaths = []
+        self.searchCtrl.SetPaths(self.indexedPaths, False)
+        self.pathIndexTimer = wx.CallLater(_pathIndexStepInterval, self.OnBuildPathIndex)
+
+    def OnBuildPathIndex(self):
+        if not self or self.closing:
+            return
+
+        if renderers.ArrayLoadersActive():
+            # CODA is not thread safe, so postpone the next step until the data has been read
+            self.pathIndexTimer.Start(_pathIndexStepInterval)
+            return
+
+        endTime = time.time() + _pathIndexStepDuration
+        try:
+            while time.time() < endTime:
+                self.indexedPaths.append(next(self.pathGenerator))
+        except StopIteration:
+            self.pathIndexTimer = None
+            self.searchCtrl.SetPaths(self.indexedPaths, True)
+            if self.structureIndex is not None:
+                self.structureIndex.SetPaths(self.indexedPaths)
+            return
+        except coda.CodacError:
+            # search within the paths that could be determined
+            self.pathIndexTimer = None
+            self.searchCtrl.SetPaths(self.indexedPaths, True)
+            return
+
+        self.pathIndexTimer.Start(_pathIndexStepInterval)
+
     def RegisterRenderers(self):
         NodeDataView.RegisterRenderer(model.TYPE_RECORD, renderers.RecordRenderer)
         NodeDataView.RegisterRenderer(model.TYPE_ARRAY, renderers.ArrayRenderer)
@@ -1552,14 +1703,21 @@ class ProductBrowser(wx.Frame):
 
         self.closing = True
 
+        if self.pathIndexTimer is not None:
+            self.pathIndexTimer.Stop()
+            self.pathIndexTimer = None
+
         # unregister observers
         self.navigationController.unregister(self.pathView)
         self.pathView.unregister(self.navigationController)
         self.pathDropTarget.unregister(self.navigationController)
         self.navigationController.unregister(self.nodeView)
 
-        # close product
-        coda.close(self.product)
+        # close product (once the reads in the background that may still be using it have finished)
+        renderers.CallWhenArrayLoadersIdle(coda.close, self.product)
+
+        # store any new structure information of the product type for later sessions
+        structure.SaveStructureIndices()
 
         if self.GetParent():
             self.GetParent().SetFocus()
@@ -28,6 +28,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 import coda
+import collections
 import copy
 import wx
 import os.path
@@ -78,6 +79,14 @@ _TypeDictionary = {TYPE_INT8: "int8",
                    TYPE_RECORD: "record",
                    TYPE_UNKNOWN: "unknown"}
 
+# string representations of all byte values (used for formatting raw data)
+_hexByteStrings = ["0x%x" % (i,) for i in range(256)]
+
+# maximum number of element nodes that are kept for each array of records/arrays
+ARRAY_ELEMENT_CACHE_SIZE = 1024
+# number of consecutive element nodes that are created at once when an element of such an array is requested
+ARRAY_ELEMENT_PREFETCH_SIZE = 64
+
 icons = None
 iconImageList = None
 iconDictionary = None
@@ -95,6 +104,10 @@ class Node(object):
         self.parent = None
         self.cursor = None
 
+        # structure index of the product (if any) and the path that identifies the type of this node in the index
+        self.structure = None
+        self.typePath = ""
+
         self.name = ""
         self.real_name = ""
         self.type = type
@@ -211,11 +224,52 @@ class ArrayNode(CompoundNode):
         return isinstance(self, ObjectArrayNode)
 
 
+class ArrayElementCache(object):
+    """LRU cache of the element nodes of an ObjectArrayNode.
+
+    At most maxSize elements are kept. Elements that are evicted while still being referenced elsewhere (e.g. by a
+    view) are returned again by get() as long as they are alive, so an element is never represented by two nodes.
+    """
+
+    def __init__(self, maxSize=ARRAY_ELEMENT_CACHE_SIZE):
+        self.maxSize = maxSize
+        self.elements = collections.OrderedDict()
+        self.evicted = weakref.WeakValueDictionary()
+
+    def __contains__(self, index):
+        return index in self.elements or index in self.evicted
+
+    def __len__(self):
+        return len(self.elements)
+
+    def get(self, index):
+        try:
+            self.elements.move_to_end(index)
+            return self.elements[index]
+        except KeyError:
+            pass
+        element = self.evicted.pop(index, None)
+        if element is not None:
+            self.insert(index, element)
+        return element
+
+    def insert(self, index, element):
+        self.elements[index] = element
+        self.elements.move_to_end(index)
+        while len(self.elements) > self.maxSize:
+            evictedIndex, evictedElement = self.elements.popitem(last=False)
+            self.evicted[evictedIndex] = evictedElement
+
+    def clear(self):
+        self.elements.clear()
+        self.evicted.clear()
+
+
 class ObjectArrayNode(ArrayNode):
 
     def __init__(self, base=TYPE_UNKNOWN):
         ArrayNode.__init__(self, base)
-        self.cache = {}
+        self.cache = ArrayElementCache()
 
     def initialize(self):
         ArrayNode.initialize(self)
@@ -231,20 +285,29 @@ class ObjectArrayNode(ArrayNode):
 
 
 def NodeFactory(cursor):
-    nodeCodaType = coda.cursor_get_type(cursor)
+    return CreateNode(*GetNodeTypes(coda.cursor_get_type(cursor)))
+
+
+def GetNodeTypes(nodeCodaType):
     nodeCodaClass = coda.type_get_class(nodeCodaType)
 
     type = TranslateCodaType(nodeCodaClass, nodeCodaType)
+    baseType = TYPE_UNKNOWN
 
-    if type == TYPE_RECORD:
-        return RecordNode()
-
-    elif (type == TYPE_ARRAY):
+    if (type == TYPE_ARRAY):
         baseCodaType = coda.type_get_array_base_type(nodeCodaType)
         baseCodaClass = coda.type_get_class(baseCodaType)
 
         baseType = TranslateCodaType(baseCodaClass, baseCodaType)
 
+    return type, baseType
+
+
+def CreateNode(type, baseType=TYPE_UNKNOWN):
+    if type == TYPE_RECORD:
+        return RecordNode()
+
+    elif (type == TYPE_ARRAY):
         if ((baseType == TYPE_RECORD) or (baseType == TYPE_ARRAY)):
             return ObjectArrayNode(baseType)
         else:
@@ -296,19 +359,50 @@ def RetrieveFieldInfo(node):
     node._fields = []
 
     if len(node) > 0:
+        # the static field information is taken from the structure index when available
+        fieldInfo = None
+        if node.structure is not None:
+            fieldInfo = node.structure.GetFields(node.typePath)
+            if fieldInfo is not None and len(fieldInfo) != len(node):
+                fieldInfo = None
+        updateIndex = node.structure is not None and fieldInfo is None
+        if fieldInfo is None:
+            fieldInfo = [None] * len(node)
+        else:
+            fieldInfo = list(fieldInfo)
+
         try:
             cursor = copy.deepcopy(node.cursor)
-            nodeCodaType = coda.cursor_get_type(node.cursor)
+            nodeCodaType = None
             coda.cursor_goto_first_record_field(cursor)
             for i in range(0, len(node)):
-                field = NodeFactory(cursor)
+                available = (coda.cursor_get_record_field_available_status(node.cursor, i) == 1)
+                if fieldInfo[i] is None or (available and fieldInfo[i][3] is None):
+                    if nodeCodaType is None:
+                        nodeCodaType = coda.cursor_get_type(node.cursor)
+                    types = (None, None)
+                    if available:
+                        # the type of an unavailable field is 'no data', so it is only stored for available fields
+                        types = GetNodeTypes(coda.cursor_get_type(cursor))
+                    fieldInfo[i] = (coda.type_get_record_field_name(nodeCodaType, i),
+                                    coda.type_get_record_field_real_name(nodeCodaType, i),
+                                    coda.type_get_record_field_hidden_status(nodeCodaType, i) == 1) + types
+                    updateIndex = updateIndex or (node.structure is not None and available)
+
+                name, real_name, hidden, type, baseType = fieldInfo[i]
+                if available:
+                    field = CreateNode(type, baseType)
+                else:
+                    field = NodeFactory(cursor)
                 node._fields.append(field)
                 field.parent = weakref.proxy(node)
                 field.cursor = copy.deepcopy(cursor)
-                field.name = coda.type_get_record_field_name(nodeCodaType, i)
-                field.real_name = coda.type_get_record_field_real_name(nodeCodaType, i)
-                field.available = (coda.cursor_get_record_field_available_status(node.cursor, i) == 1)
-                field.hidden = (coda.type_get_record_field_hidden_status(nodeCodaType, i) == 1)
+                field.name = name
+                field.real_name = real_name
+                field.available = available
+                field.hidden = hidden
+                field.structure = node.structure
+                field.typePath = node.typePath + "/" + name
                 field.initialize()
 
                 if i < len(node) - 1:
@@ -318,48 +412,56 @@ def RetrieveFieldInfo(node):
             node._fields = None
             raise CorruptProductError("[CODA] %s" % (str(ex),))
 
+        if updateIndex:
+            node.structure.SetFields(node.typePath, fieldInfo)
+
 
 def _RetrieveArrayElement(node, index):
     assert index >= 0, "Trying to retrieve element at unspecified index (-1)"
 
     # try to retrieve the current element from the cache.
-    try:
-        return node.cache[index]
-    except KeyError:
-        # cache miss.
-        pass
+    element = node.cache.get(index)
+    if element is not None:
+        return element
 
-    # optimisation suggested by Sander.
-    previousElement = None
-    if index > 0:
-        try:
-            previousElement = node.cache[index - 1]
-        except KeyError:
-            # cache miss.
-            pass
+    # cache miss: create the nodes for the whole block of elements that contains the requested element in a single
+    # pass over the array (goto_next_array_element is much faster than goto_array_element for large arrays).
+    start = index - index % ARRAY_ELEMENT_PREFETCH_SIZE
+    end = min(start + ARRAY_ELEMENT_PREFETCH_SIZE, len(node))
 
-    # try to retrieve the node
     try:
-        if previousElement:
+        previousElement = node.cache.get(start - 1) if start > 0 else None
+        if previousElement is not None:
+            # continue from the last element of the previous block.
             cursor = copy.deepcopy(previousElement.cursor)
-            # goto_next_array_element is much faster than goto_array_element
-            # for large arrays.
             coda.cursor_goto_next_array_element(cursor)
         else:
             cursor = copy.deepcopy(node.cursor)
-            coda.cursor_goto_array_element_by_index(cursor, index)
-
-        element = NodeFactory(cursor)
-        element.parent = weakref.proxy(node)
-        element.cursor = cursor
-        element.name = GetMultiDimensionalIndex(node, index)
-        element.initialize()
+            coda.cursor_goto_array_element_by_index(cursor, start)
     except coda.CodacError as ex:
         raise CorruptProductError("[CODA] %s" % (str(ex),))
 
-    # cache element
-    node.cache[index] = element
-    return element
+    for i in range(start, end):
+        try:
+            if i > start:
+                coda.cursor_goto_next_array_element(cursor)
+            if i not in node.cache:
+                element = NodeFactory(cursor)
+                element.parent = weakref.proxy(node)
+                element.cursor = copy.deepcopy(cursor)
+                element.name = GetMultiDimensionalIndex(node, i)
+                element.structure = node.structure
+                element.typePath = node.typePath + "[]"
+                element.initialize()
+                node.cache.insert(i, element)
+        except coda.CodacError as ex:
+            if i <= index:
+                raise CorruptProductError("[CODA] %s" % (str(ex),))
+            # the requested element is available; errors for the elements after it are reported once these
+            # elements are requested themselves.
+            break
+
+    return node.cache.get(index)
 
 
 def RetrieveAttributes(node):
@@ -370,6 +472,8 @@ def RetrieveAttributes(node):
         attributes = NodeFactory(cursor)
         attributes.cursor = cursor
         attributes.name = "attributes"
+        attributes.structure = node.structure
+        attributes.typePath = node.typePath + "@"
         attributes.initialize()
         return attributes
 
@@ -439,14 +543,8 @@ def GetDataAsString(type, data, maxLength=-1):
         # convert length in bytes to length in characters ("0x%x " per byte).
         if maxLength >= 0 and (data.size * 5) > maxLength:
             return "<data block of %u byte(s)>" % (data.size,)
-        elif data.size > 0:
-            result = ""
-            for byte in data[:-1]:
-                result += "0x%x " % (byte,)
-            result += "0x%x" % (data[-1],)
-            return result
         else:
-            return ""
+            return " ".join([_hexByteStrings[byte] for byte in data.tolist()])
 
     elif type == TYPE_RECORD:
         # return a key-value list of the fields between braces
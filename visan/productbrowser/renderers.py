@@ -32,17 +32,50 @@ import wx.grid
 import coda
 import numpy
 
+import collections
+import copy
+import importlib
 import sys
 import math
+import threading
+import weakref
 
 from . import frame
 from . import model
 
-usePlotRenderer = 1
-try:
-    from visan.plot.plotwindow import PlotWindow
-except ImportError:
-    usePlotRenderer = 0
+# arrays with more elements than this are not read completely by the grid view, only the visible cells are read
+WINDOWED_ARRAY_THRESHOLD = 65536
+# size (in rows and columns) of the blocks of cells that are read at once for a windowed array
+WINDOWED_ARRAY_TILE_SIZE = 32
+# maximum number of blocks of cells that are kept in memory for a windowed array
+WINDOWED_ARRAY_MAX_TILES = 64
+
+# size (in rows and columns) of the blocks of cells that are formatted at once for a grid table
+GRID_FORMAT_BLOCK_ROWS = 64
+GRID_FORMAT_BLOCK_COLS = 16
+# maximum number of formatted blocks of cells that are kept for a grid table
+GRID_FORMAT_MAX_BLOCKS = 64
+
+# placeholder for the elements of a windowed array that can not be read yet (see WindowedArray)
+PENDING_VALUE = object()
+
+# hexadecimal representations of all byte values
+_hexByteStrings = numpy.array(["%.2X" % (i,) for i in range(256)])
+
+# the plot renderer is only available if the plot modules (and thus VTK) can be imported
+# these modules are imported once the first array is shown, so opening the product browser does not import VTK
+usePlotRenderer = None
+
+
+def PlotRendererAvailable():
+    global usePlotRenderer
+    if usePlotRenderer is None:
+        try:
+            importlib.import_module("visan.plot.plotwindow")
+            usePlotRenderer = 1
+        except ImportError:
+            usePlotRenderer = 0
+    return usePlotRenderer
 
 
 # EXCEPTION HIERARCHY
@@ -63,6 +96,13 @@ class SliceChangedEvent(wx.PyCommandEvent):
 
 
 # UTILITY FUNCTIONS
+def ShowRenderError(parent, error):
+    message = wx.MessageDialog(parent, "Could not instantiate renderer.\nPlease check product sanity, e.g. using "
+                               "codacheck.\n\nError message: \"%s\"" % (error,), "Render error",
+                               style=wx.OK | wx.ICON_ERROR | wx.STAY_ON_TOP)
+    message.ShowModal()
+
+
 def GetDecimalWidth(dc, number, template="%s"):
     assert number >= 0, "No negative numbers allowed."
 
@@ -359,6 +399,365 @@ class NumpySlicer2D(wx.Panel):
 
 
 
+class ArrayLoader(object):
+    """Fetches the data of an array node in a background thread.
+
+    A loader is shared by all renderers of the same node (see GetArrayLoader()), so the data is only read once.
+    Callbacks are called on the main thread once the data is available, the read has failed (the 'error' attribute
+    contains the message), or the read was cancelled (the 'cancelled' attribute is True).
+
+    CODA is not thread safe, so the main thread should only use CODA from a call that is passed to
+    CallWhenArrayLoadersIdle(). The read only starts once the current event has been handled, so any CODA access that
+    is part of handling that event (e.g. retrieving the attributes of the selected node) can be done directly.
+    """
+
+    def __init__(self, node):
+        self.cursor = node.cursor
+        self.isRankZero = node.isRankZero()
+        self.dimensions = node.dimensions
+        self.size = len(node)
+        self.array = None
+        self.error = None
+        self.cancelled = False
+        self.finished = False
+        self.callbacks = []
+
+        self.thread = threading.Thread(target=self._Fetch)
+        self.thread.daemon = True
+        wx.CallAfter(self._Start)
+
+    def _Start(self):
+        if self.cancelled:
+            return
+        if len(_pendingCalls) > 0:
+            # let the calls that are waiting for the current reads use CODA first
+            _pendingCalls.append((self._Start, ()))
+            return
+        _activeArrayLoaders.add(self)
+        self.thread.start()
+
+    def _Fetch(self):
+        array = None
+        error = None
+        try:
+            try:
+                array = coda.fetch(self.cursor)
+                if array.ndim == 0:
+                    array = array.reshape([1])
+            except (coda.CodaError, coda.CodacError) as ex:
+                error = "[CODA] %s" % (str(ex),)
+
+            # array sanity check
+            if array is not None:
+                if self.isRankZero:
+                    ok = (array.ndim == 1) and (array.shape[0] == 1)
+                else:
+                    ok = (array.ndim == len(self.dimensions)) and (array.size == self.size)
+                    i = 0
+                    while ok and i < len(self.dimensions):
+                        ok = ok and (array.shape[i] == self.dimensions[i])
+                        i += 1
+                if not ok:
+                    array = None
+                    error = "[ArrayLoader] Array read from product does not match description."
+        finally:
+            # always report back, so the calls that wait for this read are run
+            wx.CallAfter(self._Finish, array, error)
+
+    def _Finish(self, array, error):
+        _activeArrayLoaders.discard(self)
+        if not self.cancelled:
+            self.array = array
+            self.error = error
+            self._Notify()
+        # (the result of a cancelled read is discarded)
+        _RunPendingCalls()
+
+    def _Notify(self):
+        self.finished = True
+        callbacks = self.callbacks
+        self.callbacks = []
+        for callback in callbacks:
+            callback(self)
+
+    def AddCallback(self, callback):
+        if self.finished:
+            wx.CallAfter(callback, self)
+        else:
+            self.callbacks.append(callback)
+
+    def Cancel(self):
+        if not self.finished:
+            # CODA can not interrupt a read, so we just stop waiting for it (calls passed to CallWhenArrayLoadersIdle()
+            # still wait for it)
+            self.cancelled = True
+            self._Notify()
+
+
+_arrayLoaders = weakref.WeakKeyDictionary()
+
+# loaders of which the read has been started and may still be in progress
+_activeArrayLoaders = set()
+
+# calls that wait until the reads in progress have finished (see CallWhenArrayLoadersIdle())
+_pendingCalls = collections.deque()
+
+
+def ArrayLoadersActive():
+    return any(loader.thread.is_alive() for loader in _activeArrayLoaders)
+
+
+def CallWhenArrayLoadersIdle(function, *args):
+    """Call 'function' (on the main thread) once no data is being read in the background.
+
+    CODA is not thread safe, so this should be used for any use of CODA on the main thread that is not part of
+    handling the event that started a read. If no read is in progress the call is made immediately; otherwise it is
+    made once the reads have finished, in the order in which the calls were requested. The main thread is never
+    blocked while waiting.
+    """
+    if len(_pendingCalls) == 0 and not ArrayLoadersActive():
+        function(*args)
+    else:
+        _pendingCalls.append((function, args))
+
+
+def _RunPendingCalls():
+    while len(_pendingCalls) > 0 and not ArrayLoadersActive():
+        function, args = _pendingCalls.popleft()
+        function(*args)
+
+
+def GetArrayLoader(node):
+    try:
+        loader = _arrayLoaders[node]
+    except KeyError:
+        loader = None
+    if loader is None or loader.cancelled or loader.error is not None:
+        loader = ArrayLoader(node)
+        _arrayLoaders[node] = loader
+    return loader
+
+
+class ArrayLoaderPanel(wx.Panel):
+
+    def __init__(self, parent, loader):
+        wx.Panel.__init__(self, parent, -1)
+        self.SetBackgroundColour(self.GetBackgroundColour())
+
+        self.loader = loader
+
+        self.gauge = wx.Gauge(self, -1, 100, size=(200, -1))
+        self.cancelButton = wx.Button(self, wx.ID_CANCEL, "Cancel")
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add((0, 0), 1)
+        sizer.Add(wx.StaticText(self, -1, "Reading data..."), 0, wx.ALIGN_CENTER | wx.ALL, 5)
+        sizer.Add(self.gauge, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+        sizer.Add(self.cancelButton, 0, wx.ALIGN_CENTER | wx.ALL, 5)
+        sizer.Add((0, 0), 1)
+        self.SetSizer(sizer)
+
+        # the duration of a read is not known, so the gauge only shows that we are busy
+        self.timer = wx.Timer(self)
+        self.timer.Start(100)
+
+        self.Bind(wx.EVT_TIMER, self.OnTimer)
+        self.Bind(wx.EVT_BUTTON, self.OnCancel, self.cancelButton)
+        self.Bind(wx.EVT_WINDOW_DESTROY, self.OnDestroy)
+
+    def OnTimer(self, event):
+        self.gauge.Pulse()
+
+    def OnCancel(self, event):
+        self.loader.Cancel()
+
+    def OnDestroy(self, event):
+        if event.GetEventObject() is self:
+            self.timer.Stop()
+        event.Skip()
+
+
+class WindowedArray(object):
+    """Array-like access to the data of an array node that only reads the elements that are accessed.
+
+    Indexing with integers and full slices (e.g. array[2, :, :]) gives a WindowedArraySlice for a 2-D slice of the
+    array. The elements of a slice are read in blocks of WINDOWED_ARRAY_TILE_SIZE x WINDOWED_ARRAY_TILE_SIZE cells
+    and the most recently used blocks are kept in memory.
+    While data is being read in the background the elements can not be read; they are returned as PENDING_VALUE and
+    'onAvailable' (if given) is called once the elements can be read.
+    """
+
+    def __init__(self, cursor, shape, onAvailable=None):
+        self.cursor = copy.deepcopy(cursor)
+        self.shape = tuple(shape)
+        self.ndim = len(self.shape)
+        self.size = int(numpy.prod(self.shape))
+        self.strides = [int(numpy.prod(self.shape[i + 1:])) for i in range(self.ndim)]
+        self.tiles = collections.OrderedDict()
+        self.onAvailable = onAvailable
+        self.waiting = False
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if len(key) != self.ndim:
+            raise IndexError("invalid number of indices")
+        offset = 0
+        axes = []
+        for dim, index in enumerate(key):
+            if isinstance(index, slice):
+                if index != slice(None):
+                    raise IndexError("only full slices are supported")
+                axes.append(dim)
+            else:
+                if index < 0:
+                    index += self.shape[dim]
+                if index < 0 or index >= self.shape[dim]:
+                    raise IndexError("index out of range")
+                offset += index * self.strides[dim]
+        if len(axes) == 0:
+            return self.ReadElements(offset, 1, 1)[0]
+        if len(axes) != 2:
+            raise IndexError("only 2-D slices are supported")
+        return WindowedArraySlice(self, offset, [self.shape[i] for i in axes], [self.strides[i] for i in axes])
+
+    def GetTile(self, offset, shape, strides, tileRow, tileCol):
+        key = (offset, tuple(strides), tileRow, tileCol)
+        try:
+            tile = self.tiles.pop(key)
+        except KeyError:
+            if not self.Available():
+                return [[PENDING_VALUE] * WINDOWED_ARRAY_TILE_SIZE] * WINDOWED_ARRAY_TILE_SIZE
+            tile = []
+            firstCol = tileCol * WINDOWED_ARRAY_TILE_SIZE
+            numCols = min(shape[1] - firstCol, WINDOWED_ARRAY_TILE_SIZE)
+            for row in range(tileRow * WINDOWED_ARRAY_TILE_SIZE,
+                             min(shape[0], (tileRow + 1) * WINDOWED_ARRAY_TILE_SIZE)):
+                tile.append(self.ReadElements(offset + row * strides[0] + firstCol * strides[1], numCols,
+                                              strides[1]))
+            if len(self.tiles) >= WINDOWED_ARRAY_MAX_TILES:
+                self.tiles.popitem(last=False)
+        self.tiles[key] = tile
+        return tile
+
+    def Available(self):
+        # CODA is not thread safe, so elements can only be read when no data is being read in the background
+        if ArrayLoadersActive() or len(_pendingCalls) > 0:
+            if not self.waiting:
+                self.waiting = True
+                CallWhenArrayLoadersIdle(self._OnAvailable)
+            return False
+        return True
+
+    def _OnAvailable(self):
+        self.waiting = False
+        if self.onAvailable is not None:
+            self.onAvailable()
+
+    def ReadElements(self, index, count, stride):
+        # read 'count' elements starting at flat index 'index' with a distance of 'stride' elements
+        # elements that can not be read are returned as None
+        if not self.Available():
+            return [PENDING_VALUE] * count
+        values = []
+        cursor = copy.deepcopy(self.cursor)
+        try:
+            if stride == 1:
+                # consecutive elements are read by walking the cursor along the array
+                coda.cursor_goto_array_element_by_index(cursor, index)
+                values.append(coda.fetch(cursor))
+                for i in range(1, count):
+                    coda.cursor_goto_next_array_element(cursor)
+                    values.append(coda.fetch(cursor))
+            else:
+                for i in range(count):
+                    coda.cursor_goto_array_element_by_index(cursor, index + i * stride)
+                    values.append(coda.fetch(cursor))
+                    coda.cursor_goto_parent(cursor)
+        except (coda.CodaError, coda.CodacError):
+            values.extend([None] * (count - len(values)))
+        return values
+
+
+class WindowedArraySlice(object):
+    """2-D slice of a WindowedArray."""
+
+    def __init__(self, array, offset, shape, strides):
+        self.array = array
+        self.offset = offset
+        self.shape = tuple(shape)
+        self.ndim = 2
+        self.strides = strides
+
+    def __getitem__(self, key):
+        row, col = key
+        if row < 0:
+            row += self.shape[0]
+        if col < 0:
+            col += self.shape[1]
+        if row < 0 or row >= self.shape[0] or col < 0 or col >= self.shape[1]:
+            raise IndexError("index out of range")
+        tile = self.array.GetTile(self.offset, self.shape, self.strides, row // WINDOWED_ARRAY_TILE_SIZE,
+                                  col // WINDOWED_ARRAY_TILE_SIZE)
+        return tile[row % WINDOWED_ARRAY_TILE_SIZE][col % WINDOWED_ARRAY_TILE_SIZE]
+
+
+def GetCellAsString(base, value, maxLength=-1):
+    if value is None:
+        # value of a windowed array that could not be read
+        return "<unavailable>"
+    if value is PENDING_VALUE:
+        # value of a windowed array that is read once the data that is read in the background is available
+        return "..."
+    return model.GetDataAsString(base, value, maxLength)
+
+
+def FormatCells(base, block):
+    """Return the string representations of a 2-D numpy array of values (as done by model.GetDataAsString()).
+
+    Numeric data is converted with a single vectorized conversion; all other data is converted per value.
+    """
+    if block.dtype.kind in "biufc" and base not in (model.TYPE_TIME, model.TYPE_CHAR, model.TYPE_STRING):
+        return block.astype(str)
+    result = numpy.empty(block.shape, dtype=object)
+    for index in numpy.ndindex(block.shape):
+        result[index] = GetCellAsString(base, block[index])
+    return result
+
+
+class FormattedBlockCache(object):
+    """LRU cache of formatted blocks of grid cells.
+
+    formatBlock(firstRow, firstCol, numRows, numCols) should return the formatted cells of a block as a 2-D array.
+    Blocks are stored as nested lists, so cells are handed out as plain Python strings.
+    Each grid table has its own cache, so when the grid switches to another slice (and thus to a new table) the
+    formatted cells of the previous slice are dropped.
+    """
+
+    def __init__(self, formatBlock, numRows, numCols, blockRows=GRID_FORMAT_BLOCK_ROWS,
+                 blockCols=GRID_FORMAT_BLOCK_COLS):
+        self.formatBlock = formatBlock
+        self.numRows = numRows
+        self.numCols = numCols
+        self.blockRows = blockRows
+        self.blockCols = blockCols
+        self.blocks = collections.OrderedDict()
+
+    def Get(self, row, col):
+        key = (row // self.blockRows, col // self.blockCols)
+        try:
+            block = self.blocks.pop(key)
+        except KeyError:
+            firstRow = key[0] * self.blockRows
+            firstCol = key[1] * self.blockCols
+            block = self.formatBlock(firstRow, firstCol, min(self.blockRows, self.numRows - firstRow),
+                                     min(self.blockCols, self.numCols - firstCol)).tolist()
+            if len(self.blocks) >= GRID_FORMAT_MAX_BLOCKS:
+                self.blocks.popitem(last=False)
+        self.blocks[key] = block
+        return block[row % self.blockRows][col % self.blockCols]
+
+
 class NumpyWrapper(wx.grid.GridTableBase):
 
     def __init__(self, base, array):
@@ -366,6 +765,13 @@ class NumpyWrapper(wx.grid.GridTableBase):
 
         self.base = base
         self.array = array
+        self.cells = None
+        if isinstance(array, numpy.ndarray):
+            # the cells of a windowed array are already read (and cached) in blocks, so they are formatted per cell
+            self.cells = FormattedBlockCache(self.FormatBlock, array.shape[0], array.shape[1])
+
+    def FormatBlock(self, firstRow, firstCol, numRows, numCols):
+        return FormatCells(self.base, self.array[firstRow:firstRow + numRows, firstCol:firstCol + numCols])
 
     def GetAttr(self, row, col, kind):
         tmp = wx.grid.GridCellAttr()
@@ -388,7 +794,9 @@ class NumpyWrapper(wx.grid.GridTableBase):
         return False
 
     def GetValue(self, row, col):
-        return model.GetDataAsString(self.base, self.array[row, col])
+        if self.cells is not None:
+            return self.cells.Get(row, col)
+        return GetCellAsString(self.base, self.array[row, col])
 
     def SetValue(self, row, col, value):
         pass
@@ -405,6 +813,14 @@ class HexNumpyWrapper(wx.grid.GridTableBase):
 
         self.rowCount = int(math.ceil(float(array.size) / 16.0))
         self.rowLabelSize = int(math.ceil(math.log10(array.size) / math.log10(16)))
+        self.cells = FormattedBlockCache(self.FormatBlock, self.rowCount, 16, blockCols=16)
+
+    def FormatBlock(self, firstRow, firstCol, numRows, numCols):
+        # blocks always span all 16 columns
+        data = self.array[firstRow * 16:(firstRow + numRows) * 16]
+        cells = numpy.full(numRows * 16, "", dtype=_hexByteStrings.dtype)
+        cells[:data.size] = _hexByteStrings[data]
+        return cells.reshape((numRows, 16))
 
     def GetAttr(self, row, col, kind):
         tmp = wx.grid.GridCellAttr()
@@ -435,7 +851,7 @@ class HexNumpyWrapper(wx.grid.GridTableBase):
         if self.IsEmptyCell(row, col):
             return ""
         else:
-            return "%.2X" % (self.array[row * 16 + col],)
+            return self.cells.Get(row, col)
 
     def SetValue(self, row, col, value):
         pass
@@ -463,40 +879,51 @@ class ArrayRenderer(wx.Panel):
         assert node.type == model.TYPE_ARRAY, "ArrayRenderer can only render node of type TYPE_ARRAY"
         assert not isinstance(node, model.ObjectArrayNode), "ArrayRenderer cannot render arrays of compound types"
 
-        try:
-            self.array = coda.fetch(node.cursor)
-            if self.array.ndim == 0:
-                self.array = self.array.reshape([1])
-        except (coda.CodaError, coda.CodacError) as ex:
-            raise RenderError("[CODA] %s" % (str(ex),))
-
-        # array sanity check
-        ok = True
-        if node.isRankZero():
-            ok = (self.array.ndim == 1) and (self.array.shape[0] == 1)
-        else:
-            ok = (self.array.ndim == len(node.dimensions)) and (self.array.size == len(node))
-            i = 0
-            while ok and i < len(node.dimensions):
-                ok = ok and (self.array.shape[i] == node.dimensions[i])
-                i += 1
-
-        if not ok:
-            raise RenderError("[ArrayRenderer] Array read from product does not match description.")
-
         self.base = node.base
         self.slice = None
 
+        self.sizer = wx.BoxSizer(wx.VERTICAL)
+        self.SetSizer(self.sizer)
+
+        loader = _arrayLoaders.get(node)
+        if len(node) > WINDOWED_ARRAY_THRESHOLD and (loader is None or loader.array is None):
+            # large arrays are not read completely, only the cells that are shown are read
+            shape = list(node.dimensions)
+            if len(shape) == 1:
+                shape.append(1)
+            self.array = WindowedArray(node.cursor, shape, self.OnWindowedArrayAvailable)
+            self.CreateGrid()
+        else:
+            # the data is read in the background; the grid is created once the data is available
+            loader = GetArrayLoader(node)
+            self.loaderPanel = ArrayLoaderPanel(self, loader)
+            self.sizer.Add(self.loaderPanel, 1, wx.EXPAND | wx.ALL, 5)
+            loader.AddCallback(self.OnArrayLoaded)
+
+    def OnArrayLoaded(self, loader):
+        if not self:
+            # the renderer was destroyed while the data was being read
+            return
+        self.loaderPanel.Destroy()
+        if loader.array is None:
+            if loader.error is not None:
+                ShowRenderError(wx.GetTopLevelParent(self), loader.error)
+            self.sizer.Add(UnavailableRenderer(self), 1, wx.EXPAND, 0)
+            self.sizer.Layout()
+            return
+
+        self.array = loader.array
         if self.array.ndim == 1:
             self.array = self.array[:, numpy.newaxis]
+        self.CreateGrid()
 
+    def CreateGrid(self):
         self.valueText = wx.TextCtrl(self, -1, "")
         valueSizer = wx.BoxSizer(wx.HORIZONTAL)
         valueSizer.Add(wx.StaticText(self, -1, "Value:"), 0, wx.ALIGN_CENTER, 0)
         valueSizer.Add((5, 5), 0, wx.EXPAND)
         valueSizer.Add(self.valueText, 1, 0, 0)
 
-        self.sizer = wx.BoxSizer(wx.VERTICAL)
         self.grid = wx.grid.Grid(self, -1, style=wx.BORDER_SUNKEN)
 
         # TODO: use wxGrid::SetDefaultColSize() and row equiv. as an approx.
@@ -507,7 +934,8 @@ class ArrayRenderer(wx.Panel):
 
         self.UpdateGridData()
         # _really_ slow, so only used for string data (which can require a large cell width).
-        if self.base == model.TYPE_STRING:
+        # this would read all cells of a windowed array, so it is not done for those
+        if self.base == model.TYPE_STRING and not isinstance(self.array, WindowedArray):
             self.grid.AutoSize()
 
         self.sizer.Add(valueSizer, 0, wx.EXPAND | wx.ALL, 5)
@@ -515,18 +943,28 @@ class ArrayRenderer(wx.Panel):
         self.sizer.Add(self.grid, 1, wx.EXPAND | wx.ALL, 5)
         if self.array.ndim > 2:
             self.sizer.Add(self.slicer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 5)
-        self.SetSizer(self.sizer)
+        self.sizer.Layout()
 
         self.Bind(wx.grid.EVT_GRID_SELECT_CELL, self.OnSelectCell)
 
     def UpdateGridData(self):
         if self.array.ndim <= 2:
-            self.slice = self.array
+            self.slice = self.array[:, :]
         else:
             self.slice = self.slicer.GetSlice()
 
         self.grid.SetTable(NumpyWrapper(self.base, self.slice), True)
-        self.valueText.SetValue(model.GetDataAsString(self.base, self.slice.flat[0], 256))
+        self.valueText.SetValue(GetCellAsString(self.base, self.slice[0, 0], 256))
+
+    def OnWindowedArrayAvailable(self):
+        if not self:
+            return
+        # show the cells that could not be read while data was being read in the background
+        self.grid.ForceRefresh()
+        if self.valueText.GetValue() == GetCellAsString(self.base, PENDING_VALUE):
+            row = max(self.grid.GetGridCursorRow(), 0)
+            col = max(self.grid.GetGridCursorCol(), 0)
+            self.valueText.SetValue(GetCellAsString(self.base, self.slice[row, col], 256))
 
     def OnSliceChanged(self, event):
         self.sizer.Detach(self.grid)
@@ -535,7 +973,7 @@ class ArrayRenderer(wx.Panel):
         self.grid = wx.grid.Grid(self, -1)
         self.UpdateGridData()
         # _really_ slow...
-        if self.base == model.TYPE_STRING:
+        if self.base == model.TYPE_STRING and not isinstance(self.array, WindowedArray):
             self.grid.AutoSize()
 
         self.sizer.Insert(2, self.grid, 1, wx.EXPAND | wx.ALL, 5)
@@ -543,7 +981,7 @@ class ArrayRenderer(wx.Panel):
 
     def OnSelectCell(self, event):
         if event.Selecting():
-            self.valueText.SetValue(model.GetDataAsString(self.base, self.slice[event.GetRow(), event.GetCol()], 256))
+            self.valueText.SetValue(GetCellAsString(self.base, self.slice[event.GetRow(), event.GetCol()], 256))
         else:
             self.valueText.SetValue("")
         event.Skip()
@@ -558,7 +996,7 @@ class PlotRenderer(wx.Panel):
                      model.TYPE_FLOAT32, model.TYPE_FLOAT64)
 
     def CanRender(cls, node):
-        return (usePlotRenderer and (not isinstance(node, model.ObjectArrayNode)) and
+        return (PlotRendererAvailable() and (not isinstance(node, model.ObjectArrayNode)) and
                 (node.base in PlotRenderer.plotableTypes) and (len(node) > 0))
     CanRender = classmethod(CanRender)
 
@@ -572,37 +1010,38 @@ class PlotRenderer(wx.Panel):
         assert node.type == model.TYPE_ARRAY, "PlotRenderer can only render node of type TYPE_ARRAY"
         assert not isinstance(node, model.ObjectArrayNode), "PlotRenderer cannot render arrays of compound types"
 
-        try:
-            self.array = coda.fetch(node.cursor)
-            if self.array.ndim == 0:
-                self.array = self.array.reshape([1])
-        except (coda.CodaError, coda.CodacError) as ex:
-            raise RenderError("[CODA] %s" % (str(ex),))
-
-        # array sanity check
-        ok = True
-        if node.isRankZero():
-            ok = (self.array.ndim == 1) and (self.array.shape[0] == 1)
-        else:
-            ok = (self.array.ndim == len(node.dimensions)) and (self.array.size == len(node))
-            i = 0
-            while ok and i < len(node.dimensions):
-                ok = ok and (self.array.shape[i] == node.dimensions[i])
-                i += 1
-
-        if not ok:
-            raise RenderError("[PlotRenderer] Array read from product does not match description.")
-
+        # the data is read in the background; the plot is created once the data is available
+        loader = GetArrayLoader(node)
+        self.loaderPanel = ArrayLoaderPanel(self, loader)
+        self.sizer = wx.BoxSizer(wx.VERTICAL)
+        self.sizer.Add(self.loaderPanel, 1, wx.EXPAND | wx.ALL, 5)
+        self.SetSizer(self.sizer)
+        loader.AddCallback(self.OnArrayLoaded)
+
+    def OnArrayLoaded(self, loader):
+        if not self:
+            # the renderer was destroyed while the data was being read
+            return
+        self.loaderPanel.Destroy()
+        if loader.array is None:
+            if loader.error is not None:
+                ShowRenderError(wx.GetTopLevelParent(self), loader.error)
+            self.sizer.Add(UnavailableRenderer(self), 1, wx.EXPAND, 0)
+            self.sizer.Layout()
+            return
+
+        self.array = loader.array
+
+        from visan.plot.plotwindow import PlotWindow
         self.plot = PlotWindow(self, -1)
 
-        sizer = wx.BoxSizer(wx.VERTICAL)
-        sizer.Add(self.plot, 1, wx.EXPAND | wx.ALL, 5)
+        self.sizer.Add(self.plot, 1, wx.EXPAND | wx.ALL, 5)
         if self.array.ndim > 1:
             self.slicer = NumpySlicer1D(self, -1, self.array, "select")
-            sizer.Add(self.slicer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 5)
+            self.sizer.Add(self.slicer, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 5)
             self.Bind(EVT_SLICE_CHANGED, self.OnSliceChanged)
 
-        self.SetSizer(sizer)
+        self.sizer.Layout()
 
         if self.array.ndim == 1:
             self.plot.AddDataSet(numpy.arange(self.array.shape[0]), self.array)
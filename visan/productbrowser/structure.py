@@ -0,0 +1,183 @@
+# Copyright (C) 2002-2022 S[&]T, The Netherlands.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Product structure index
+
+The record field information (names, hidden status, and node types) of a CODA product only depends on the product
+definition. This information is therefore retrieved once per product class/type/version and stored in an index that
+is shared by all products of the same type and that is persisted across sessions. Only the per-product information
+(field availability and number of elements) still needs to be read from the product itself.
+
+Record types are identified in the index by their 'type path': the path of field names from the product root, where
+'[]' denotes an array element and '@' the attributes of a node.
+
+The index also holds the full paths of all fields of the product type, which are used for searching fields.
+"""
+
+import atexit
+import hashlib
+import os
+import pickle
+import re
+
+import coda
+
+_indexDirectory = None
+_indices = {}
+
+
+class StructureIndex(object):
+
+    def __init__(self, key, filename=None):
+        self.key = key
+        self.filename = filename
+        # type path -> list of (name, real_name, hidden, type, base_type) per record field
+        self.records = {}
+        # paths of all record fields (None if these have not been collected yet)
+        self.paths = None
+        self.modified = False
+
+    def GetFields(self, typePath):
+        return self.records.get(typePath)
+
+    def SetFields(self, typePath, fields):
+        self.records[typePath] = fields
+        self.modified = True
+
+    def SetPaths(self, paths):
+        self.paths = paths
+        self.modified = True
+
+    def Load(self):
+        if self.filename is None or not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, "rb") as f:
+                key, records, paths = pickle.load(f)
+        except Exception:
+            # an unreadable index is rebuilt
+            return
+        if key == self.key:
+            self.records = records
+            self.paths = paths
+
+    def Save(self):
+        if self.filename is None or not self.modified:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            # write to a temporary file first so other sessions never see an incomplete index
+            tempFilename = "%s.%d.tmp" % (self.filename, os.getpid())
+            with open(tempFilename, "wb") as f:
+                pickle.dump((self.key, self.records, self.paths), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tempFilename, self.filename)
+        except (IOError, OSError):
+            # not being able to store the index should never prevent browsing a product
+            return
+        self.modified = False
+
+
+def SetIndexDirectory(directory):
+    global _indexDirectory
+    _indexDirectory = directory
+
+
+def GetStructureIndex(product):
+    """Return the structure index for an open CODA product (or None if the product has no product definition)."""
+    try:
+        productClass = coda.get_product_class(product)
+        productType = coda.get_product_type(product)
+        productVersion = coda.get_product_version(product)
+        definitionFile = coda.get_product_definition_file(product)
+    except coda.CodacError:
+        return None
+    if not productClass or not productType or not definitionFile:
+        # without a product definition the structure is determined by each file itself
+        return None
+    try:
+        definitionMTime = os.stat(definitionFile).st_mtime_ns
+    except OSError:
+        definitionMTime = None
+    # the node types also depend on the CODA options that are in effect
+    key = (productClass, productType, productVersion, definitionFile, definitionMTime, coda.version(),
+           coda.get_option_perform_conversions(), coda.get_option_bypass_special_types())
+    try:
+        return _indices[key]
+    except KeyError:
+        pass
+    filename = None
+    if _indexDirectory is not None:
+        filename = os.path.join(_indexDirectory, hashlib.sha1(repr(key).encode("utf-8")).hexdigest() + ".pickle")
+    index = StructureIndex(key, filename)
+    index.Load()
+    _indices[key] = index
+    return index
+
+
+def GeneratePaths(rootType):
+    """Generate the paths of all record fields of a product from its root type.
+
+    Only type information is used, so no data is read from the product. Array elements are referred to by index 0, so
+    each path can be used to navigate to the field. The paths are generated one at a time, so the caller can spread the
+    work over time.
+    """
+    stack = [("", rootType)]
+    while len(stack) > 0:
+        path, codaType = stack.pop()
+        typeClass = coda.type_get_class(codaType)
+        if typeClass == coda.coda_record_class:
+            children = []
+            for i in range(coda.type_get_num_record_fields(codaType)):
+                fieldPath = path + "/" + coda.type_get_record_field_name(codaType, i)
+                yield fieldPath
+                children.append((fieldPath, coda.type_get_record_field_type(codaType, i)))
+            # visit the fields in order
+            stack.extend(reversed(children))
+        elif typeClass == coda.coda_array_class:
+            numDims = max(coda.type_get_array_num_dims(codaType), 1)
+            stack.append((path + "[%s]" % (",".join(["0"] * numDims),), coda.type_get_array_base_type(codaType)))
+
+
+def SearchPaths(paths, pattern, regex=False):
+    """Return the paths that match a (case insensitive) substring or regular expression."""
+    if regex:
+        matcher = re.compile(pattern, re.IGNORECASE)
+        return [path for path in paths if matcher.search(path)]
+    pattern = pattern.lower()
+    return [path for path in paths if pattern in path.lower()]
+
+
+def SaveStructureIndices():
+    for index in _indices.values():
+        index.Save()
+
+
+atexit.register(SaveStructureIndices)
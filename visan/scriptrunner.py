@@ -0,0 +1,251 @@
+# Copyright (C) 2002-2022 S[&]T, The Netherlands.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Execution of VISAN/Python scripts in the background
+
+A background script runs in a worker thread, so the VISAN windows remain responsive while the script runs. Calls
+that affect the user interface (such as plot() and wplot()) are executed on the main thread. The progress of a
+script is shown in a small window that allows the user to cancel the script. Cancellation is cooperative: a cancelled
+script is stopped at its next call to scriptprogress() or to one of the user interface functions.
+"""
+
+import os
+import sys
+import threading
+import time
+import traceback
+
+import wx
+
+# interval (in milliseconds) at which the progress window is updated
+PROGRESS_UPDATE_INTERVAL = 100
+
+# script runs by thread identifier
+_runs = {}
+
+
+class ScriptCancelledError(Exception):
+
+    pass
+
+
+class ThreadAwareStream(object):
+    """Output stream that only writes to the wrapped stream on the main thread.
+
+    Output of a background script is written to the output stream that was active when the script was started (i.e.
+    the shell). Output of any other thread is written to the wrapped stream. In both cases the actual write is done on
+    the main thread, since the shell may only be accessed from the main thread.
+    """
+
+    def __init__(self, target, name):
+        self.target = target
+        self.name = name
+
+    def write(self, text):
+        run = GetCurrentRun()
+        if run is not None:
+            wx.CallAfter(getattr(run, self.name).write, text)
+        elif threading.current_thread() is not threading.main_thread():
+            wx.CallAfter(self.target.write, text)
+        else:
+            return self.target.write(text)
+
+    def flush(self):
+        if threading.current_thread() is threading.main_thread():
+            self.target.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
+
+def _UnwrapStream(stream):
+    if isinstance(stream, ThreadAwareStream):
+        return stream.target
+    return stream
+
+
+def InstallOutputStreams(interp=None):
+    """Replace sys.stdout and sys.stderr (and the output streams of the given shell interpreter, which are made
+    active while the shell executes a command) by thread aware streams."""
+    for obj in [sys, interp]:
+        if obj is None:
+            continue
+        for name in ["stdout", "stderr"]:
+            stream = getattr(obj, name)
+            if stream is not None and not isinstance(stream, ThreadAwareStream):
+                setattr(obj, name, ThreadAwareStream(stream, name))
+
+
+class ScriptProgressFrame(wx.Frame):
+
+    def __init__(self, run):
+        wx.Frame.__init__(self, None, -1, "VISAN Script", style=wx.CAPTION | wx.FRAME_TOOL_WINDOW |
+                          wx.FRAME_FLOAT_ON_PARENT)
+        self.run = run
+
+        panel = wx.Panel(self, -1)
+        self.message = wx.StaticText(panel, -1, "Running '%s'" % (os.path.basename(run.filename),),
+                                     style=wx.ST_ELLIPSIZE_END)
+        self.gauge = wx.Gauge(panel, -1, 100, size=(300, -1))
+        self.cancelButton = wx.Button(panel, wx.ID_CANCEL)
+        self.cancelButton.Bind(wx.EVT_BUTTON, self.OnCancel)
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(self.message, 0, wx.EXPAND | wx.ALL, 10)
+        sizer.Add(self.gauge, 0, wx.EXPAND | wx.LEFT | wx.RIGHT, 10)
+        sizer.Add(self.cancelButton, 0, wx.ALIGN_RIGHT | wx.ALL, 10)
+        panel.SetSizer(sizer)
+        sizer.Fit(self)
+
+        self.timer = wx.Timer(self)
+        self.Bind(wx.EVT_TIMER, self.OnTimer, self.timer)
+        self.timer.Start(PROGRESS_UPDATE_INTERVAL)
+
+    def OnCancel(self, event):
+        self.run.Cancel()
+        self.cancelButton.Disable()
+        self.message.SetLabel("Cancelling '%s'..." % (os.path.basename(self.run.filename),))
+
+    def OnTimer(self, event):
+        if self.run.cancelled:
+            return
+        current, total, message = self.run.progress
+        if message is not None:
+            self.message.SetLabel(message)
+        if total:
+            self.gauge.SetValue(max(0, min(100, int(100 * current / total))))
+        else:
+            self.gauge.Pulse()
+
+    def Finish(self):
+        self.timer.Stop()
+        self.Destroy()
+
+
+class ScriptRun(object):
+    """A script that is executed in a worker thread."""
+
+    def __init__(self, filename, namespace):
+        self.filename = filename
+        self.namespace = namespace
+        self.cancelled = False
+        self.progress = (0, None, None)
+        self.error = None
+        self.frame = None
+        # output is written to the output streams that are active when the script is started (i.e. the shell)
+        self.stdout = _UnwrapStream(sys.stdout)
+        self.stderr = _UnwrapStream(sys.stderr)
+        self.thread = threading.Thread(target=self._Run, name="VISAN script %s" % (filename,))
+        self.thread.daemon = True
+
+    def Start(self):
+        InstallOutputStreams()
+        self.frame = ScriptProgressFrame(self)
+        self.frame.Show()
+        self.thread.start()
+
+    def Cancel(self):
+        self.cancelled = True
+
+    def CheckCancelled(self):
+        if self.cancelled:
+            raise ScriptCancelledError("script '%s' was cancelled" % (self.filename,))
+
+    def IsRunning(self):
+        return self.thread.is_alive()
+
+    def Wait(self, timeout=None):
+        """Wait until the script has finished (or until 'timeout' seconds have passed) and return whether it has
+        finished. On the main thread the user interface keeps processing events while waiting, so the calls that the
+        script makes on the main thread (such as plot()) can still be executed."""
+        if threading.current_thread() is not threading.main_thread():
+            self.thread.join(timeout)
+            return not self.thread.is_alive()
+        endTime = None if timeout is None else time.time() + timeout
+        while self.thread.is_alive():
+            if endTime is not None and time.time() >= endTime:
+                break
+            wx.YieldIfNeeded()
+            self.thread.join(0.05)
+        return not self.thread.is_alive()
+
+    def _Run(self):
+        _runs[threading.get_ident()] = self
+        scriptdir = os.path.dirname(self.filename)
+        sys.path.insert(0, scriptdir)
+        try:
+            with open(self.filename) as f:
+                source = f.read()
+            exec(compile(source, self.filename, 'exec'), self.namespace)
+        except ScriptCancelledError as ex:
+            self.error = ex
+            wx.CallAfter(self.stderr.write, "%s\n" % (ex,))
+        except BaseException as ex:
+            self.error = ex
+            wx.CallAfter(self.stderr.write, traceback.format_exc())
+        else:
+            wx.CallAfter(self.stdout.write, "Finished VISAN/Python script '%s'\n" % (self.filename,))
+        finally:
+            sys.path.remove(scriptdir)
+            del _runs[threading.get_ident()]
+            wx.CallAfter(self._Finish)
+
+    def _Finish(self):
+        if self.frame:
+            self.frame.Finish()
+        self.frame = None
+
+
+def GetCurrentRun():
+    """Return the script run of the calling thread (or None if the calling thread is not a script thread)."""
+    return _runs.get(threading.get_ident())
+
+
+def CallInMainThread(func, *args, **kwargs):
+    """Call a function on the main thread from a script thread and wait for its result."""
+    run = GetCurrentRun()
+    if run is not None:
+        run.CheckCancelled()
+    done = threading.Event()
+    result = {}
+
+    def call():
+        try:
+            result["value"] = func(*args, **kwargs)
+        except BaseException as ex:
+            result["error"] = ex
+        finally:
+            done.set()
+
+    wx.CallAfter(call)
+    done.wait()
+    if "error" in result:
+        raise result["error"]
+    return result.get("value")
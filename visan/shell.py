@@ -27,12 +27,60 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import importlib
+import os
 import sys
+import types
 from code import InteractiveInterpreter
 
 import wx
 import wx.py
 
+from . import scriptrunner
+from . import startup
+
+# modules that are only imported once they are used from the shell
+LAZY_MODULES = ["vtk"]
+
+
+class LazyModule(types.ModuleType):
+    """Placeholder for a module in the shell namespace that imports the module on first use.
+
+    Once imported, the placeholder in the namespace is replaced by the actual module.
+    """
+
+    def __init__(self, name, namespace):
+        super(LazyModule, self).__init__(name)
+        self.__namespace = namespace
+
+    def __load(self):
+        module = importlib.import_module(self.__name__)
+        if self.__namespace.get(self.__name__) is self:
+            self.__namespace[self.__name__] = module
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self.__load(), name)
+
+    def __dir__(self):
+        return dir(self.__load())
+
+
+def GetComponentVersions():
+    """Return the versions of the main components that VISAN uses (this imports all these components)."""
+    import coda
+    import harp
+    import numpy
+    import vtk
+    return [
+        "Python %d.%d.%d" % (sys.version_info[0], sys.version_info[1], sys.version_info[2]),
+        "wxPython %s" % wx.VERSION_STRING,
+        "VTK %s" % vtk.VTK_VERSION,
+        "NumPy %s" % numpy.__version__,
+        "CODA %s" % coda.version(),
+        "HARP %s" % harp.version(),
+    ]
+
 
 class VisanShell(wx.py.shell.Shell):
 
@@ -40,6 +88,8 @@ class VisanShell(wx.py.shell.Shell):
                  introText='', locals={}, *args, **kwargs):
         self.runStartupCommands(locals)
         super(VisanShell, self).__init__(parent, id, pos, size, style, introText, locals, *args, **kwargs)
+        # output of background scripts (and other threads) should only reach the shell via the main thread
+        scriptrunner.InstallOutputStreams(self.interp)
         self.setDisplayLineNumbers(True)
         if wx.Platform == '__WXMAC__':
             self.zoom(-1)
@@ -47,26 +97,13 @@ class VisanShell(wx.py.shell.Shell):
     def runStartupCommands(self, locals):
         interp = InteractiveInterpreter(locals)
         """Execute the startup commands that import default modules"""
-        interp.runsource("import os")
-        interp.runsource("import sys")
-        interp.runsource("import wx")
-        interp.runsource("import vtk")
-        interp.runsource("import numpy")
-        interp.runsource("np = numpy")
-        interp.runsource("import coda")
-        interp.runsource("import harp")
-        interp.runsource("import visan")
-        interp.runsource("import visan.math")
-        interp.runsource("from visan.commands import *")
+        for command in ["import os", "import sys", "import wx", "import numpy", "np = numpy", "import coda",
+                        "import harp", "import visan", "import visan.math", "from visan.commands import *"]:
+            with startup.Phase("shell: " + command):
+                interp.runsource(command)
+        for name in LAZY_MODULES:
+            interp.locals[name] = LazyModule(name, interp.locals)
         self.version = interp.locals['visan'].VERSION
-        self.component_versions = [
-            "Python %d.%d.%d" % (sys.version_info[0], sys.version_info[1], sys.version_info[2]),
-            "wxPython %s" % interp.locals['wx'].VERSION_STRING,
-            "VTK %s" % interp.locals['vtk'].VTK_VERSION,
-            "NumPy %s" % interp.locals['numpy'].__version__,
-            "CODA %s" % interp.locals['coda'].version(),
-            "HARP %s" % interp.locals['harp'].version(),
-        ]
 
     def showIntro(self, text=''):
         if text:
@@ -76,7 +113,7 @@ class VisanShell(wx.py.shell.Shell):
         else:
             self.write("Copyright (C) 2002-2022 S[&]T, The Netherlands.\n\n")
             self.write("Welcome to the VISAN/Python Control Shell.\n\n")
-            self.write("VISAN %s (%s)\n" % (self.version, ", ".join(self.component_versions)))
+            self.write("VISAN %s (see Help > About VISAN for the versions of its components)\n" % (self.version,))
 
     def autoCallTipShow(self, command, insertcalltip=True, forceCallTip=False):
         """Display argument spec and docstring in a popup window."""
@@ -0,0 +1,70 @@
+# Copyright (C) 2002-2022 S[&]T, The Netherlands.
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+# notice, this list of conditions and the following disclaimer in the
+# documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Startup timing of VISAN
+
+The time spent in each import and initialisation phase during startup is recorded, so startup performance can be
+tracked. Run VISAN with the --startup-timing option to get a report of these timings at the end of the startup.
+"""
+
+import contextlib
+import time
+
+_startTime = time.perf_counter()
+# list of [name, nesting depth, duration] per phase (in order of the start of the phases)
+_phases = []
+_depth = 0
+
+
+@contextlib.contextmanager
+def Phase(name):
+    """Record the time spent within the context as a startup phase with the given name.
+
+    Phases can be nested; the report shows nested phases indented below their enclosing phase.
+    """
+    global _depth
+    phase = [name, _depth, None]
+    _phases.append(phase)
+    _depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase[2] = time.perf_counter() - start
+        _depth -= 1
+
+
+def GetReport():
+    lines = ["VISAN startup timing (in seconds):"]
+    for name, depth, duration in _phases:
+        if duration is not None:
+            lines.append("%8.3f  %s%s" % (duration, "  " * depth, name))
+    lines.append("%8.3f  total" % (time.perf_counter() - _startTime,))
+    return "\n".join(lines) + "\n"
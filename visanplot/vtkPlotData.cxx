@@ -165,6 +165,7 @@ vtkPlotData::vtkPlotData()
 {
     this->PlotLines = 1;
     this->PlotPoints = 0;
+    this->LevelOfDetail = 1;
 
     this->LogX = 0;
     this->LogY = 0;
@@ -302,17 +303,20 @@ int vtkPlotData::RequestData(vtkInformation *request, vtkInformationVector **inp
                   << dataBounds[3] << ", " << dataBounds[4] << ", " << dataBounds[5] << ")");
 
     vtkDebugMacro(<< "  Calculating Data Points");
-    // The points array will intially contain all data elements.
+    // The points array will intially contain all data elements (or the level of detail reduction of them).
     auto pts = vtkSmartPointer<vtkPoints>::New();
     pts->SetDataTypeToDouble();
-    int numComp = this->GetNumberOfItems();
-    for (i = 0; i < numComp; i++)
+    if (!this->LevelOfDetail || this->PlotPoints || !this->ComputeLevelOfDetailPoints(pts, dataBounds))
     {
-        double xyz[3];
-        xyz[0] = this->GetXValue(i);
-        xyz[1] = this->GetYValue(i);
-        xyz[2] = this->GetZValue(i);
-        pts->InsertNextPoint(xyz);
+        int numComp = this->GetNumberOfItems();
+        for (i = 0; i < numComp; i++)
+        {
+            double xyz[3];
+            xyz[0] = this->GetXValue(i);
+            xyz[1] = this->GetYValue(i);
+            xyz[2] = this->GetZValue(i);
+            pts->InsertNextPoint(xyz);
+        }
     }
 
     this->ComputePlotPoints(pts, dataBounds, viewportMappingNeeded, dataClippingNeeded);
@@ -334,6 +338,11 @@ int vtkPlotData::RequestData(vtkInformation *request, vtkInformationVector **inp
     return 1;
 }
 
+int vtkPlotData::ComputeLevelOfDetailPoints(vtkPoints *, double[6])
+{
+    return 0;
+}
+
 void vtkPlotData::ComputePlotPoints(vtkPoints *pts, double dataBounds[6], int viewportMappingNeeded,
                                     int dataClippingNeeded)
 {
@@ -621,6 +630,7 @@ void vtkPlotData::PrintSelf(ostream& os, vtkIndent indent)
         this->ViewportBounds[5] << ")" << endl;
     os << indent << "Plot Points: " << (this->PlotPoints ? "On" : "Off") << endl;
     os << indent << "Plot Lines: " << (this->PlotLines ? "On" : "Off") << endl;
+    os << indent << "Level Of Detail: " << (this->LevelOfDetail ? "On" : "Off") << endl;
     os << indent << "Glyph Size: " << this->GlyphSize << endl;
 }
 
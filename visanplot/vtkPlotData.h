@@ -92,6 +92,13 @@ class VISANPLOT_EXPORT vtkPlotData : public vtkPolyDataAlgorithm
         vtkGetMacro(PlotPoints, int);
         vtkBooleanMacro(PlotPoints, int);
 
+        // Set/Get whether to use level of detail decimation when drawing lines (default: on).
+        // If enabled (and no points are plotted) a derived class can reduce the data to the minimum/maximum envelope
+        // per pixel column of the viewport (see ComputeLevelOfDetailPoints()).
+        vtkSetMacro(LevelOfDetail, int);
+        vtkGetMacro(LevelOfDetail, int);
+        vtkBooleanMacro(LevelOfDetail, int);
+
         // This will compute the actual range of the underlying data.
         // If there are no elements the range will be [1,0]
         // If in a derived class a specific dimension is not used the range for that dimension
@@ -206,11 +213,17 @@ class VISANPLOT_EXPORT vtkPlotData : public vtkPolyDataAlgorithm
         void ComputePlotLinesWithClipping(vtkPoints *pts, double dataBounds[6], int viewportMappingNeeded);
         double ComputeGlyphScale();
 
+        // Fill 'pts' with a reduced set of data points that gives the same line plot within the given data bounds
+        // at the resolution of the viewport. Should return 0 (and leave 'pts' empty) if no reduction is performed,
+        // in which case all data points will be used.
+        virtual int ComputeLevelOfDetailPoints(vtkPoints *pts, double dataBounds[6]);
+
         void GetValidDataRange(double range[2], int dim, int log);
 
     protected:
         int PlotLines;
         int PlotPoints;
+        int LevelOfDetail;
 
         int LogX;
         int LogY;
@@ -34,15 +34,30 @@
 #include <math.h>
 #include <string.h>
 
+#include <algorithm>
+#include <atomic>
+#include <list>
+#include <memory>
+#include <mutex>
+#include <string>
+#include <vector>
+
 #include "vtkCell.h"
 #include "vtkCellArray.h"
+#include "vtkCellArrayIterator.h"
 #include "vtkCellData.h"
+#include "vtkDoubleArray.h"
+#include "vtkFloatArray.h"
 #include "vtkIdList.h"
 #include "vtkInformation.h"
 #include "vtkInformationVector.h"
+#include "vtkMath.h"
 #include "vtkObjectFactory.h"
 #include "vtkPointData.h"
 #include "vtkPolyData.h"
+#include "vtkSMPThreadLocal.h"
+#include "vtkSMPThreadLocalObject.h"
+#include "vtkSMPTools.h"
 #include "vtkSmartPointer.h"
 #include "vtkUnstructuredGrid.h"
 
@@ -503,12 +518,186 @@ static int intermediatepoints(double phi_p, double tau_p, double phi_q, double t
     return numPoints;
 }
 
+// Number of consecutive input cells that are processed as a single unit of work when the cells are split and
+// interpolated in parallel
+#define PROJ_CELL_CHUNK_SIZE 256
+
+// PROJ objects can not be shared between threads, so each thread creates its own context and projection object
+class vtkProjFilterThreadProjection
+{
+    public:
+        PJ *GetProjection(int argc, char **argv)
+        {
+            if (this->context == nullptr)
+            {
+                this->context.reset(proj_context_create(), proj_context_destroy);
+                this->projection.reset(proj_create_argv(this->context.get(), argc, argv),
+                                       [](PJ *projRef) { if (projRef != nullptr) proj_destroy(projRef); });
+            }
+            return this->projection.get();
+        }
+
+    private:
+        // the projection is declared last so it is destroyed before its context
+        std::shared_ptr<PJ_CONTEXT> context;
+        std::shared_ptr<PJ> projection;
+};
+
+// New points and cells that are created for a consecutive range of input cells.
+// Each range of cells is processed (in parallel) into its own buffer and the buffers are afterwards appended to the
+// output in the order of the input cells. This gives exactly the same output as processing all cells sequentially.
+// Point ids below the number of input points refer to the projected input points. Ids of new points start at the
+// number of input points and are renumbered when the buffer is appended to the output.
+class vtkProjFilterCellBuffer
+{
+    public:
+        vtkProjFilterCellBuffer() : projectedPoints(nullptr), numberOfInputPoints(0) {}
+
+        void Initialize(vtkFloatArray *projectedPoints)
+        {
+            this->projectedPoints = projectedPoints->GetPointer(0);
+            this->numberOfInputPoints = projectedPoints->GetNumberOfTuples();
+        }
+
+        // Add a new point for which the point data will be copied from point sourceId
+        vtkIdType InsertNextPoint(const double pt[3], vtkIdType sourceId)
+        {
+            // store the point with the same precision as the output points
+            this->points.push_back(static_cast<float>(pt[0]));
+            this->points.push_back(static_cast<float>(pt[1]));
+            this->points.push_back(static_cast<float>(pt[2]));
+            this->pointSourceIds.push_back(sourceId);
+            return this->numberOfInputPoints + static_cast<vtkIdType>(this->pointSourceIds.size()) - 1;
+        }
+
+        void GetPoint(vtkIdType id, double pt[3]) const
+        {
+            const float *p;
+
+            if (id < this->numberOfInputPoints)
+            {
+                p = &this->projectedPoints[3 * id];
+            }
+            else
+            {
+                p = &this->points[3 * (id - this->numberOfInputPoints)];
+            }
+            pt[0] = p[0];
+            pt[1] = p[1];
+            pt[2] = p[2];
+        }
+
+        // Add a new cell for which the cell data will be copied from input cell sourceId
+        void InsertNextCell(vtkIdList *idList, vtkIdType sourceId)
+        {
+            vtkIdType numIds = idList->GetNumberOfIds();
+
+            this->cellSizes.push_back(numIds);
+            this->connectivity.insert(this->connectivity.end(), idList->GetPointer(0), idList->GetPointer(0) + numIds);
+            this->cellSourceIds.push_back(sourceId);
+        }
+
+        // Append the new points and cells (and their point and cell data) to the output
+        void AppendTo(vtkPolyData *output, int cellType, vtkPointData *pointData, vtkCellData *cellData)
+        {
+            vtkPoints *newPoints = output->GetPoints();
+            vtkPointData *newPointData = output->GetPointData();
+            vtkCellData *newCellData = output->GetCellData();
+            vtkIdType firstNewPt = newPoints->GetNumberOfPoints();
+            std::vector<vtkIdType> ids;
+            size_t offset = 0;
+            size_t i;
+
+            for (i = 0; i < this->pointSourceIds.size(); i++)
+            {
+                vtkIdType newPt;
+
+                newPt = newPoints->InsertNextPoint(this->points[3 * i], this->points[3 * i + 1],
+                                                   this->points[3 * i + 2]);
+                newPointData->CopyData(pointData, this->GetOutputId(this->pointSourceIds[i], firstNewPt), newPt);
+            }
+
+            for (i = 0; i < this->cellSizes.size(); i++)
+            {
+                vtkIdType newCellId;
+                vtkIdType j;
+
+                ids.resize(this->cellSizes[i]);
+                for (j = 0; j < this->cellSizes[i]; j++)
+                {
+                    ids[j] = this->GetOutputId(this->connectivity[offset + j], firstNewPt);
+                }
+                offset += this->cellSizes[i];
+                newCellId = output->InsertNextCell(cellType, static_cast<int>(this->cellSizes[i]), ids.data());
+                newCellData->CopyData(cellData, this->cellSourceIds[i], newCellId);
+            }
+        }
+
+    private:
+        // Map a point id in this buffer to the point id in the output, given the output id of the first new point
+        vtkIdType GetOutputId(vtkIdType id, vtkIdType firstNewPt) const
+        {
+            return id < this->numberOfInputPoints ? id : id - this->numberOfInputPoints + firstNewPt;
+        }
+
+        const float *projectedPoints;
+        vtkIdType numberOfInputPoints;
+
+        std::vector<float> points;
+        std::vector<vtkIdType> pointSourceIds;
+        std::vector<vtkIdType> cellSizes;
+        std::vector<vtkIdType> connectivity;
+        std::vector<vtkIdType> cellSourceIds;
+};
+
+// Call processCell(buffer, cellId, npts, pts) for all cells in a cell array. Chunks of consecutive cells are
+// processed in parallel and each chunk uses its own buffer (the buffers are stored in the order of the cells).
+template <typename CellFunctor>
+static void ProcessCellsInChunks(vtkCellArray *cells, vtkFloatArray *projectedPoints,
+                                 std::vector<vtkProjFilterCellBuffer> &buffers, CellFunctor &processCell)
+{
+    vtkIdType numCells = cells->GetNumberOfCells();
+    vtkIdType numChunks = (numCells + PROJ_CELL_CHUNK_SIZE - 1) / PROJ_CELL_CHUNK_SIZE;
+
+    buffers.resize(numChunks);
+    vtkSMPTools::For(0, numChunks, [&](vtkIdType firstChunk, vtkIdType lastChunk)
+    {
+        // cell traversal is not thread safe, so each thread uses its own iterator
+        auto cellIter = vtk::TakeSmartPointer(cells->NewIterator());
+        vtkIdType chunk;
+
+        for (chunk = firstChunk; chunk < lastChunk; chunk++)
+        {
+            vtkIdType lastCell = std::min(numCells, (chunk + 1) * PROJ_CELL_CHUNK_SIZE);
+            vtkIdType cellId;
+
+            buffers[chunk].Initialize(projectedPoints);
+            for (cellId = chunk * PROJ_CELL_CHUNK_SIZE; cellId < lastCell; cellId++)
+            {
+                vtkIdType npts;
+                vtkIdType const *pts;
+
+                cellIter->GetCellAtId(cellId, npts, pts);
+                processCell(buffers[chunk], cellId, npts, pts);
+            }
+        }
+    });
+}
+
+// Append the new points and cells from all buffers to the output
+static void AppendCellBuffers(std::vector<vtkProjFilterCellBuffer> &buffers, vtkPolyData *output, int cellType,
+                              vtkPointData *pointData, vtkCellData *cellData)
+{
+    for (auto &buffer : buffers)
+    {
+        buffer.AppendTo(output, cellType, pointData, cellData);
+    }
+}
+
 static void CreateInterPoints(double *p1, double *projP1, double *p2, double *projP2, double *extent,
-                              vtkPoints *newPoints, vtkPointData *pointData, vtkPointData *newPointData,
-                              vtkIdType firstPt, vtkIdList *idList, PJ *projRef, double interpolationDistance,
-                              int cylindricalProjection)
+                              vtkProjFilterCellBuffer *buffer, vtkIdType firstPt, vtkIdList *idList, PJ *projRef,
+                              double interpolationDistance, int cylindricalProjection, int depth = 0)
 {
-    static int depth = 0;
     double distance;
 
     if (interpolationDistance <= 0)
@@ -588,12 +777,9 @@ static void CreateInterPoints(double *p1, double *projP1, double *p2, double *pr
                     }
                     // recursively call this function to check whether our interpolated
                     // points are now within the required margins
-                    depth++;
-                    CreateInterPoints(prevP, projPrevP, interP, projInterP, extent, newPoints, pointData, newPointData,
-                                      firstPt, idList, projRef, interpolationDistance, cylindricalProjection);
-                    depth--;
-                    projPt = newPoints->InsertNextPoint(projInterP);
-                    newPointData->CopyData(pointData, firstPt, projPt);
+                    CreateInterPoints(prevP, projPrevP, interP, projInterP, extent, buffer, firstPt, idList, projRef,
+                                      interpolationDistance, cylindricalProjection, depth + 1);
+                    projPt = buffer->InsertNextPoint(projInterP, firstPt);
                     idList->InsertNextId(projPt);
                     prevP[0] = interP[0];
                     prevP[1] = interP[1];
@@ -607,10 +793,8 @@ static void CreateInterPoints(double *p1, double *projP1, double *p2, double *pr
             {
                 // recursively call this function to check whether our interpolated
                 // points are now within the required margins
-                depth++;
-                CreateInterPoints(prevP, projPrevP, p2, projP2, extent, newPoints, pointData, newPointData, firstPt,
-                                  idList, projRef, interpolationDistance, cylindricalProjection);
-                depth--;
+                CreateInterPoints(prevP, projPrevP, p2, projP2, extent, buffer, firstPt, idList, projRef,
+                                  interpolationDistance, cylindricalProjection, depth + 1);
             }
         }
 
@@ -619,6 +803,160 @@ static void CreateInterPoints(double *p1, double *projP1, double *p2, double *pr
     }
 }
 
+// Default maximum size (in kibibytes) of the cache of projected outputs (see vtkProjFilter::SetCacheSize())
+#define PROJ_OUTPUT_CACHE_DEFAULT_SIZE 524288
+
+// Cache of projected outputs, ordered from most recently used to least recently used.
+// There is a single cache for the whole process (see outputCache below), so the memory that is used by the cached
+// outputs of all vtkProjFilter instances together is bounded by the size of the cache.
+class vtkProjFilterOutputCache
+{
+    public:
+        struct Key
+        {
+            // the modification time is included so the cached output is only used for an unmodified input
+            const vtkProjFilter *filter;
+            vtkDataObject *input;
+            vtkMTimeType inputMTime;
+            int projection;
+            double referenceHeight;
+            double centerLatitude;
+            double centerLongitude;
+            double eps;
+            double interpolationDistance;
+            double azimuthalIgnorePolyDistance;
+
+            bool operator==(const Key &other) const
+            {
+                return this->filter == other.filter && this->input == other.input &&
+                    this->inputMTime == other.inputMTime && this->projection == other.projection &&
+                    this->referenceHeight == other.referenceHeight && this->centerLatitude == other.centerLatitude &&
+                    this->centerLongitude == other.centerLongitude && this->eps == other.eps &&
+                    this->interpolationDistance == other.interpolationDistance &&
+                    this->azimuthalIgnorePolyDistance == other.azimuthalIgnorePolyDistance;
+            }
+        };
+
+        vtkProjFilterOutputCache() : maxSize(PROJ_OUTPUT_CACHE_DEFAULT_SIZE), totalSize(0) {}
+
+        unsigned long GetMaxSize()
+        {
+            std::lock_guard<std::mutex> lock(this->mutex);
+            return this->maxSize;
+        }
+
+        // Set the maximum total size of the cache (in kibibytes), removing least recently used entries if needed
+        void SetMaxSize(unsigned long size)
+        {
+            std::lock_guard<std::mutex> lock(this->mutex);
+            this->maxSize = size;
+            this->Reduce();
+        }
+
+        // Shallow copy the cached output for key into output (returns false if there is no such entry)
+        bool Find(const Key &key, vtkPolyData *output)
+        {
+            std::lock_guard<std::mutex> lock(this->mutex);
+            for (auto iter = this->entries.begin(); iter != this->entries.end(); ++iter)
+            {
+                if (iter->key == key)
+                {
+                    this->entries.splice(this->entries.begin(), this->entries, iter);
+                    output->ShallowCopy(this->entries.front().output);
+                    return true;
+                }
+            }
+            return false;
+        }
+
+        // Add a shallow copy of output to the cache and remove least recently used entries until the total size
+        // of the cache is at most the maximum size. Returns false if the output is larger than the whole cache (in
+        // which case it is not added).
+        bool Add(const Key &key, vtkPolyData *output)
+        {
+            std::lock_guard<std::mutex> lock(this->mutex);
+
+            // entries for older versions of the same input of the same filter can never be used again
+            for (auto iter = this->entries.begin(); iter != this->entries.end();)
+            {
+                if (iter->key.filter == key.filter && iter->key.input == key.input &&
+                    iter->key.inputMTime != key.inputMTime)
+                {
+                    this->totalSize -= iter->size;
+                    iter = this->entries.erase(iter);
+                }
+                else
+                {
+                    ++iter;
+                }
+            }
+
+            auto copy = vtkSmartPointer<vtkPolyData>::New();
+            copy->ShallowCopy(output);
+            unsigned long size = copy->GetActualMemorySize();
+            if (size > this->maxSize)
+            {
+                return false;
+            }
+            this->entries.push_front({key, copy, size});
+            this->totalSize += size;
+            this->Reduce();
+            return true;
+        }
+
+        // Remove all entries of a filter
+        void Remove(const vtkProjFilter *filter)
+        {
+            std::lock_guard<std::mutex> lock(this->mutex);
+            for (auto iter = this->entries.begin(); iter != this->entries.end();)
+            {
+                if (iter->key.filter == filter)
+                {
+                    this->totalSize -= iter->size;
+                    iter = this->entries.erase(iter);
+                }
+                else
+                {
+                    ++iter;
+                }
+            }
+        }
+
+        // Remove all entries
+        void Clear()
+        {
+            std::lock_guard<std::mutex> lock(this->mutex);
+            this->entries.clear();
+            this->totalSize = 0;
+        }
+
+    private:
+        struct Entry
+        {
+            Key key;
+            vtkSmartPointer<vtkPolyData> output;
+            unsigned long size;
+        };
+
+        // Remove least recently used entries until the total size of the cache is at most the maximum size (the
+        // caller should hold the mutex)
+        void Reduce()
+        {
+            while (this->totalSize > this->maxSize && !this->entries.empty())
+            {
+                this->totalSize -= this->entries.back().size;
+                this->entries.pop_back();
+            }
+        }
+
+        std::mutex mutex;
+        std::list<Entry> entries;
+        unsigned long maxSize;
+        unsigned long totalSize;
+};
+
+static vtkProjFilterOutputCache outputCache;
+
 //
 // The Projections currently only support Verts, Lines, and Polys.
 // Strips are thus currently not supported.
@@ -635,6 +973,27 @@ vtkProjFilter::vtkProjFilter()
     this->Projection = VTK_PROJ_PLATE_CAREE;
 }
 
+vtkProjFilter::~vtkProjFilter()
+{
+    // the cached outputs of this filter can no longer be used
+    outputCache.Remove(this);
+}
+
+void vtkProjFilter::SetCacheSize(unsigned long size)
+{
+    outputCache.SetMaxSize(size);
+}
+
+unsigned long vtkProjFilter::GetCacheSize()
+{
+    return outputCache.GetMaxSize();
+}
+
+void vtkProjFilter::ClearCache()
+{
+    outputCache.Clear();
+}
+
 double vtkProjFilter::GetXYRatio()
 {
     double extent[6];
@@ -668,6 +1027,25 @@ int vtkProjFilter::RequestData(vtkInformation *request, vtkInformationVector **i
         return 0;
     }
 
+    vtkProjFilterOutputCache::Key key;
+    key.filter = this;
+    key.input = input;
+    key.inputMTime = input->GetMTime();
+    key.projection = this->Projection;
+    key.referenceHeight = this->ReferenceHeight;
+    key.centerLatitude = this->CenterLatitude;
+    key.centerLongitude = this->CenterLongitude;
+    key.eps = this->Eps;
+    key.interpolationDistance = this->InterpolationDistance;
+    key.azimuthalIgnorePolyDistance = this->AzimuthalIgnorePolyDistance;
+
+    bool useCache = GetCacheSize() > 0;
+    if (useCache && outputCache.Find(key, this->GetOutput()))
+    {
+        vtkDebugMacro(<< "Using cached projection of polygonal data");
+        return 1;
+    }
+
     switch (this->Projection)
     {
         case VTK_PROJ_LAMBERT_CYLINDRICAL:
@@ -688,6 +1066,11 @@ int vtkProjFilter::RequestData(vtkInformation *request, vtkInformationVector **i
             return 0;
     }
 
+    if (useCache && !outputCache.Add(key, this->GetOutput()))
+    {
+        vtkDebugMacro(<< "Projected output is larger than the cache size and is not cached");
+    }
+
     return 1;
 }
 
@@ -725,6 +1108,7 @@ void vtkProjFilter::PrintSelf(ostream& os, vtkIndent indent)
     }
     os << indent << "Center Latitude: " << this->CenterLatitude << endl;
     os << indent << "Center Longitude: " << this->CenterLongitude << endl;
+    os << indent << "Cache Size: " << GetCacheSize() << endl;
 }
 
 // extent = (min_x, max_x, min_y, max_y, min_z, max_z)
@@ -792,21 +1176,26 @@ void vtkProjFilter::GetExtent(int projection, double extent[6])
     }
 }
 
-void vtkProjFilter::NormalizedProjection2D(int projection, double centerLat, double centerLon,
-                                           double lat, double lon, double &x, double &y)
+// Maximum number of PJ objects that are kept in the process wide cache of 2D projections
+#define PROJ_CACHE_SIZE 16
+
+// The cached PJ objects all use the default PROJ context, so the cache mutex needs to be held while a PJ object
+// from the cache is in use
+static std::mutex projCacheMutex;
+static std::list<std::pair<std::string, PJ *>> projCache;
+
+// Get the PJ object for a 2D projection with the given center (the caller should hold projCacheMutex).
+// The PJ object is owned by the cache. Returns nullptr if the projection could not be created.
+static PJ *GetCachedProjection(int projection, double centerLat, double centerLon)
 {
-    double extent[6];
     PJ *projRef;
-    PJ_COORD projLPData;
-    PJ_COORD projXYData;
     char centerLatitudeParam[100];
     char centerLongitudeParam[100];
-
-    static char *parameters[] =
+    char *parameters[] =
     {
         (char *)"",
-        (char *)"",
-        (char *)"",
+        centerLatitudeParam,
+        centerLongitudeParam,
         (char *)"R=1.0",
         (char *)"ellps=WGS84",
         (char *)"no_defs"
@@ -832,22 +1221,64 @@ void vtkProjFilter::NormalizedProjection2D(int projection, double centerLat, dou
         case VTK_PROJ_AZIMUTHAL_EQUIDISTANT:
             parameters[0] = (char *)"proj=aeqd";
             break;
-        case VTK_PROJ_3D:
         default:
-            // this is meaningles ...
-            x = y = 0.0;
-            return;
-            break;
+            return nullptr;
     }
 
     snprintf(centerLatitudeParam, 100, "lat_0=%7.3f", centerLat);
     snprintf(centerLongitudeParam, 100, "lon_0=%7.3f", centerLon);
-    parameters[1] = centerLatitudeParam;
-    parameters[2] = centerLongitudeParam;
+
+    // the key is based on the actual PROJ parameters (which use a rounded center)
+    std::string key = std::string(parameters[0]) + " " + centerLatitudeParam + " " + centerLongitudeParam;
+    for (auto iter = projCache.begin(); iter != projCache.end(); ++iter)
+    {
+        if (iter->first == key)
+        {
+            projCache.splice(projCache.begin(), projCache, iter);
+            return iter->second;
+        }
+    }
 
     // initialize the projection library
     projRef = proj_create_argv(0, sizeof(parameters)/sizeof(char *), parameters);
-    if (projRef == 0)
+    if (projRef == nullptr)
+    {
+        return nullptr;
+    }
+    projCache.emplace_front(key, projRef);
+    if (projCache.size() > PROJ_CACHE_SIZE)
+    {
+        proj_destroy(projCache.back().second);
+        projCache.pop_back();
+    }
+
+    return projRef;
+}
+
+static bool IsProjection2D(int projection)
+{
+    return projection >= VTK_PROJ_LAMBERT_CYLINDRICAL && projection <= VTK_PROJ_AZIMUTHAL_EQUIDISTANT;
+}
+
+void vtkProjFilter::NormalizedProjection2D(int projection, double centerLat, double centerLon,
+                                           double lat, double lon, double &x, double &y)
+{
+    double extent[6];
+    PJ *projRef;
+    PJ_COORD projLPData;
+    PJ_COORD projXYData;
+
+    if (!IsProjection2D(projection))
+    {
+        // this is meaningles ...
+        x = y = 0.0;
+        return;
+    }
+
+    std::lock_guard<std::mutex> lock(projCacheMutex);
+
+    projRef = GetCachedProjection(projection, centerLat, centerLon);
+    if (projRef == nullptr)
     {
         return;
     }
@@ -862,8 +1293,6 @@ void vtkProjFilter::NormalizedProjection2D(int projection, double centerLat, dou
     // normalize the projection
     x = (projXYData.xy.x - extent[0]) / (extent[1] - extent[0]);
     y = (projXYData.xy.y - extent[2]) / (extent[3] - extent[2]);
-
-    proj_destroy(projRef);
 }
 
 std::vector<double> vtkProjFilter::NormalizedProjection2D(int projection, double centerLat, double centerLon,
@@ -874,6 +1303,69 @@ std::vector<double> vtkProjFilter::NormalizedProjection2D(int projection, double
     return coord;
 }
 
+void vtkProjFilter::NormalizedProjection2D(int projection, double centerLat, double centerLon, vtkDataArray *lat,
+                                           vtkDataArray *lon, vtkDoubleArray *x, vtkDoubleArray *y)
+{
+    double extent[6];
+    vtkIdType numPoints;
+    vtkIdType i;
+    PJ *projRef;
+
+    numPoints = lat->GetNumberOfTuples();
+    if (lon->GetNumberOfTuples() != numPoints)
+    {
+        vtkGenericWarningMacro(<< "number of latitude and longitude values should be the same");
+        return;
+    }
+
+    x->SetNumberOfComponents(1);
+    x->SetNumberOfTuples(numPoints);
+    y->SetNumberOfComponents(1);
+    y->SetNumberOfTuples(numPoints);
+    double *xData = x->GetPointer(0);
+    double *yData = y->GetPointer(0);
+
+    if (!IsProjection2D(projection))
+    {
+        // this is meaningles ...
+        x->FillComponent(0, 0.0);
+        y->FillComponent(0, 0.0);
+        return;
+    }
+
+    // the coordinates are transformed in place in the output arrays
+    for (i = 0; i < numPoints; i++)
+    {
+        xData[i] = lon->GetComponent(i, 0) * DEG_TO_RAD;
+        yData[i] = lat->GetComponent(i, 0) * DEG_TO_RAD;
+    }
+
+    {
+        std::lock_guard<std::mutex> lock(projCacheMutex);
+
+        projRef = GetCachedProjection(projection, centerLat, centerLon);
+        if (projRef == nullptr)
+        {
+            x->FillComponent(0, vtkMath::Nan());
+            y->FillComponent(0, vtkMath::Nan());
+            return;
+        }
+        proj_trans_generic(projRef, PJ_FWD, xData, sizeof(double), numPoints, yData, sizeof(double), numPoints,
+                           nullptr, 0, 0, nullptr, 0, 0);
+    }
+
+    vtkProjFilter::GetExtent(projection, extent);
+
+    // normalize the projection
+    for (i = 0; i < numPoints; i++)
+    {
+        xData[i] = (xData[i] - extent[0]) / (extent[1] - extent[0]);
+        yData[i] = (yData[i] - extent[2]) / (extent[3] - extent[2]);
+    }
+    x->Modified();
+    y->Modified();
+}
+
 void vtkProjFilter::NormalizedDeprojection2D(int projection, double centerLat, double centerLon,
                                              double x, double y, double &lat, double &lon)
 {
@@ -881,54 +1373,18 @@ void vtkProjFilter::NormalizedDeprojection2D(int projection, double centerLat, d
     PJ *projRef;
     PJ_COORD projLPData;
     PJ_COORD projXYData;
-    char centerLatitudeParam[100];
-    char centerLongitudeParam[100];
 
-    static char *parameters[] =
+    if (!IsProjection2D(projection))
     {
-        (char *)"",
-        (char *)"",
-        (char *)"",
-        (char *)"R=1.0",
-        (char *)"ellps=WGS84",
-        (char *)"no_defs"
-    };
-
-    switch (projection)
-    {
-        case VTK_PROJ_LAMBERT_CYLINDRICAL:
-            parameters[0] = (char *)"proj=cea";
-            break;
-        case VTK_PROJ_PLATE_CAREE:
-            parameters[0] = (char *)"proj=eqc";
-            break;
-        case VTK_PROJ_MOLLWEIDE:
-            parameters[0] = (char *)"proj=moll";
-            break;
-        case VTK_PROJ_ROBINSON:
-            parameters[0] = (char *)"proj=robin";
-            break;
-        case VTK_PROJ_LAMBERT_AZIMUTHAL:
-            parameters[0] = (char *)"proj=laea";
-            break;
-        case VTK_PROJ_AZIMUTHAL_EQUIDISTANT:
-            parameters[0] = (char *)"proj=aeqd";
-            break;
-        case VTK_PROJ_3D:
-        default:
-            // this is meaningles ...
-            lat = lon = 0.0;
-            return;
+        // this is meaningles ...
+        lat = lon = 0.0;
+        return;
     }
 
-    snprintf(centerLatitudeParam, 100, "lat_0=%7.3f", centerLat);
-    snprintf(centerLongitudeParam, 100, "lon_0=%7.3f", centerLon);
-    parameters[1] = centerLatitudeParam;
-    parameters[2] = centerLongitudeParam;
+    std::lock_guard<std::mutex> lock(projCacheMutex);
 
-    // initialize the projection library
-    projRef = proj_create_argv(0, sizeof(parameters)/sizeof(char *), parameters);
-    if (projRef == 0)
+    projRef = GetCachedProjection(projection, centerLat, centerLon);
+    if (projRef == nullptr)
     {
         return;
     }
@@ -959,10 +1415,8 @@ void vtkProjFilter::NormalizedDeprojection2D(int projection, double centerLat, d
     }
     else if (lat > 90.0)
     {
-        lon = 90.0;
+        lat = 90.0;
     }
-
-    proj_destroy(projRef);
 }
 
 std::vector<double> vtkProjFilter::NormalizedDeprojection2D(int projection, double centerLat, double centerLon,
@@ -973,6 +1427,69 @@ std::vector<double> vtkProjFilter::NormalizedDeprojection2D(int projection, doub
     return coord;
 }
 
+void vtkProjFilter::NormalizedDeprojection2D(int projection, double centerLat, double centerLon, vtkDataArray *x,
+                                             vtkDataArray *y, vtkDoubleArray *lat, vtkDoubleArray *lon)
+{
+    double extent[6];
+    vtkIdType numPoints;
+    vtkIdType i;
+    PJ *projRef;
+
+    numPoints = x->GetNumberOfTuples();
+    if (y->GetNumberOfTuples() != numPoints)
+    {
+        vtkGenericWarningMacro(<< "number of x and y values should be the same");
+        return;
+    }
+
+    lat->SetNumberOfComponents(1);
+    lat->SetNumberOfTuples(numPoints);
+    lon->SetNumberOfComponents(1);
+    lon->SetNumberOfTuples(numPoints);
+    double *latData = lat->GetPointer(0);
+    double *lonData = lon->GetPointer(0);
+
+    if (!IsProjection2D(projection))
+    {
+        // this is meaningles ...
+        lat->FillComponent(0, 0.0);
+        lon->FillComponent(0, 0.0);
+        return;
+    }
+
+    vtkProjFilter::GetExtent(projection, extent);
+
+    // denormalize the projection points (the coordinates are transformed in place in the output arrays)
+    for (i = 0; i < numPoints; i++)
+    {
+        lonData[i] = x->GetComponent(i, 0) * (extent[1] - extent[0]) + extent[0];
+        latData[i] = y->GetComponent(i, 0) * (extent[3] - extent[2]) + extent[2];
+    }
+
+    {
+        std::lock_guard<std::mutex> lock(projCacheMutex);
+
+        projRef = GetCachedProjection(projection, centerLat, centerLon);
+        if (projRef == nullptr)
+        {
+            lat->FillComponent(0, vtkMath::Nan());
+            lon->FillComponent(0, vtkMath::Nan());
+            return;
+        }
+        proj_trans_generic(projRef, PJ_INV, lonData, sizeof(double), numPoints, latData, sizeof(double), numPoints,
+                           nullptr, 0, 0, nullptr, 0, 0);
+    }
+
+    // convert to degrees and consider the range.
+    for (i = 0; i < numPoints; i++)
+    {
+        lonData[i] = std::min(std::max(lonData[i] * RAD_TO_DEG, -180.0), 180.0);
+        latData[i] = std::min(std::max(latData[i] * RAD_TO_DEG, -90.0), 90.0);
+    }
+    lat->Modified();
+    lon->Modified();
+}
+
 void vtkProjFilter::GetExtent(double extent[6])
 {
     vtkProjFilter::GetExtent(this->Projection, extent);
@@ -988,7 +1505,6 @@ void vtkProjFilter::Perform3DProjection(vtkPolyData *input)
     vtkPointData *newPointData;
     vtkCellData *cellData;
     vtkCellData *newCellData;
-    vtkIdType id;
     vtkIdType numPoints;
 
     vtkDebugMacro(<< "Performing 3D projection on polygonal data");
@@ -1011,29 +1527,35 @@ void vtkProjFilter::Perform3DProjection(vtkPolyData *input)
     auto newPoints = vtkSmartPointer<vtkPoints>::New();
     newPoints->SetDataTypeToFloat();
     newPoints->SetNumberOfPoints(numPoints);
+    vtkFloatArray *projectedPoints = vtkFloatArray::SafeDownCast(newPoints->GetData());
+    float *projectedPointData = projectedPoints->GetPointer(0);
 
-    for (id = 0; id < numPoints; ++id)
+    vtkSMPTools::For(0, numPoints, [&](vtkIdType firstPt, vtkIdType lastPt)
     {
-        double sinLatitude, cosLatitude, sinLongitude, cosLongitude;
-        double pt[3];
-        double R;
+        vtkIdType id;
 
-        points->GetPoint(id, pt);
-        R = this->ReferenceHeight;
-        if (pt[2] > 0)
+        for (id = firstPt; id < lastPt; ++id)
         {
-            // use z value as radius
-            R = pt[2];
+            double sinLatitude, cosLatitude, sinLongitude, cosLongitude;
+            double pt[3];
+            double R;
+
+            points->GetPoint(id, pt);
+            R = this->ReferenceHeight;
+            if (pt[2] > 0)
+            {
+                // use z value as radius
+                R = pt[2];
+            }
+            sinLongitude = sin(pt[0] * DEG_TO_RAD);
+            cosLongitude = cos(pt[0] * DEG_TO_RAD);
+            sinLatitude = sin(pt[1] * DEG_TO_RAD);
+            cosLatitude = cos(pt[1] * DEG_TO_RAD);
+            projectedPointData[3 * id] = static_cast<float>(R * cosLongitude * cosLatitude);
+            projectedPointData[3 * id + 1] = static_cast<float>(R * sinLongitude * cosLatitude);
+            projectedPointData[3 * id + 2] = static_cast<float>(R * sinLatitude);
         }
-        sinLongitude = sin(pt[0] * DEG_TO_RAD);
-        cosLongitude = cos(pt[0] * DEG_TO_RAD);
-        sinLatitude = sin(pt[1] * DEG_TO_RAD);
-        cosLatitude = cos(pt[1] * DEG_TO_RAD);
-        pt[0] = R * cosLongitude * cosLatitude;
-        pt[1] = R * sinLongitude * cosLatitude;
-        pt[2] = R * sinLatitude;
-        newPoints->SetPoint(id, pt);
-    }
+    });
 
     output->SetPoints(newPoints);
 
@@ -1049,115 +1571,105 @@ void vtkProjFilter::Perform3DProjection(vtkPolyData *input)
         newCellData->DeepCopy(cellData);
     }
 
-    // Lines are interpolated if necessary
-    if (lines->GetNumberOfCells() > 0)
+    // Lines and polys are interpolated if necessary
+    vtkSMPThreadLocalObject<vtkIdList> threadIdList;
+    auto interpolateCell = [&](vtkProjFilterCellBuffer &buffer, vtkIdType cellId, vtkIdType npts,
+                               vtkIdType const *pts)
     {
-        auto newLines = vtkSmartPointer<vtkCellArray>::New();
-        output->SetLines(newLines);
-        if (this->InterpolationDistance <= 0)
-        {
-            newLines->DeepCopy(lines);
-            newCellData->DeepCopy(cellData);
-        }
-        else
-        {
-            vtkIdType numLines;
-            vtkIdType cellId;
-
-            newCellData->CopyAllocate(cellData);
+        vtkIdList *idList = threadIdList.Local();
 
-            numLines = lines->GetNumberOfCells();
+        if (npts > 0)
+        {
+            double p1[3];
+            int j;
 
-            auto idList = vtkSmartPointer<vtkIdList>::New();
-            idList->Allocate(1000);
+            buffer.GetPoint(pts[0], p1);
+            idList->Reset();
+            idList->InsertNextId(pts[0]);
 
-            lines->InitTraversal();
-            for (cellId = 0; cellId < numLines; cellId++)
+            for (j = 1; j < npts; j++)
             {
-                vtkIdType npts;
-                vtkIdType const *pts;
-
-                lines->GetNextCell(npts, pts);
+                double p2[3];
+                double distance;
 
-                if (npts > 0)
+                buffer.GetPoint(pts[j], p2);
+                distance = arcdistancexyz(p1[0], p1[1], p1[2], p2[0], p2[1], p2[2]);
+                if (distance > 360 * this->InterpolationDistance)
                 {
-                    double p1[3];
-                    int j;
-
-                    newPoints->GetPoint(pts[0], p1);
-                    idList->Reset();
-                    idList->InsertNextId(pts[0]);
-
-                    for (j = 1; j < npts; j++)
+                    int numIntermediatePoints;
+                    int result;
+                    double *ux;
+                    double *uy;
+                    double *uz;
+
+                    numIntermediatePoints = (int)(distance / (360 * this->InterpolationDistance)) ;
+                    if ((ux = new double[numIntermediatePoints]) == nullptr)
                     {
-                        double p2[3];
-                        double distance;
+                        return;
+                    }
+                    if ((uy = new double[numIntermediatePoints]) == nullptr)
+                    {
+                        delete [] ux;
+                        return;
+                    }
+                    if ((uz = new double[numIntermediatePoints]) == nullptr)
+                    {
+                        delete [] ux;
+                        delete [] uy;
+                        return;
+                    }
+                    result = intermediatepointsxyz(p1[0], p1[1], p1[2], p2[0], p2[1], p2[2],
+                                                   numIntermediatePoints, ux, uy, uz);
+                    if (result == numIntermediatePoints)
+                    {
+                        int k;
 
-                        newPoints->GetPoint(pts[j], p2);
-                        distance = arcdistancexyz(p1[0], p1[1], p1[2], p2[0], p2[1], p2[2]);
-                        if (distance > 360 * this->InterpolationDistance)
+                        for (k = 0; k < numIntermediatePoints; k++)
                         {
-                            int numIntermediatePoints;
-                            int result;
-                            double *ux;
-                            double *uy;
-                            double *uz;
-
-                            numIntermediatePoints = (int)(distance / (360 * this->InterpolationDistance)) ;
-                            if ((ux = new double[numIntermediatePoints]) == nullptr)
-                            {
-                                return;
-                            }
-                            if ((uy = new double[numIntermediatePoints]) == nullptr)
-                            {
-                                delete [] ux;
-                                return;
-                            }
-                            if ((uz = new double[numIntermediatePoints]) == nullptr)
-                            {
-                                delete [] ux;
-                                delete [] uy;
-                                return;
-                            }
-                            result = intermediatepointsxyz(p1[0], p1[1], p1[2], p2[0], p2[1], p2[2],
-                                                           numIntermediatePoints, ux, uy, uz);
-                            if (result == numIntermediatePoints)
-                            {
-                                int k;
-
-                                for (k = 0; k < numIntermediatePoints; k++)
-                                {
-                                    vtkIdType newPt;
+                            double u[3] = { ux[k], uy[k], uz[k] };
+                            vtkIdType newPt;
 
-                                    newPt = newPoints->InsertNextPoint(ux[k], uy[k], uz[k]);
-                                    newPointData->CopyData(pointData, pts[j - 1], newPt);
-                                    idList->InsertNextId(newPt);
-                                }
-                            }
-
-                            delete [] ux;
-                            delete [] uy;
-                            delete [] uz;
+                            newPt = buffer.InsertNextPoint(u, pts[j - 1]);
+                            idList->InsertNextId(newPt);
                         }
-                        idList->InsertNextId(pts[j]);
-                        p1[0] = p2[0];
-                        p1[1] = p2[1];
-                        p1[2] = p2[2];
                     }
 
-                    if (idList->GetNumberOfIds() > 1)
-                    {
-                        vtkIdType newCellId;
-
-                        newCellId = output->InsertNextCell(VTK_LINE, idList);
-                        newCellData->CopyData(cellData, cellId, newCellId);
-                    }
+                    delete [] ux;
+                    delete [] uy;
+                    delete [] uz;
                 }
+                idList->InsertNextId(pts[j]);
+                p1[0] = p2[0];
+                p1[1] = p2[1];
+                p1[2] = p2[2];
+            }
+
+            if (idList->GetNumberOfIds() > 1)
+            {
+                buffer.InsertNextCell(idList, cellId);
             }
         }
+    };
+
+    if (lines->GetNumberOfCells() > 0)
+    {
+        auto newLines = vtkSmartPointer<vtkCellArray>::New();
+        output->SetLines(newLines);
+        if (this->InterpolationDistance <= 0)
+        {
+            newLines->DeepCopy(lines);
+            newCellData->DeepCopy(cellData);
+        }
+        else
+        {
+            std::vector<vtkProjFilterCellBuffer> buffers;
+
+            newCellData->CopyAllocate(cellData);
+            ProcessCellsInChunks(lines, projectedPoints, buffers, interpolateCell);
+            AppendCellBuffers(buffers, output, VTK_LINE, pointData, cellData);
+        }
     }
 
-    // Polys are interpolated if necessary
     if (polys->GetNumberOfCells() > 0)
     {
         auto newPolys = vtkSmartPointer<vtkCellArray>::New();
@@ -1169,100 +1681,11 @@ void vtkProjFilter::Perform3DProjection(vtkPolyData *input)
         }
         else
         {
-            vtkIdType numPolys;
-            vtkIdType cellId;
+            std::vector<vtkProjFilterCellBuffer> buffers;
 
             newCellData->CopyAllocate(cellData);
-
-            numPolys = polys->GetNumberOfCells();
-
-            auto idList = vtkSmartPointer<vtkIdList>::New();
-            idList->Allocate(1000);
-
-            polys->InitTraversal();
-            for (cellId = 0; cellId < numPolys; cellId++)
-            {
-                vtkIdType npts;
-                vtkIdType const *pts;
-
-                polys->GetNextCell(npts, pts);
-
-                if (npts > 0)
-                {
-                    double p1[3];
-                    int j;
-
-                    newPoints->GetPoint(pts[0], p1);
-                    idList->Reset();
-                    idList->InsertNextId(pts[0]);
-
-                    for (j = 1; j < npts; j++)
-                    {
-                        double p2[3];
-                        double distance;
-
-                        newPoints->GetPoint(pts[j], p2);
-                        distance = arcdistancexyz(p1[0], p1[1], p1[2], p2[0], p2[1], p2[2]);
-                        if (distance > 360 * this->InterpolationDistance)
-                        {
-                            int numIntermediatePoints;
-                            int result;
-                            double *ux;
-                            double *uy;
-                            double *uz;
-
-                            numIntermediatePoints = (int)(distance / (360 * this->InterpolationDistance)) ;
-                            if ( (ux = new double[numIntermediatePoints]) == nullptr)
-                            {
-                                return;
-                            }
-                            if ( (uy = new double[numIntermediatePoints]) == nullptr)
-                            {
-                                delete [] ux;
-                                return;
-                            }
-                            if ( (uz = new double[numIntermediatePoints]) == nullptr)
-                            {
-                                delete [] ux;
-                                delete [] uy;
-                                return;
-                            }
-                            result = intermediatepointsxyz(p1[0], p1[1], p1[2], p2[0], p2[1],
-                                p2[2], numIntermediatePoints, ux,
-                                uy, uz);
-                            if (result == numIntermediatePoints)
-                            {
-                                int k;
-
-                                for (k = 0; k < numIntermediatePoints; k++)
-                                {
-                                    vtkIdType newPt;
-
-                                    newPt = newPoints->InsertNextPoint(ux[k], uy[k], uz[k]);
-                                    newPointData->CopyData(pointData, pts[j - 1], newPt);
-                                    idList->InsertNextId(newPt);
-                                }
-                            }
-
-                            delete [] ux;
-                            delete [] uy;
-                            delete [] uz;
-                        }
-                        idList->InsertNextId(pts[j]);
-                        p1[0] = p2[0];
-                        p1[1] = p2[1];
-                        p1[2] = p2[2];
-                    }
-
-                    if (idList->GetNumberOfIds() > 1)
-                    {
-                        vtkIdType newCellId;
-
-                        newCellId = output->InsertNextCell(VTK_POLYGON, idList);
-                        newCellData->CopyData(cellData, cellId, newCellId);
-                    }
-                }
-            }
+            ProcessCellsInChunks(polys, projectedPoints, buffers, interpolateCell);
+            AppendCellBuffers(buffers, output, VTK_POLYGON, pointData, cellData);
         }
     }
 }
@@ -1277,11 +1700,8 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
     vtkPointData *newPointData;
     vtkCellData *cellData;
     vtkCellData *newCellData;
-    vtkIdType id;
     vtkIdType numPoints;
     PJ *projRef;
-    PJ_COORD projLPData;
-    PJ_COORD projXYData;
     char centerLatitudeParam[100];
     char centerLongitudeParam[100];
     double extent[6];
@@ -1308,6 +1728,8 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
     auto newPoints = vtkSmartPointer<vtkPoints>::New();
     newPoints->SetDataTypeToFloat();
     newPoints->SetNumberOfPoints(numPoints);
+    vtkFloatArray *projectedPoints = vtkFloatArray::SafeDownCast(newPoints->GetData());
+    float *projectedPointData = projectedPoints->GetPointer(0);
 
     if (this->CenterLatitude == 0.0)
     {
@@ -1332,6 +1754,7 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
         (char *)"ellps=WGS84",
         (char *)"no_defs"
     };
+    int numParameters = sizeof(parameters)/sizeof(char *);
 
     switch (this->Projection)
     {
@@ -1350,34 +1773,59 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
     parameters[1] = centerLatitudeParam;
     parameters[2] = centerLongitudeParam;
 
-    projRef = proj_create_argv(0, sizeof(parameters)/sizeof(char *), parameters);
+    projRef = proj_create_argv(0, numParameters, parameters);
     if (projRef == 0)
     {
         vtkErrorMacro(<< "Could not initialize PROJ library (" << proj_errno_string(proj_errno(0)) << ")");
         return;
     }
+    // the projection itself is performed in parallel using a separate PROJ object per thread
+    proj_destroy(projRef);
+
+    vtkSMPThreadLocal<vtkProjFilterThreadProjection> threadProjection;
+    std::atomic<bool> projectionFailed(false);
 
     GetExtent(extent);
 
-    for (id = 0; id < numPoints; ++id)
+    vtkSMPTools::For(0, numPoints, [&](vtkIdType firstPt, vtkIdType lastPt)
     {
-        double pt[3];
+        PJ *threadProjRef = threadProjection.Local().GetProjection(numParameters, parameters);
+        vtkIdType id;
 
-        points->GetPoint(id, pt);
-        while (pt[0] >= 180)
+        if (threadProjRef == nullptr)
         {
-            pt[0] -= 360;
+            projectionFailed = true;
+            return;
         }
-        while (pt[0] < -180)
+
+        for (id = firstPt; id < lastPt; ++id)
         {
-            pt[0] += 360;
+            PJ_COORD projLPData;
+            PJ_COORD projXYData;
+            double pt[3];
+
+            points->GetPoint(id, pt);
+            while (pt[0] >= 180)
+            {
+                pt[0] -= 360;
+            }
+            while (pt[0] < -180)
+            {
+                pt[0] += 360;
+            }
+            projLPData.lp.lam = pt[0] * DEG_TO_RAD;
+            projLPData.lp.phi = pt[1] * DEG_TO_RAD;
+            projXYData = proj_trans(threadProjRef, PJ_FWD, projLPData);
+            projectedPointData[3 * id] = static_cast<float>((projXYData.xy.x - extent[0]) / (extent[1] - extent[0]));
+            projectedPointData[3 * id + 1] = static_cast<float>((projXYData.xy.y - extent[2]) /
+                                                                (extent[3] - extent[2]));
+            projectedPointData[3 * id + 2] = static_cast<float>(pt[2]);
         }
-        projLPData.lp.lam = pt[0] * DEG_TO_RAD;
-        projLPData.lp.phi = pt[1] * DEG_TO_RAD;
-        projXYData = proj_trans(projRef, PJ_FWD, projLPData);
-        pt[0] = (projXYData.xy.x - extent[0]) / (extent[1] - extent[0]);
-        pt[1] = (projXYData.xy.y - extent[2]) / (extent[3] - extent[2]);
-        newPoints->SetPoint(id, pt);
+    });
+    if (projectionFailed)
+    {
+        vtkErrorMacro(<< "Could not initialize PROJ library");
+        return;
     }
 
     output->SetPoints(newPoints);
@@ -1426,35 +1874,34 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
     if (lines->GetNumberOfCells() > 0)
     {
         auto newLines = vtkSmartPointer<vtkCellArray>::New();
-        vtkIdType numLines;
-        vtkIdType cellId;
+        std::vector<vtkProjFilterCellBuffer> buffers;
+        vtkSMPThreadLocalObject<vtkIdList> threadIdList;
 
         // initialize newCellData for CopyData invocations
         newCellData->CopyAllocate(cellData);
 
         output->SetLines(newLines);
-        numLines = lines->GetNumberOfCells();
 
-        auto idList = vtkSmartPointer<vtkIdList>::New();
-        idList->Allocate(1000);
-
-        lines->InitTraversal();
-        for(cellId = 0; cellId < numLines; cellId++)
+        auto processLine = [&](vtkProjFilterCellBuffer &buffer, vtkIdType cellId, vtkIdType npts,
+                               vtkIdType const *pts)
         {
-            vtkIdType npts;
-            vtkIdType const *pts;
+            PJ *threadProjRef = threadProjection.Local().GetProjection(numParameters, parameters);
+            vtkIdList *idList = threadIdList.Local();
 
-            lines->GetNextCell(npts, pts);
+            if (threadProjRef == nullptr)
+            {
+                projectionFailed = true;
+                return;
+            }
 
             if (npts > 0)
             {
                 double p1[3];
                 double projP1[3];
-                vtkIdType newCellId;
                 int j;
 
                 points->GetPoint(pts[0], p1);
-                newPoints->GetPoint(pts[0], projP1);
+                buffer.GetPoint(pts[0], projP1);
                 while (p1[0] >= 180)
                 {
                     p1[0] -= 360;
@@ -1475,7 +1922,7 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
                     double projP2[3];
 
                     points->GetPoint(pts[j], p2);
-                    newPoints->GetPoint(pts[j], projP2);
+                    buffer.GetPoint(pts[j], projP2);
                     while (p2[0] >= 180)
                     {
                         p2[0] -= 360;
@@ -1489,8 +1936,7 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
                         // Skip this point and start a new line
                         if (idList->GetNumberOfIds() > 1)
                         {
-                            newCellId = output->InsertNextCell(VTK_LINE, idList);
-                            newCellData->CopyData(cellData, cellId, newCellId);
+                            buffer.InsertNextCell(idList, cellId);
                         }
                         idList->Reset();
                     }
@@ -1499,8 +1945,8 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
                         // check for interpolation
                         if (projP1[0] != HUGE_VAL && projP1[1] != HUGE_VAL)
                         {
-                            CreateInterPoints(p1, projP1, p2, projP2, extent, newPoints, pointData, newPointData,
-                                              pts[j - 1], idList, projRef, this->InterpolationDistance, 0);
+                            CreateInterPoints(p1, projP1, p2, projP2, extent, &buffer, pts[j - 1], idList,
+                                              threadProjRef, this->InterpolationDistance, 0);
                         }
                         idList->InsertNextId(pts[j]);
                     }
@@ -1515,11 +1961,13 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
 
                 if (idList->GetNumberOfIds() > 1)
                 {
-                    newCellId = output->InsertNextCell(VTK_LINE, idList);
-                    newCellData->CopyData(cellData, cellId, newCellId);
+                    buffer.InsertNextCell(idList, cellId);
                 }
             }
-        }
+        };
+
+        ProcessCellsInChunks(lines, projectedPoints, buffers, processLine);
+        AppendCellBuffers(buffers, output, VTK_LINE, pointData, cellData);
     }
 
     // Polys need to be filtered for points that correspond with the cutting point
@@ -1528,30 +1976,29 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
     if (polys->GetNumberOfCells() > 0)
     {
         auto newPolys = vtkSmartPointer<vtkCellArray>::New();
-        vtkIdType numPolys;
-        vtkIdType cellId;
+        std::vector<vtkProjFilterCellBuffer> buffers;
+        vtkSMPThreadLocalObject<vtkIdList> threadIdList;
 
         // initialize newCellData for CopyData invocations
         newCellData->CopyAllocate(cellData);
 
         output->SetPolys(newPolys);
-        numPolys = polys->GetNumberOfCells();
 
-        auto idList = vtkSmartPointer<vtkIdList>::New();
-        idList->Allocate(1000);
-
-        polys->InitTraversal();
-        for (cellId = 0; cellId < numPolys; cellId++)
+        auto processPoly = [&](vtkProjFilterCellBuffer &buffer, vtkIdType cellId, vtkIdType npts,
+                               vtkIdType const *pts)
         {
+            PJ *threadProjRef = threadProjection.Local().GetProjection(numParameters, parameters);
+            vtkIdList *idList = threadIdList.Local();
             double mindistance = this->AzimuthalIgnorePolyDistance;
-            vtkIdType npts;
-            vtkIdType const *pts;
 
-            polys->GetNextCell(npts, pts);
+            if (threadProjRef == nullptr)
+            {
+                projectionFailed = true;
+                return;
+            }
 
             if (npts > 0)
             {
-                vtkIdType newCellId;
                 double p1[3];
                 double projP1[3];
                 double distance;
@@ -1564,7 +2011,7 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
                 {
                     mindistance = distance;
                 }
-                newPoints->GetPoint(pts[0], projP1);
+                buffer.GetPoint(pts[0], projP1);
                 idList->Reset();
                 if (projP1[0] != HUGE_VAL && projP1[1] != HUGE_VAL)
                 {
@@ -1576,7 +2023,7 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
                 {
                     double projP2[3];
 
-                    newPoints->GetPoint(pts[j], projP2);
+                    buffer.GetPoint(pts[j], projP2);
                     if (projP2[0] != HUGE_VAL && projP2[1] != HUGE_VAL)
                     {
                         double p2[3];
@@ -1589,8 +2036,8 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
                         }
                         if (lastId >= 0)
                         {
-                            CreateInterPoints(p1, projP1, p2, projP2, extent, newPoints, pointData, newPointData,
-                                              pts[lastId], idList, projRef, this->InterpolationDistance, 0);
+                            CreateInterPoints(p1, projP1, p2, projP2, extent, &buffer, pts[lastId], idList,
+                                              threadProjRef, this->InterpolationDistance, 0);
                         }
                         idList->InsertNextId(pts[j]);
 
@@ -1619,22 +2066,27 @@ void vtkProjFilter::PerformAzimuthalProjection(vtkPolyData *input)
                         double projLastP[3];
                         points->GetPoint(id1, firstP);
                         points->GetPoint(id2, lastP);
-                        newPoints->GetPoint(id1, projFirstP);
-                        newPoints->GetPoint(id2, projLastP);
+                        buffer.GetPoint(id1, projFirstP);
+                        buffer.GetPoint(id2, projLastP);
                         if (firstP[0] != lastP[0] || firstP[1] != lastP[1])
                         {
-                            CreateInterPoints(lastP, projLastP, firstP, projFirstP, extent, newPoints, pointData,
-                                              newPointData, id2, idList, projRef, this->InterpolationDistance, 0);
+                            CreateInterPoints(lastP, projLastP, firstP, projFirstP, extent, &buffer, id2, idList,
+                                              threadProjRef, this->InterpolationDistance, 0);
                         }
                     }
-                    newCellId = output->InsertNextCell(VTK_POLYGON, idList);
-                    newCellData->CopyData(cellData, cellId, newCellId);
+                    buffer.InsertNextCell(idList, cellId);
                 }
             }
-        }
+        };
+
+        ProcessCellsInChunks(polys, projectedPoints, buffers, processPoly);
+        AppendCellBuffers(buffers, output, VTK_POLYGON, pointData, cellData);
     }
 
-    proj_destroy(projRef);
+    if (projectionFailed)
+    {
+        vtkErrorMacro(<< "Could not initialize PROJ library");
+    }
 }
 
 void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
@@ -1647,11 +2099,8 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
     vtkPointData *newPointData;
     vtkCellData *cellData;
     vtkCellData *newCellData;
-    vtkIdType id;
     vtkIdType numPoints;
     PJ *projRef;
-    PJ_COORD projLPData;
-    PJ_COORD projXYData;
     char centerLongitudeParam[100];
     double extent[6];
     double cuttingLongitude;
@@ -1676,6 +2125,8 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
     auto newPoints = vtkSmartPointer<vtkPoints>::New();
     newPoints->SetDataTypeToFloat();
     newPoints->SetNumberOfPoints(numPoints);
+    vtkFloatArray *projectedPoints = vtkFloatArray::SafeDownCast(newPoints->GetData());
+    float *projectedPointData = projectedPoints->GetPointer(0);
 
     cuttingLongitude = this->CenterLongitude + 180.0;
     if (cuttingLongitude >= 180.0)
@@ -1691,6 +2142,7 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
         (char *)"ellps=WGS84",
         (char *)"no_defs"
     };
+    int numParameters = sizeof(parameters)/sizeof(char *);
 
     switch (this->Projection)
     {
@@ -1713,48 +2165,74 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
     snprintf(centerLongitudeParam, 100, "lon_0=%7.3f", this->CenterLongitude);
     parameters[1] = centerLongitudeParam;
 
-    projRef = proj_create_argv(0, sizeof(parameters)/sizeof(char *), parameters);
+    projRef = proj_create_argv(0, numParameters, parameters);
     if (projRef == 0)
     {
         vtkErrorMacro(<< "Could not initialize PROJ library (" << proj_errno_string(proj_errno(0)) << ")");
         return;
     }
+    // the projection itself is performed in parallel using a separate PROJ object per thread
+    proj_destroy(projRef);
+
+    vtkSMPThreadLocal<vtkProjFilterThreadProjection> threadProjection;
+    std::atomic<bool> projectionFailed(false);
 
     GetExtent(extent);
 
-    for (id = 0; id < numPoints; id++)
+    vtkSMPTools::For(0, numPoints, [&](vtkIdType firstPt, vtkIdType lastPt)
     {
-        double pt[3];
-        int leftSide;
+        PJ *threadProjRef = threadProjection.Local().GetProjection(numParameters, parameters);
+        vtkIdType id;
 
-        points->GetPoint(id, pt);
-        while (pt[0] >= 180)
-        {
-            pt[0] -= 360;
-        }
-        while (pt[0] < -180)
-        {
-            pt[0] += 360;
-        }
-        if (this->CenterLongitude > cuttingLongitude)
+        if (threadProjRef == nullptr)
         {
-            leftSide = (pt[0] >= cuttingLongitude && pt[0] < this->CenterLongitude);
-        }
-        else
-        {
-            leftSide = (pt[0] >= cuttingLongitude || pt[0] < this->CenterLongitude);
+            projectionFailed = true;
+            return;
         }
-        projLPData.lp.lam = pt[0] * DEG_TO_RAD;
-        projLPData.lp.phi = pt[1] * DEG_TO_RAD;
-        projXYData = proj_trans(projRef, PJ_FWD, projLPData);
-        pt[0] = (projXYData.xy.x - extent[0]) / (extent[1] - extent[0]);
-        pt[1] = (projXYData.xy.y - extent[2]) / (extent[3] - extent[2]);
-        if ((leftSide && pt[0] > 0.5) || (!leftSide && pt[0] < 0.5))
+
+        for (id = firstPt; id < lastPt; id++)
         {
-            // Fix rounding to the wrong side of the edge by PROJ
-            pt[0] = 1.0 - pt[0];
+            PJ_COORD projLPData;
+            PJ_COORD projXYData;
+            double pt[3];
+            int leftSide;
+
+            points->GetPoint(id, pt);
+            while (pt[0] >= 180)
+            {
+                pt[0] -= 360;
+            }
+            while (pt[0] < -180)
+            {
+                pt[0] += 360;
+            }
+            if (this->CenterLongitude > cuttingLongitude)
+            {
+                leftSide = (pt[0] >= cuttingLongitude && pt[0] < this->CenterLongitude);
+            }
+            else
+            {
+                leftSide = (pt[0] >= cuttingLongitude || pt[0] < this->CenterLongitude);
+            }
+            projLPData.lp.lam = pt[0] * DEG_TO_RAD;
+            projLPData.lp.phi = pt[1] * DEG_TO_RAD;
+            projXYData = proj_trans(threadProjRef, PJ_FWD, projLPData);
+            pt[0] = (projXYData.xy.x - extent[0]) / (extent[1] - extent[0]);
+            pt[1] = (projXYData.xy.y - extent[2]) / (extent[3] - extent[2]);
+            if ((leftSide && pt[0] > 0.5) || (!leftSide && pt[0] < 0.5))
+            {
+                // Fix rounding to the wrong side of the edge by PROJ
+                pt[0] = 1.0 - pt[0];
+            }
+            projectedPointData[3 * id] = static_cast<float>(pt[0]);
+            projectedPointData[3 * id + 1] = static_cast<float>(pt[1]);
+            projectedPointData[3 * id + 2] = static_cast<float>(pt[2]);
         }
-        newPoints->SetPoint(id, pt);
+    });
+    if (projectionFailed)
+    {
+        vtkErrorMacro(<< "Could not initialize PROJ library");
+        return;
     }
     output->SetPoints(newPoints);
 
@@ -1774,35 +2252,34 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
     if (lines->GetNumberOfCells() > 0)
     {
         auto newLines = vtkSmartPointer<vtkCellArray>::New();
-        vtkIdType numLines;
-        vtkIdType cellId;
+        std::vector<vtkProjFilterCellBuffer> buffers;
+        vtkSMPThreadLocalObject<vtkIdList> threadIdList;
 
         // initialize newCellData for CopyData invocations
         newCellData->CopyAllocate(cellData);
 
         output->SetLines(newLines);
-        numLines = lines->GetNumberOfCells();
-
-        auto idList = vtkSmartPointer<vtkIdList>::New();
-        idList->Allocate(1000);
 
-        lines->InitTraversal();
-        for (cellId = 0; cellId < numLines; cellId++)
+        auto processLine = [&](vtkProjFilterCellBuffer &buffer, vtkIdType cellId, vtkIdType npts,
+                               vtkIdType const *pts)
         {
-            vtkIdType npts;
-            vtkIdType const *pts;
+            PJ *threadProjRef = threadProjection.Local().GetProjection(numParameters, parameters);
+            vtkIdList *idList = threadIdList.Local();
 
-            lines->GetNextCell(npts, pts);
+            if (threadProjRef == nullptr)
+            {
+                projectionFailed = true;
+                return;
+            }
 
             if (npts > 0)
             {
-                vtkIdType newCellId;
                 double p1[3];
                 double projP1[3];
                 int j;
 
                 points->GetPoint(pts[0], p1);
-                newPoints->GetPoint(pts[0], projP1);
+                buffer.GetPoint(pts[0], projP1);
                 while (p1[0] >= 180)
                 {
                     p1[0] -= 360;
@@ -1820,7 +2297,7 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                     double projP2[3];
 
                     points->GetPoint(pts[j], p2);
-                    newPoints->GetPoint(pts[j], projP2);
+                    buffer.GetPoint(pts[j], projP2);
                     while (p2[0] >= 180)
                     {
                         p2[0] -= 360;
@@ -1839,8 +2316,8 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
 
                         // the line segments coincides with the cutting meridian ->
                         // keep the line segment and add a second line at the other side
-                        CreateInterPoints(p1, projP1, p2, projP2, extent, newPoints, pointData, newPointData,
-                                          pts[j - 1], idList, projRef, this->InterpolationDistance, 1);
+                        CreateInterPoints(p1, projP1, p2, projP2, extent, &buffer, pts[j - 1], idList, threadProjRef,
+                                          this->InterpolationDistance, 1);
                         idList->InsertNextId(pts[j]);
 
                         auto idList2 = vtkSmartPointer<vtkIdList>::New();
@@ -1849,21 +2326,18 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                         projSecondP1[0] = 1.0 - projP1[0];
                         projSecondP1[1] = projP1[1];
                         projSecondP1[2] = projP1[2];
-                        secondPt = newPoints->InsertNextPoint(projSecondP1);
-                        newPointData->CopyData(pointData, pts[j - 1], secondPt);
+                        secondPt = buffer.InsertNextPoint(projSecondP1, pts[j - 1]);
                         idList2->InsertNextId(secondPt);
 
                         projSecondP2[0] = 1.0 - projP2[0];
                         projSecondP2[1] = projP2[1];
                         projSecondP2[2] = projP2[2];
-                        secondPt = newPoints->InsertNextPoint(projSecondP2);
-                        newPointData->CopyData(pointData, pts[j], secondPt);
-                        CreateInterPoints(p1, projSecondP1, p2, projSecondP2, extent, newPoints, pointData,
-                                          newPointData, pts[j - 1], idList2, projRef, this->InterpolationDistance, 1);
+                        secondPt = buffer.InsertNextPoint(projSecondP2, pts[j]);
+                        CreateInterPoints(p1, projSecondP1, p2, projSecondP2, extent, &buffer, pts[j - 1], idList2,
+                                          threadProjRef, this->InterpolationDistance, 1);
                         idList2->InsertNextId(secondPt);
 
-                        newCellId = output->InsertNextCell(VTK_LINE, idList2);
-                        newCellData->CopyData(cellData, cellId, newCellId);
+                        buffer.InsertNextCell(idList2, cellId);
                     }
                     else
                     {
@@ -1905,6 +2379,8 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                             // points are on different sides of the cutting edge ->
                             // introduce extra points at cutting edge (both sides);
                             // terminate this Line and start a new one
+                            PJ_COORD projLPData;
+                            PJ_COORD projXYData;
                             vtkIdType edgePt;
                             double edge[3];
                             double projEdgeP1[3];
@@ -1916,7 +2392,7 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                             edge[2] = (p1[2] + p2[2]) / 2;
                             projLPData.lp.lam = edge[0] * DEG_TO_RAD;
                             projLPData.lp.phi = edge[1] * DEG_TO_RAD;
-                            projXYData = proj_trans(projRef, PJ_FWD, projLPData);
+                            projXYData = proj_trans(threadProjRef, PJ_FWD, projLPData);
                             projEdgeP1[0] = (projXYData.xy.x - extent[0]) / (extent[1] - extent[0]);
                             projEdgeP1[1] = (projXYData.xy.y - extent[2]) / (extent[3] - extent[2]);
                             projEdgeP1[2] = edge[2];
@@ -1931,27 +2407,24 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                             {
                                 projEdgeP2[0] = 1.0 - projEdgeP2[0];
                             }
-                            edgePt = newPoints->InsertNextPoint(projEdgeP1);
-                            newPointData->CopyData(pointData, pts[j - 1], edgePt);
-                            CreateInterPoints(p1, projP1, edge, projEdgeP1, extent, newPoints, pointData, newPointData,
-                                              pts[j - 1], idList, projRef, this->InterpolationDistance, 1);
+                            edgePt = buffer.InsertNextPoint(projEdgeP1, pts[j - 1]);
+                            CreateInterPoints(p1, projP1, edge, projEdgeP1, extent, &buffer, pts[j - 1], idList,
+                                              threadProjRef, this->InterpolationDistance, 1);
                             idList->InsertNextId(edgePt);
 
-                            newCellId = output->InsertNextCell(VTK_LINE, idList);
-                            newCellData->CopyData(cellData, cellId, newCellId);
+                            buffer.InsertNextCell(idList, cellId);
 
                             idList->Reset();
 
-                            edgePt = newPoints->InsertNextPoint(projEdgeP2);
-                            newPointData->CopyData(pointData, pts[j], edgePt);
+                            edgePt = buffer.InsertNextPoint(projEdgeP2, pts[j]);
                             idList->InsertNextId(edgePt);
-                            CreateInterPoints(edge, projEdgeP2, p2, projP2, extent, newPoints, pointData, newPointData,
-                                              pts[j], idList, projRef, this->InterpolationDistance, 1);
+                            CreateInterPoints(edge, projEdgeP2, p2, projP2, extent, &buffer, pts[j], idList,
+                                              threadProjRef, this->InterpolationDistance, 1);
                         }
                         else
                         {
-                            CreateInterPoints(p1, projP1, p2, projP2, extent, newPoints, pointData, newPointData,
-                                              pts[j - 1], idList, projRef, this->InterpolationDistance, 1);
+                            CreateInterPoints(p1, projP1, p2, projP2, extent, &buffer, pts[j - 1], idList,
+                                              threadProjRef, this->InterpolationDistance, 1);
                         }
                         idList->InsertNextId(pts[j]);
                     }
@@ -1966,47 +2439,45 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
 
                 if (idList->GetNumberOfIds() > 1)
                 {
-                    newCellId = output->InsertNextCell(VTK_LINE, idList);
-                    newCellData->CopyData(cellData, cellId, newCellId);
+                    buffer.InsertNextCell(idList, cellId);
                 }
             }
-        }
+        };
+
+        ProcessCellsInChunks(lines, projectedPoints, buffers, processLine);
+        AppendCellBuffers(buffers, output, VTK_LINE, pointData, cellData);
     }
 
     // Polys need to be divided into sub-polys if they cross a projection boundary
     if (polys->GetNumberOfCells() > 0)
     {
         auto newPolys = vtkSmartPointer<vtkCellArray>::New();
-        vtkIdList *idList[2];
-        vtkIdType numPolys;
-        vtkIdType cellId;
+        std::vector<vtkProjFilterCellBuffer> buffers;
+        // list 0 is for polys where the first point is in the range
+        // [cuttingLongitude, CenterLongitude] or [CenterLongitude, cuttingLongitude]
+        // (depending on which of the two longitudes is the smallest)
+        // list 1 is for the other polys
+        vtkSMPThreadLocalObject<vtkIdList> threadIdList[2];
 
         // initialize newCellData for CopyData invocations
         newCellData->CopyAllocate(cellData);
 
         output->SetPolys(newPolys);
-        numPolys = polys->GetNumberOfCells();
-
-        // list 0 is for polys where the first point is in the range
-        // [cuttingLongitude, CenterLongitude] or [CenterLongitude, cuttingLongitude]
-        // (depending on which of the two longitudes is the smallest)
-        // list 1 is for the other polys
-        idList[0] = vtkIdList::New();
-        idList[0]->Allocate(1000);
-        idList[1] = vtkIdList::New();
-        idList[1]->Allocate(1000);
 
-        polys->InitTraversal();
-        for (cellId = 0; cellId < numPolys; cellId++)
+        auto processPoly = [&](vtkProjFilterCellBuffer &buffer, vtkIdType cellId, vtkIdType npts,
+                               vtkIdType const *pts)
         {
-            vtkIdType npts;
-            vtkIdType const *pts;
+            PJ *threadProjRef = threadProjection.Local().GetProjection(numParameters, parameters);
+            vtkIdList *idList[2] = { threadIdList[0].Local(), threadIdList[1].Local() };
 
-            polys->GetNextCell(npts, pts);
+            if (threadProjRef == nullptr)
+            {
+                projectionFailed = true;
+                return;
+            }
 
             if (npts > 0)
             {
-                vtkIdType newCellId;
                 int currentList;
                 int leftSide[2];
                 // We need to keep track of the unprojected first and last point
@@ -2019,7 +2490,7 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                 int j;
 
                 points->GetPoint(pts[0], p1);
-                newPoints->GetPoint(pts[0], projP1);
+                buffer.GetPoint(pts[0], projP1);
                 while (p1[0] >= 180)
                 {
                     p1[0] -= 360;
@@ -2053,7 +2524,7 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                     int splitPolySegment = 0;
 
                     points->GetPoint(pts[j == npts ? 0 : j], p2);
-                    newPoints->GetPoint(pts[j == npts ? 0 : j], projP2);
+                    buffer.GetPoint(pts[j == npts ? 0 : j], projP2);
                     while (p2[0] >= 180)
                     {
                         p2[0] -= 360;
@@ -2095,6 +2566,8 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                     {
                         // points are on different sides of the cutting edge ->
                         // introduce extra points at both sides (in projected space) of cutting edge
+                        PJ_COORD projLPData;
+                        PJ_COORD projXYData;
                         double edge[3];
                         double projEdgeP1[3];
                         double projEdgeP2[3];
@@ -2106,7 +2579,7 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                         edge[2] = (p1[2] + p2[2]) / 2;
                         projLPData.lp.lam = edge[0] * DEG_TO_RAD;
                         projLPData.lp.phi = edge[1] * DEG_TO_RAD;
-                        projXYData = proj_trans(projRef, PJ_FWD, projLPData);
+                        projXYData = proj_trans(threadProjRef, PJ_FWD, projLPData);
                         projEdgeP1[0] = (projXYData.xy.x - extent[0]) / (extent[1] - extent[0]);
                         projEdgeP1[1] = (projXYData.xy.y - extent[2]) / (extent[3] - extent[2]);
                         projEdgeP1[2] = edge[2];
@@ -2121,10 +2594,9 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                         {
                             projEdgeP2[0] = 1.0 - projEdgeP2[0];
                         }
-                        edgePt = newPoints->InsertNextPoint(projEdgeP1);
-                        newPointData->CopyData(pointData, pts[j - 1], edgePt);
-                        CreateInterPoints(p1, projP1, edge, projEdgeP1, extent, newPoints, pointData, newPointData,
-                                          pts[j - 1], idList[currentList], projRef, this->InterpolationDistance, 1);
+                        edgePt = buffer.InsertNextPoint(projEdgeP1, pts[j - 1]);
+                        CreateInterPoints(p1, projP1, edge, projEdgeP1, extent, &buffer, pts[j - 1],
+                                          idList[currentList], threadProjRef, this->InterpolationDistance, 1);
                         idList[currentList]->InsertNextId(edgePt);
 
                         if ((currentList == 0 && leftSide[1]) || (currentList == 1 && !leftSide[1]))
@@ -2142,7 +2614,7 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                             polar[2] = edge[2];
                             projLPData.lp.lam = polar[0] * DEG_TO_RAD;
                             projLPData.lp.phi = polar[1] * DEG_TO_RAD;
-                            projXYData = proj_trans(projRef, PJ_FWD, projLPData);
+                            projXYData = proj_trans(threadProjRef, PJ_FWD, projLPData);
                             projPolarP1[0] = (projXYData.xy.x - extent[0]) / (extent[1] - extent[0]);
                             projPolarP1[1] = (projXYData.xy.y - extent[2]) / (extent[3] - extent[2]);
                             projPolarP1[2] = projEdgeP1[2];
@@ -2157,16 +2629,13 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                             {
                                 projPolarP2[0] = 1.0 - projPolarP2[0];
                             }
-                            polarPt = newPoints->InsertNextPoint(projPolarP1);
-                            newPointData->CopyData(pointData, pts[j - 1], polarPt);
-                            CreateInterPoints(edge, projEdgeP1, polar, projPolarP1, extent, newPoints, pointData,
-                                              newPointData, pts[j - 1], idList[currentList], projRef,
-                                              this->InterpolationDistance, 1);
+                            polarPt = buffer.InsertNextPoint(projPolarP1, pts[j - 1]);
+                            CreateInterPoints(edge, projEdgeP1, polar, projPolarP1, extent, &buffer, pts[j - 1],
+                                              idList[currentList], threadProjRef, this->InterpolationDistance, 1);
                             idList[currentList]->InsertNextId(polarPt);
-                            polarPt = newPoints->InsertNextPoint(projPolarP2);
-                            newPointData->CopyData(pointData, pts[j == npts ? 0 : j], polarPt);
-                            CreateInterPoints(polar, projPolarP2, edge, projEdgeP2, extent, newPoints, pointData,
-                                              newPointData, pts[j == npts ? 0 : j], idList[currentList], projRef,
+                            polarPt = buffer.InsertNextPoint(projPolarP2, pts[j == npts ? 0 : j]);
+                            CreateInterPoints(polar, projPolarP2, edge, projEdgeP2, extent, &buffer,
+                                              pts[j == npts ? 0 : j], idList[currentList], threadProjRef,
                                               this->InterpolationDistance, 1);
                             idList[currentList]->InsertNextId(polarPt);
                         }
@@ -2189,24 +2658,22 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                                 vtkIdType lastid;
                                 double projLastP[3];
                                 lastid = idList[currentList]->GetId(idList[currentList]->GetNumberOfIds() - 1);
-                                newPoints->GetPoint(lastid, projLastP);
+                                buffer.GetPoint(lastid, projLastP);
                                 CreateInterPoints(listLastP[currentList], projLastP, edge, projEdgeP2, extent,
-                                                  newPoints, pointData, newPointData, lastid, idList[currentList],
-                                                  projRef, this->InterpolationDistance, 1);
+                                                  &buffer, lastid, idList[currentList], threadProjRef,
+                                                  this->InterpolationDistance, 1);
                             }
                         }
 
-                        edgePt = newPoints->InsertNextPoint(projEdgeP2);
-                        newPointData->CopyData(pointData, pts[j == npts ? 0 : j], edgePt);
+                        edgePt = buffer.InsertNextPoint(projEdgeP2, pts[j == npts ? 0 : j]);
                         idList[currentList]->InsertNextId(edgePt);
-                        CreateInterPoints(edge, projEdgeP2, p2, projP2, extent, newPoints, pointData, newPointData,
-                                          pts[j == npts ? 0 : j], idList[currentList], projRef,
-                                          this->InterpolationDistance, 1);
+                        CreateInterPoints(edge, projEdgeP2, p2, projP2, extent, &buffer, pts[j == npts ? 0 : j],
+                                          idList[currentList], threadProjRef, this->InterpolationDistance, 1);
                     }
                     else
                     {
-                        CreateInterPoints(p1, projP1, p2, projP2, extent, newPoints, pointData, newPointData,
-                                          pts[j - 1], idList[currentList], projRef, this->InterpolationDistance, 1);
+                        CreateInterPoints(p1, projP1, p2, projP2, extent, &buffer, pts[j - 1], idList[currentList],
+                                          threadProjRef, this->InterpolationDistance, 1);
                     }
 
                     idList[currentList]->InsertNextId(pts[j == npts ? 0 : j]);
@@ -2234,17 +2701,15 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                     {
                         double projFirstP[3];
                         double projLastP[3];
-                        newPoints->GetPoint(id1, projFirstP);
-                        newPoints->GetPoint(id2, projLastP);
+                        buffer.GetPoint(id1, projFirstP);
+                        buffer.GetPoint(id2, projLastP);
                         if (listFirstP[0][0] != listLastP[0][0] || listFirstP[0][1] != listLastP[0][1])
                         {
-                            CreateInterPoints(listLastP[0], projLastP, listFirstP[0], projFirstP, extent, newPoints,
-                                              pointData, newPointData, id2, idList[0], projRef,
-                                              this->InterpolationDistance, 1);
+                            CreateInterPoints(listLastP[0], projLastP, listFirstP[0], projFirstP, extent, &buffer,
+                                              id2, idList[0], threadProjRef, this->InterpolationDistance, 1);
                         }
                     }
-                    newCellId = output->InsertNextCell(VTK_POLYGON, idList[0]);
-                    newCellData->CopyData(cellData, cellId, newCellId);
+                    buffer.InsertNextCell(idList[0], cellId);
                 }
                 if (idList[1]->GetNumberOfIds() > 1)
                 {
@@ -2257,23 +2722,25 @@ void vtkProjFilter::PerformCylindricalProjection(vtkPolyData *input)
                     {
                         double projFirstP[3];
                         double projLastP[3];
-                        newPoints->GetPoint(id1, projFirstP);
-                        newPoints->GetPoint(id2, projLastP);
+                        buffer.GetPoint(id1, projFirstP);
+                        buffer.GetPoint(id2, projLastP);
                         if (listFirstP[1][0] != listLastP[1][0] || listFirstP[1][1] != listLastP[1][1])
                         {
-                            CreateInterPoints(listLastP[1], projLastP, listFirstP[1], projFirstP, extent, newPoints,
-                                              pointData, newPointData, id2, idList[1], projRef,
-                                              this->InterpolationDistance, 1);
+                            CreateInterPoints(listLastP[1], projLastP, listFirstP[1], projFirstP, extent, &buffer,
+                                              id2, idList[1], threadProjRef, this->InterpolationDistance, 1);
                         }
                     }
-                    newCellId = output->InsertNextCell(VTK_POLYGON, idList[1]);
-                    newCellData->CopyData(cellData, cellId, newCellId);
+                    buffer.InsertNextCell(idList[1], cellId);
                 }
             }
-        }
-        idList[0]->Delete();
-        idList[1]->Delete();
+        };
+
+        ProcessCellsInChunks(polys, projectedPoints, buffers, processPoly);
+        AppendCellBuffers(buffers, output, VTK_POLYGON, pointData, cellData);
     }
 
-    proj_destroy(projRef);
+    if (projectionFailed)
+    {
+        vtkErrorMacro(<< "Could not initialize PROJ library");
+    }
 }
@@ -37,6 +37,9 @@
 
 #include <vector>
 
+class vtkDataArray;
+class vtkDoubleArray;
+
 // (Pseudo) Cylindrical projections:
 // - Lambert Cylindrical Equal Area
 #define VTK_PROJ_LAMBERT_CYLINDRICAL        1
@@ -133,6 +136,26 @@ class VISANPLOT_EXPORT vtkProjFilter : public vtkPolyDataAlgorithm
         vtkSetMacro(AzimuthalIgnorePolyDistance, double);
         vtkGetMacro(AzimuthalIgnorePolyDistance, double);
 
+        // Description:
+        // Projected outputs are kept in a cache so that switching back to a
+        // projection (or projection center) that was used before does not
+        // require the projection to be performed again. Cache entries are keyed
+        // on the filter, the input, its modification time, and all projection
+        // properties. The cache is shared by all vtkProjFilter instances of the
+        // process, so CacheSize is the maximum amount of memory (in kibibytes)
+        // that all cached outputs together may use; least recently used entries
+        // are removed first. An output that is larger than CacheSize is not
+        // cached. The projected swath of a full TROPOMI orbit (about 2 million
+        // pixels) takes about 200MiB, so the default of 524288 (i.e. 512MiB)
+        // keeps such an orbit for two projections (plus the much smaller
+        // coastlines and grid lines). A value of 0 disables the cache.
+        static void SetCacheSize(unsigned long size);
+        static unsigned long GetCacheSize();
+
+        // Description:
+        // Remove all projected outputs from the cache (of all filters).
+        static void ClearCache();
+
         // Description:
         // Get X/Y ratio of the current projection.
         double GetXYRatio();
@@ -147,8 +170,17 @@ class VISANPLOT_EXPORT vtkProjFilter : public vtkPolyDataAlgorithm
         static std::vector<double> NormalizedDeprojection2D(int projection, double centerLat, double centerLon,
                                                             double x, double y);
 
+        // Description:
+        // Array versions of NormalizedProjection2D and NormalizedDeprojection2D.
+        // The output arrays are resized to the number of input coordinates.
+        static void NormalizedProjection2D(int projection, double centerLat, double centerLon, vtkDataArray *lat,
+                                           vtkDataArray *lon, vtkDoubleArray *x, vtkDoubleArray *y);
+        static void NormalizedDeprojection2D(int projection, double centerLat, double centerLon, vtkDataArray *x,
+                                             vtkDataArray *y, vtkDoubleArray *lat, vtkDoubleArray *lon);
+
     protected:
         vtkProjFilter();
+        ~vtkProjFilter() override;
 
         int RequestData(vtkInformation* request, vtkInformationVector** inputVector,
                         vtkInformationVector* outputVector) override;
@@ -52,8 +52,8 @@ class VISANPLOT_EXPORT vtkWorldPlotData : public vtkObject
 
         static vtkWorldPlotData *New();
 
-        void SetKeyframe(int keyframe);
-        int GetNumberOfKeyframes();
+        virtual void SetKeyframe(int keyframe);
+        virtual int GetNumberOfKeyframes();
 
         void SetProjection(int projection);
         int GetProjection();
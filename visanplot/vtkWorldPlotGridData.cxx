@@ -34,11 +34,10 @@
 #include "vtkWorldPlotGridData.h"
 
 #include "vtkColorTable.h"
-#include "vtkCollection.h"
 #include "vtkDoubleArray.h"
 #include "vtkGeoMapFilter.h"
 #include "vtkMath.h"
-#include "vtkShortArray.h"
+#include "vtkProjFilter.h"
 
 vtkStandardNewMacro(vtkWorldPlotGridData);
 
@@ -48,14 +47,23 @@ vtkWorldPlotGridData::vtkWorldPlotGridData()
     this->heightFactor = 0.0;
     this->minHeightValue = 0.0;
     this->maxHeightValue = 0.0;
+    this->keyframeCacheSize = 16;
+    this->currentKeyframe = 0;
 }
 
 
 void vtkWorldPlotGridData::AddData(vtkDoubleArray *latitude, vtkDoubleArray *longitude, vtkDoubleArray *data)
 {
-    auto value = vtkSmartPointer<vtkDoubleArray>::New();
-    auto bitarray = vtkSmartPointer<vtkShortArray>::New();
-    auto geoMapFilter = vtkSmartPointer<vtkGeoMapFilter>::New();
+    this->AddKeyframes(latitude, longitude, data, 1);
+}
+
+void vtkWorldPlotGridData::AddKeyframes(vtkDoubleArray *latitude, vtkDoubleArray *longitude, vtkDoubleArray *data,
+                                        int numKeyframes)
+{
+    double finiteRange[2];
+    double *value;
+    vtkIdType numValues;
+    vtkIdType i;
 
     int width = longitude->GetNumberOfTuples();
     int height = latitude->GetNumberOfTuples();
@@ -69,29 +77,51 @@ void vtkWorldPlotGridData::AddData(vtkDoubleArray *latitude, vtkDoubleArray *lon
         vtkErrorMacro("Grid height should be > 1");
         return;
     }
-    if (data->GetNumberOfTuples() != width * height)
+    if (numKeyframes < 1)
+    {
+        vtkErrorMacro("Number of keyframes should be > 0");
+        return;
+    }
+    numValues = (vtkIdType)numKeyframes * width * height;
+    if (data->GetNumberOfTuples() != numValues)
     {
         vtkErrorMacro("Number of items in grid data does not match dimensions");
         return;
     }
 
-    geoMapFilter->SetValues(data);
-    geoMapFilter->SetHeights(data);
-    geoMapFilter->SetLongitudes(longitude);
-    geoMapFilter->SetLatitudes(latitude);
-    geoMapFilter->SetFactor(0);
-    geoMapFilter->SetRadius(this->GetReferenceHeight());
-    geoMapFilter->SetMapWidth(width);
-    geoMapFilter->SetMapHeight(height);
-
-    this->AddInputConnection(geoMapFilter->GetOutputPort());
+    // determine the range of the complete block in a single pass
+    finiteRange[0] = VTK_DOUBLE_MAX;
+    finiteRange[1] = VTK_DOUBLE_MIN;
+    value = data->GetPointer(0);
+    for (i = 0; i < numValues; i++)
+    {
+        if (vtkMath::IsFinite(value[i]))
+        {
+            if (value[i] < finiteRange[0])
+            {
+                finiteRange[0] = value[i];
+            }
+            if (value[i] > finiteRange[1])
+            {
+                finiteRange[1] = value[i];
+            }
+        }
+    }
+    for (i = 0; i < numKeyframes; i++)
+    {
+        this->keyframeLatitudes.push_back(latitude);
+        this->keyframeLongitudes.push_back(longitude);
+        this->keyframeData.push_back(data);
+        this->keyframeDataOffset.push_back(i * width * height);
+        this->keyframeFilters.push_back(nullptr);
+    }
 
-    double *finiteRange = data->GetFiniteRange();
-    if (this->algorithms->GetNumberOfItems() == 1)
+    if (this->GetNumberOfKeyframes() == numKeyframes)
     {
         this->SetMinHeightValue(finiteRange[0]);
         this->SetMaxHeightValue(finiteRange[1]);
         this->colorTable->SetColorRange(this->minHeightValue, this->maxHeightValue);
+        this->SetKeyframe(0);
     }
     else
     {
@@ -106,27 +136,120 @@ void vtkWorldPlotGridData::AddData(vtkDoubleArray *latitude, vtkDoubleArray *lon
     }
 }
 
-void vtkWorldPlotGridData::SetReferenceHeight(double referenceHeight)
+void vtkWorldPlotGridData::SetKeyframe(int keyframe)
+{
+    if (this->keyframeFilters.empty())
+    {
+        return;
+    }
+    if (keyframe >= this->GetNumberOfKeyframes())
+    {
+        keyframe = this->GetNumberOfKeyframes() - 1;
+    }
+    if (keyframe < 0)
+    {
+        keyframe = 0;
+    }
+    this->currentKeyframe = keyframe;
+    this->filter->SetInputConnection(this->GetKeyframeFilter(keyframe)->GetOutputPort());
+}
+
+int vtkWorldPlotGridData::GetNumberOfKeyframes()
+{
+    return static_cast<int>(this->keyframeFilters.size());
+}
+
+void vtkWorldPlotGridData::PrefetchKeyframe(int keyframe)
+{
+    if (keyframe < 0 || keyframe >= this->GetNumberOfKeyframes())
+    {
+        return;
+    }
+    this->GetKeyframeFilter(keyframe)->Update();
+}
+
+void vtkWorldPlotGridData::SetKeyframeCacheSize(int size)
+{
+    if (size < 1)
+    {
+        size = 1;
+    }
+    this->keyframeCacheSize = size;
+    this->ReduceKeyframeCache();
+}
+
+int vtkWorldPlotGridData::GetKeyframeCacheSize()
+{
+    return this->keyframeCacheSize;
+}
+
+vtkGeoMapFilter *vtkWorldPlotGridData::GetKeyframeFilter(int keyframe)
+{
+    if (this->keyframeFilters[keyframe] == nullptr)
+    {
+        auto geoMapFilter = vtkSmartPointer<vtkGeoMapFilter>::New();
+        auto values = vtkSmartPointer<vtkDoubleArray>::New();
+        int width = this->keyframeLongitudes[keyframe]->GetNumberOfTuples();
+        int height = this->keyframeLatitudes[keyframe]->GetNumberOfTuples();
+
+        // the values reference the data block (no copy is made)
+        values->SetArray(this->keyframeData[keyframe]->GetPointer(this->keyframeDataOffset[keyframe]),
+                         (vtkIdType)width * height, 1);
+
+        geoMapFilter->SetValues(values);
+        geoMapFilter->SetHeights(values);
+        geoMapFilter->SetLongitudes(this->keyframeLongitudes[keyframe]);
+        geoMapFilter->SetLatitudes(this->keyframeLatitudes[keyframe]);
+        geoMapFilter->SetFactor(this->heightFactor);
+        geoMapFilter->SetRadius(this->GetReferenceHeight());
+        geoMapFilter->SetMinMappedValue(this->minHeightValue);
+        geoMapFilter->SetMaxMappedValue(this->maxHeightValue);
+        geoMapFilter->SetMapWidth(width);
+        geoMapFilter->SetMapHeight(height);
+
+        this->keyframeFilters[keyframe] = geoMapFilter;
+    }
+    else
+    {
+        this->cachedKeyframes.remove(keyframe);
+    }
+    this->cachedKeyframes.push_front(keyframe);
+    this->ReduceKeyframeCache();
+
+    return this->keyframeFilters[keyframe];
+}
+
+void vtkWorldPlotGridData::ReduceKeyframeCache()
 {
-    vtkGeoMapFilter *algorithm;
+    auto it = this->cachedKeyframes.end();
+
+    while ((int)this->cachedKeyframes.size() > this->keyframeCacheSize && it != this->cachedKeyframes.begin())
+    {
+        --it;
+        // never remove the keyframe that is currently shown
+        if (*it != this->currentKeyframe)
+        {
+            this->keyframeFilters[*it] = nullptr;
+            it = this->cachedKeyframes.erase(it);
+        }
+    }
+}
 
+void vtkWorldPlotGridData::SetReferenceHeight(double referenceHeight)
+{
     vtkWorldPlotData::SetReferenceHeight(referenceHeight);
-    this->algorithms->InitTraversal();
-    while ((algorithm = vtkGeoMapFilter::SafeDownCast(this->algorithms->GetNextItemAsObject())) != 0)
+    for (int keyframe : this->cachedKeyframes)
     {
-        algorithm->SetRadius(referenceHeight);
+        this->keyframeFilters[keyframe]->SetRadius(referenceHeight);
     }
 }
 
 void vtkWorldPlotGridData::SetHeightFactor(double heightFactor)
 {
-    vtkGeoMapFilter *algorithm;
-
     this->heightFactor = heightFactor;
-    this->algorithms->InitTraversal();
-    while ((algorithm = vtkGeoMapFilter::SafeDownCast(this->algorithms->GetNextItemAsObject())) != 0)
+    for (int keyframe : this->cachedKeyframes)
     {
-        algorithm->SetFactor(heightFactor);
+        this->keyframeFilters[keyframe]->SetFactor(heightFactor);
     }
 }
 
@@ -137,13 +260,10 @@ double vtkWorldPlotGridData::GetHeightFactor()
 
 void vtkWorldPlotGridData::SetMinHeightValue(double minValue)
 {
-    vtkGeoMapFilter *algorithm;
-
     this->minHeightValue = minValue;
-    this->algorithms->InitTraversal();
-    while ((algorithm = vtkGeoMapFilter::SafeDownCast(this->algorithms->GetNextItemAsObject())) != 0)
+    for (int keyframe : this->cachedKeyframes)
     {
-        algorithm->SetMinMappedValue(minValue);
+        this->keyframeFilters[keyframe]->SetMinMappedValue(minValue);
     }
 }
 
@@ -154,13 +274,10 @@ double vtkWorldPlotGridData::GetMinHeightValue()
 
 void vtkWorldPlotGridData::SetMaxHeightValue(double maxValue)
 {
-    vtkGeoMapFilter *algorithm;
-
     this->maxHeightValue = maxValue;
-    this->algorithms->InitTraversal();
-    while ((algorithm = vtkGeoMapFilter::SafeDownCast(this->algorithms->GetNextItemAsObject())) != 0)
+    for (int keyframe : this->cachedKeyframes)
     {
-        algorithm->SetMaxMappedValue(maxValue);
+        this->keyframeFilters[keyframe]->SetMaxMappedValue(maxValue);
     }
 }
 
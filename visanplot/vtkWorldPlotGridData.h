@@ -35,6 +35,9 @@
 #include "vtkWorldPlotData.h"
 #include "visanplotModule.h"
 
+#include <list>
+#include <vector>
+
 class vtkDoubleArray;
 class vtkGeoMapFilter;
 
@@ -47,6 +50,25 @@ class VISANPLOT_EXPORT vtkWorldPlotGridData : public vtkWorldPlotData
 
         void AddData(vtkDoubleArray *latitude, vtkDoubleArray *longitude, vtkDoubleArray *data);
 
+        // Add a block of grids at once.
+        // The data array should contain numKeyframes * height * width values (stored grid after grid).
+        // The data is not copied; each keyframe references its own part of the block.
+        void AddKeyframes(vtkDoubleArray *latitude, vtkDoubleArray *longitude, vtkDoubleArray *data,
+                          int numKeyframes);
+
+        // The geometry for a keyframe is only created when the keyframe is shown for the first time (or when it is
+        // prefetched) and is kept in a cache with a limited number of keyframes (least recently used keyframes are
+        // removed first).
+        void SetKeyframe(int keyframe) override;
+        int GetNumberOfKeyframes() override;
+
+        // Create the geometry for a keyframe in advance (e.g. for the next keyframe of an animation)
+        void PrefetchKeyframe(int keyframe);
+
+        // Set/Get the maximum number of keyframes for which the geometry is kept in memory (default: 16)
+        void SetKeyframeCacheSize(int size);
+        int GetKeyframeCacheSize();
+
         void SetReferenceHeight(double referenceHeight) override;
 
         void SetHeightFactor(double heightFactor) override;
@@ -60,10 +82,26 @@ class VISANPLOT_EXPORT vtkWorldPlotGridData : public vtkWorldPlotData
     protected:
         vtkWorldPlotGridData();
 
+        vtkGeoMapFilter *GetKeyframeFilter(int keyframe);
+        void ReduceKeyframeCache();
+
         double heightFactor;
         double minHeightValue;
         double maxHeightValue;
 
+        // For each keyframe the grid axes, the data block and the offset of the grid within the block
+        std::vector<vtkSmartPointer<vtkDoubleArray>> keyframeLatitudes;
+        std::vector<vtkSmartPointer<vtkDoubleArray>> keyframeLongitudes;
+        std::vector<vtkSmartPointer<vtkDoubleArray>> keyframeData;
+        std::vector<vtkIdType> keyframeDataOffset;
+
+        // The geometry filters of the cached keyframes (null for keyframes that are not in the cache)
+        std::vector<vtkSmartPointer<vtkGeoMapFilter>> keyframeFilters;
+        // The cached keyframes, most recently used first
+        std::list<int> cachedKeyframes;
+        int keyframeCacheSize;
+        int currentKeyframe;
+
     private:
         vtkWorldPlotGridData(const vtkWorldPlotGridData&) = delete;
         void operator=(const vtkWorldPlotGridData&) = delete;
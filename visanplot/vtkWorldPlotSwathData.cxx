@@ -38,9 +38,11 @@
 #include "vtkCellData.h"
 #include "vtkColorTable.h"
 #include "vtkDoubleArray.h"
+#include "vtkIdTypeArray.h"
 #include "vtkPoints.h"
 #include "vtkPolyData.h"
 #include "vtkPolyDataCollection.h"
+#include "vtkSMPTools.h"
 
 vtkStandardNewMacro(vtkWorldPlotSwathData);
 
@@ -75,7 +77,6 @@ void vtkWorldPlotSwathData::AddData(vtkDoubleArray *cornerLatitude, vtkDoubleArr
     auto polys = vtkSmartPointer<vtkCellArray>::New();
     int numSwaths;
     int numValues;
-    int i;
 
     if (cornerLatitude->GetNumberOfComponents() != 4 || cornerLongitude->GetNumberOfComponents() != 4)
     {
@@ -103,37 +104,50 @@ void vtkWorldPlotSwathData::AddData(vtkDoubleArray *cornerLatitude, vtkDoubleArr
     }
 
     numSwaths = cornerLatitude->GetNumberOfTuples();
-    points->SetDataTypeToDouble();
-    points->SetNumberOfPoints(4 * numSwaths);
-    for (i = 0; i < numSwaths; i++)
-    {
-        double latitude[4];
-        double longitude[4];
-
-        cornerLatitude->GetTuple(i, latitude);
-        cornerLongitude->GetTuple(i, longitude);
 
-        points->SetPoint(i * 4 + 0, longitude[0], latitude[0], 0);
-        points->SetPoint(i * 4 + 1, longitude[1], latitude[1], 0);
-        points->SetPoint(i * 4 + 2, longitude[2], latitude[2], 0);
-        points->SetPoint(i * 4 + 3, longitude[3], latitude[3], 0);
+    // The points, offsets and connectivity arrays are filled directly in a single pass over the corner arrays
+    // (in parallel if VTK was built with an SMP backend)
+    auto pointData = vtkSmartPointer<vtkDoubleArray>::New();
+    auto offsets = vtkSmartPointer<vtkIdTypeArray>::New();
+    auto connectivity = vtkSmartPointer<vtkIdTypeArray>::New();
+    pointData->SetNumberOfComponents(3);
+    pointData->SetNumberOfTuples(4 * (vtkIdType)numSwaths);
+    offsets->SetNumberOfTuples((vtkIdType)numSwaths + 1);
+    connectivity->SetNumberOfTuples(4 * (vtkIdType)numSwaths);
+
+    const double *latitude = cornerLatitude->GetPointer(0);
+    const double *longitude = cornerLongitude->GetPointer(0);
+    double *point = pointData->GetPointer(0);
+    vtkIdType *offset = offsets->GetPointer(0);
+    vtkIdType *pointId = connectivity->GetPointer(0);
+
+    vtkSMPTools::For(0, numSwaths, [&](vtkIdType first, vtkIdType last)
+    {
+        vtkIdType i;
+        int j;
 
-        polys->InsertNextCell(4);
-        if (isBackscan(longitude, latitude))
+        for (i = first; i < last; i++)
         {
-            polys->InsertCellPoint(i * 4 + 3);
-            polys->InsertCellPoint(i * 4 + 2);
-            polys->InsertCellPoint(i * 4 + 1);
-            polys->InsertCellPoint(i * 4 + 0);
+            const double *swathLatitude = &latitude[4 * i];
+            const double *swathLongitude = &longitude[4 * i];
+            int backscan = isBackscan(swathLongitude, swathLatitude);
+
+            for (j = 0; j < 4; j++)
+            {
+                point[12 * i + 3 * j + 0] = swathLongitude[j];
+                point[12 * i + 3 * j + 1] = swathLatitude[j];
+                point[12 * i + 3 * j + 2] = 0;
+                // backscan pixels have their corners in reverse order
+                pointId[4 * i + j] = 4 * i + (backscan ? 3 - j : j);
+            }
+            offset[i] = 4 * i;
         }
-        else
-        {
-            polys->InsertCellPoint(i * 4 + 0);
-            polys->InsertCellPoint(i * 4 + 1);
-            polys->InsertCellPoint(i * 4 + 2);
-            polys->InsertCellPoint(i * 4 + 3);
-        }
-    }
+    });
+    offset[numSwaths] = 4 * (vtkIdType)numSwaths;
+
+    points->SetDataTypeToDouble();
+    points->SetData(pointData);
+    polys->SetData(offsets, connectivity);
     swaths->SetPoints(points);
     swaths->SetPolys(polys);
 
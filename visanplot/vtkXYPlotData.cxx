@@ -31,107 +31,340 @@
 
 #include "vtkXYPlotData.h"
 
-#include "vtkCollection.h"
-#include "vtkDoubleArray.h"
+#include "vtkDataArray.h"
+#include "vtkMath.h"
+#include "vtkPoints.h"
 
-vtkStandardNewMacro(vtkXYPlotData);
+#include <algorithm>
+#include <math.h>
 
-vtkXYPlotData::vtkXYPlotData()
+// Number of items in a block at the finest level of the level of detail index
+#define LOD_BLOCK_SIZE 64
+
+class vtkXYPlotDataLevelOfDetailIndex
 {
-    this->xrange[0] = 1;
-    this->xrange[1] = 0;
-    this->yrange[0] = 1;
-    this->yrange[1] = 0;
-    this->xrangeAbove0[0] = 1;
-    this->xrangeAbove0[1] = 0;
-    this->yrangeAbove0[0] = 1;
-    this->yrangeAbove0[1] = 0;
-    this->pointSet = vtkSmartPointer<vtkCollection>::New();
-    this->currentPoints = nullptr;
-}
+    public:
+        vtkXYPlotDataLevelOfDetailIndex(vtkXYPlotData *plotData);
+
+        // Find the items with the minimum and maximum y value in the range [first, last)
+        void GetMinMaxItem(vtkXYPlotData *plotData, vtkIdType first, vtkIdType last, vtkIdType &minItem,
+                           vtkIdType &maxItem);
 
-void vtkXYPlotData::AddData(vtkDoubleArray *xdata, vtkDoubleArray *ydata)
+        // The index can only be used if all x values are finite and sorted and all y values are finite
+        int valid;
+
+        // For each level the items with the minimum and maximum y value of each block.
+        // A block at level l contains (LOD_BLOCK_SIZE << l) items.
+        std::vector<std::vector<vtkIdType>> minItems;
+        std::vector<std::vector<vtkIdType>> maxItems;
+};
+
+vtkXYPlotDataLevelOfDetailIndex::vtkXYPlotDataLevelOfDetailIndex(vtkXYPlotData *plotData)
 {
-    auto points = vtkSmartPointer<vtkPoints>::New();
-    int numPoints;
-    int i;
+    vtkIdType numItems = plotData->GetNumberOfItems();
+    vtkIdType numBlocks;
+    vtkIdType i;
+    double prevX = VTK_DOUBLE_MIN;
 
-    if (xdata == nullptr && ydata == nullptr)
+    this->valid = 0;
+    for (i = 0; i < numItems; i++)
     {
-        vtkErrorMacro("x and y data cannot be both null");
-        return;
+        double x = plotData->GetXValue(i);
+        if (!vtkMath::IsFinite(x) || x < prevX || !vtkMath::IsFinite(plotData->GetYValue(i)))
+        {
+            return;
+        }
+        prevX = x;
     }
-    numPoints = xdata != nullptr ? xdata->GetNumberOfTuples() : ydata->GetNumberOfTuples();
+    this->valid = 1;
 
-    if (this->pointSet->GetNumberOfItems() == 0)
+    // finest level
+    numBlocks = (numItems + LOD_BLOCK_SIZE - 1) / LOD_BLOCK_SIZE;
+    this->minItems.emplace_back(numBlocks);
+    this->maxItems.emplace_back(numBlocks);
+    for (i = 0; i < numBlocks; i++)
     {
-        this->xrange[0] = VTK_DOUBLE_MAX;
-        this->xrange[1] = VTK_DOUBLE_MIN;
-        this->yrange[0] = VTK_DOUBLE_MAX;
-        this->yrange[1] = VTK_DOUBLE_MIN;
-        this->xrangeAbove0[0] = VTK_DOUBLE_MAX;
-        this->xrangeAbove0[1] = 0;
-        this->yrangeAbove0[0] = VTK_DOUBLE_MAX;
-        this->yrangeAbove0[1] = 0;
+        vtkIdType first = i * LOD_BLOCK_SIZE;
+        vtkIdType last = std::min(first + LOD_BLOCK_SIZE, numItems);
+        vtkIdType minItem = first;
+        vtkIdType maxItem = first;
+        double minY = plotData->GetYValue(first);
+        double maxY = minY;
+        vtkIdType j;
+
+        for (j = first + 1; j < last; j++)
+        {
+            double y = plotData->GetYValue(j);
+            if (y < minY)
+            {
+                minY = y;
+                minItem = j;
+            }
+            if (y > maxY)
+            {
+                maxY = y;
+                maxItem = j;
+            }
+        }
+        this->minItems[0][i] = minItem;
+        this->maxItems[0][i] = maxItem;
+    }
+
+    // each coarser level combines two blocks of the previous level
+    while (numBlocks > 1)
+    {
+        const std::vector<vtkIdType> &prevMinItems = this->minItems.back();
+        const std::vector<vtkIdType> &prevMaxItems = this->maxItems.back();
+        std::vector<vtkIdType> levelMinItems((numBlocks + 1) / 2);
+        std::vector<vtkIdType> levelMaxItems((numBlocks + 1) / 2);
+
+        for (i = 0; i < numBlocks / 2; i++)
+        {
+            vtkIdType a = prevMinItems[2 * i];
+            vtkIdType b = prevMinItems[2 * i + 1];
+            levelMinItems[i] = plotData->GetYValue(b) < plotData->GetYValue(a) ? b : a;
+            a = prevMaxItems[2 * i];
+            b = prevMaxItems[2 * i + 1];
+            levelMaxItems[i] = plotData->GetYValue(b) > plotData->GetYValue(a) ? b : a;
+        }
+        if (numBlocks % 2 == 1)
+        {
+            levelMinItems[numBlocks / 2] = prevMinItems[numBlocks - 1];
+            levelMaxItems[numBlocks / 2] = prevMaxItems[numBlocks - 1];
+        }
+        numBlocks = (numBlocks + 1) / 2;
+        this->minItems.push_back(std::move(levelMinItems));
+        this->maxItems.push_back(std::move(levelMaxItems));
     }
+}
+
+void vtkXYPlotDataLevelOfDetailIndex::GetMinMaxItem(vtkXYPlotData *plotData, vtkIdType first, vtkIdType last,
+                                                    vtkIdType &minItem, vtkIdType &maxItem)
+{
+    int numLevels = static_cast<int>(this->minItems.size());
+    double minY;
+    double maxY;
+    vtkIdType i;
+
+    minItem = first;
+    maxItem = first;
+    minY = plotData->GetYValue(first);
+    maxY = minY;
 
-    points->SetNumberOfPoints(numPoints);
-    for (i = 0; i < numPoints; i++)
+    i = first;
+    while (i < last)
     {
-        double x = xdata == nullptr ? i : xdata->GetValue(i);
-        double y = ydata == nullptr ? i : ydata->GetValue(i);
+        vtkIdType candidateMin = i;
+        vtkIdType candidateMax = i;
+        vtkIdType step = 1;
+
+        if (i % LOD_BLOCK_SIZE == 0)
+        {
+            // use the coarsest block that starts at i and fits within the range
+            int level;
 
-        points->SetPoint(i, x, y, 0);
+            for (level = numLevels - 1; level >= 0; level--)
+            {
+                vtkIdType blockSize = (vtkIdType)LOD_BLOCK_SIZE << level;
+                if (i % blockSize == 0 && i + blockSize <= last)
+                {
+                    candidateMin = this->minItems[level][i / blockSize];
+                    candidateMax = this->maxItems[level][i / blockSize];
+                    step = blockSize;
+                    break;
+                }
+            }
+        }
 
-        if (vtkMath::IsFinite(x))
+        double y = plotData->GetYValue(candidateMin);
+        if (y < minY)
         {
-            if (x < this->xrange[0])
+            minY = y;
+            minItem = candidateMin;
+        }
+        y = plotData->GetYValue(candidateMax);
+        if (y > maxY)
+        {
+            maxY = y;
+            maxItem = candidateMax;
+        }
+        i += step;
+    }
+}
+
+template <class T>
+static void UpdateDataRange(const T *data, vtkIdType numValues, double range[2], double rangeAbove0[2])
+{
+    vtkIdType i;
+
+    for (i = 0; i < numValues; i++)
+    {
+        double value = static_cast<double>(data[i]);
+
+        if (vtkMath::IsFinite(value))
+        {
+            if (value < range[0])
             {
-                this->xrange[0] = x;
+                range[0] = value;
             }
-            if (x > this->xrange[1])
+            if (value > range[1])
             {
-                this->xrange[1] = x;
+                range[1] = value;
             }
-            if (x > 0)
+            if (value > 0)
             {
-                if (x < this->xrangeAbove0[0])
+                if (value < rangeAbove0[0])
                 {
-                    this->xrangeAbove0[0] = x;
+                    rangeAbove0[0] = value;
                 }
-                if (x > this->xrangeAbove0[1])
+                if (value > rangeAbove0[1])
                 {
-                    this->xrangeAbove0[1] = x;
+                    rangeAbove0[1] = value;
                 }
             }
         }
-        if (vtkMath::IsFinite(y))
+    }
+}
+
+static void UpdateDataRange(vtkDataArray *data, vtkIdType numValues, double range[2], double rangeAbove0[2])
+{
+    if (data == nullptr)
+    {
+        // the index of each value is used as value
+        if (numValues > 0)
         {
-            if (y < this->yrange[0])
+            if (0 < range[0])
             {
-                this->yrange[0] = y;
+                range[0] = 0;
             }
-            if (y > this->yrange[1])
+            if (numValues - 1 > range[1])
             {
-                this->yrange[1] = y;
+                range[1] = numValues - 1;
             }
-            if (y > 0)
+        }
+        if (numValues > 1)
+        {
+            if (1 < rangeAbove0[0])
             {
-                if (y < this->yrangeAbove0[0])
-                {
-                    this->yrangeAbove0[0] = y;
-                }
-                if (y > this->yrangeAbove0[1])
-                {
-                    this->yrangeAbove0[1] = y;
-                }
+                rangeAbove0[0] = 1;
+            }
+            if (numValues - 1 > rangeAbove0[1])
+            {
+                rangeAbove0[1] = numValues - 1;
             }
         }
+        return;
     }
 
-    this->pointSet->AddItem(points.GetPointer());
+    switch (data->GetDataType())
+    {
+        vtkTemplateMacro(UpdateDataRange(static_cast<const VTK_TT *>(data->GetVoidPointer(0)), numValues, range,
+                                         rangeAbove0));
+    }
+}
+
+vtkStandardNewMacro(vtkXYPlotData);
+
+vtkXYPlotData::vtkXYPlotData()
+{
+    this->xrange[0] = 1;
+    this->xrange[1] = 0;
+    this->yrange[0] = 1;
+    this->yrange[1] = 0;
+    this->xrangeAbove0[0] = 1;
+    this->xrangeAbove0[1] = 0;
+    this->yrangeAbove0[0] = 1;
+    this->yrangeAbove0[1] = 0;
+    this->currentXData = nullptr;
+    this->currentYData = nullptr;
+    this->currentXOffset = 0;
+    this->currentYOffset = 0;
+    this->currentNumberOfItems = 0;
+    this->currentKeyframe = 0;
+}
 
-    if (this->pointSet->GetNumberOfItems() == 1)
+vtkXYPlotData::~vtkXYPlotData()
+{
+}
+
+void vtkXYPlotData::AddData(vtkDataArray *xdata, vtkDataArray *ydata)
+{
+    if (xdata == nullptr && ydata == nullptr)
+    {
+        vtkErrorMacro("x and y data cannot be both null");
+        return;
+    }
+    this->AddKeyframes(xdata, ydata, 1,
+                       static_cast<int>(xdata != nullptr ? xdata->GetNumberOfTuples() : ydata->GetNumberOfTuples()));
+}
+
+void vtkXYPlotData::AddKeyframes(vtkDataArray *xdata, vtkDataArray *ydata, int numKeyframes, int numItems)
+{
+    vtkIdType numXValues = numItems;
+    vtkIdType numYValues = numItems;
+    int i;
+
+    if (xdata == nullptr && ydata == nullptr)
+    {
+        vtkErrorMacro("x and y data cannot be both null");
+        return;
+    }
+    if ((xdata != nullptr && xdata->GetNumberOfComponents() != 1) ||
+        (ydata != nullptr && ydata->GetNumberOfComponents() != 1))
+    {
+        vtkErrorMacro("x and y data should have a single component");
+        return;
+    }
+    if (numKeyframes < 1 || numItems < 0)
+    {
+        vtkErrorMacro("invalid number of keyframes or items");
+        return;
+    }
+    if (xdata != nullptr)
+    {
+        numXValues = xdata->GetNumberOfTuples();
+        if (numXValues != numItems && numXValues != (vtkIdType)numKeyframes * numItems)
+        {
+            vtkErrorMacro("number of x values does not match the number of keyframes and items");
+            return;
+        }
+    }
+    if (ydata != nullptr)
+    {
+        numYValues = ydata->GetNumberOfTuples();
+        if (numYValues != numItems && numYValues != (vtkIdType)numKeyframes * numItems)
+        {
+            vtkErrorMacro("number of y values does not match the number of keyframes and items");
+            return;
+        }
+    }
+
+    if (this->xdataSet.empty())
+    {
+        this->xrange[0] = VTK_DOUBLE_MAX;
+        this->xrange[1] = VTK_DOUBLE_MIN;
+        this->yrange[0] = VTK_DOUBLE_MAX;
+        this->yrange[1] = VTK_DOUBLE_MIN;
+        this->xrangeAbove0[0] = VTK_DOUBLE_MAX;
+        this->xrangeAbove0[1] = 0;
+        this->yrangeAbove0[0] = VTK_DOUBLE_MAX;
+        this->yrangeAbove0[1] = 0;
+    }
+
+    UpdateDataRange(xdata, numXValues, this->xrange, this->xrangeAbove0);
+    UpdateDataRange(ydata, numYValues, this->yrange, this->yrangeAbove0);
+
+    for (i = 0; i < numKeyframes; i++)
+    {
+        this->xdataSet.push_back(xdata);
+        this->ydataSet.push_back(ydata);
+        this->xoffsetSet.push_back(numXValues == numItems ? 0 : (vtkIdType)i * numItems);
+        this->yoffsetSet.push_back(numYValues == numItems ? 0 : (vtkIdType)i * numItems);
+        this->numberOfItemsSet.push_back(numItems);
+        this->levelOfDetailIndex.emplace_back(nullptr);
+    }
+
+    if (this->xdataSet.size() == (size_t)numKeyframes)
     {
         this->SetKeyframe(0);
     }
@@ -139,35 +372,162 @@ void vtkXYPlotData::AddData(vtkDoubleArray *xdata, vtkDoubleArray *ydata)
     this->Modified();
 }
 
-void vtkXYPlotData::SetData(vtkDoubleArray *xdata, vtkDoubleArray *ydata)
+void vtkXYPlotData::SetData(vtkDataArray *xdata, vtkDataArray *ydata)
 {
-    this->pointSet = vtkSmartPointer<vtkCollection>::New();
+    this->xdataSet.clear();
+    this->ydataSet.clear();
+    this->xoffsetSet.clear();
+    this->yoffsetSet.clear();
+    this->numberOfItemsSet.clear();
+    this->levelOfDetailIndex.clear();
+    this->currentXData = nullptr;
+    this->currentYData = nullptr;
+    this->currentXOffset = 0;
+    this->currentYOffset = 0;
+    this->currentNumberOfItems = 0;
     this->AddData(xdata, ydata);
 }
 
 void vtkXYPlotData::SetKeyframe(int keyframe)
 {
-    if (this->pointSet->GetNumberOfItems() == 0)
+    int numKeyframes = this->GetNumberOfKeyframes();
+
+    if (numKeyframes == 0)
     {
         return;
     }
 
-    if (keyframe >= this->pointSet->GetNumberOfItems())
+    if (keyframe >= numKeyframes)
     {
-        keyframe = this->pointSet->GetNumberOfItems() - 1;
+        keyframe = numKeyframes - 1;
     }
     if (keyframe < 0)
     {
         keyframe = 0;
     }
 
-    this->currentPoints = vtkPoints::SafeDownCast(this->pointSet->GetItemAsObject(keyframe));
+    this->currentKeyframe = keyframe;
+    this->currentXData = this->xdataSet[keyframe];
+    this->currentYData = this->ydataSet[keyframe];
+    this->currentXOffset = this->xoffsetSet[keyframe];
+    this->currentYOffset = this->yoffsetSet[keyframe];
+    this->currentNumberOfItems = this->numberOfItemsSet[keyframe];
     this->Modified();
 }
 
+vtkIdType vtkXYPlotData::FindItemByXValue(double x, int upper)
+{
+    vtkIdType first = 0;
+    vtkIdType last = this->GetNumberOfItems();
+
+    while (first < last)
+    {
+        vtkIdType middle = first + (last - first) / 2;
+        double value = this->GetXValue(middle);
+        if (value < x || (upper && value == x))
+        {
+            first = middle + 1;
+        }
+        else
+        {
+            last = middle;
+        }
+    }
+
+    return first;
+}
+
+int vtkXYPlotData::ComputeLevelOfDetailPoints(vtkPoints *pts, double dataBounds[6])
+{
+    vtkXYPlotDataLevelOfDetailIndex *index;
+    vtkIdType numItems = this->GetNumberOfItems();
+    vtkIdType firstItem;
+    vtkIdType lastItem;
+    vtkIdType columnFirstItem;
+    int numColumns;
+    int column;
+
+    if (this->ViewportBounds[0] >= this->ViewportBounds[1] || dataBounds[0] >= dataBounds[1])
+    {
+        return 0;
+    }
+    if (this->LogY && this->yrange[0] <= 0)
+    {
+        // non-positive values break up the line when using a logarithmic axis
+        return 0;
+    }
+    numColumns = static_cast<int>(ceil(this->ViewportBounds[1] - this->ViewportBounds[0]));
+    if (numItems <= 4 * numColumns)
+    {
+        return 0;
+    }
+
+    if (!this->levelOfDetailIndex[this->currentKeyframe])
+    {
+        this->levelOfDetailIndex[this->currentKeyframe].reset(new vtkXYPlotDataLevelOfDetailIndex(this));
+    }
+    index = this->levelOfDetailIndex[this->currentKeyframe].get();
+    if (!index->valid)
+    {
+        return 0;
+    }
+
+    // include the items just outside the x range, so line clipping at the plot boundaries is not affected
+    firstItem = this->FindItemByXValue(dataBounds[0], 0);
+    lastItem = this->FindItemByXValue(dataBounds[1], 1);
+    if (firstItem > 0)
+    {
+        pts->InsertNextPoint(this->GetXValue(firstItem - 1), this->GetYValue(firstItem - 1), 0);
+    }
+
+    columnFirstItem = firstItem;
+    for (column = 0; column < numColumns; column++)
+    {
+        vtkIdType columnLastItem;
+        vtkIdType items[4];
+        int i;
+
+        if (column == numColumns - 1)
+        {
+            columnLastItem = lastItem;
+        }
+        else
+        {
+            double x = this->ViewportBounds[0] + (column + 1) * (this->ViewportBounds[1] - this->ViewportBounds[0]) /
+                numColumns;
+            this->ViewportToData(x, this->ViewportBounds, dataBounds, this->LogX);
+            columnLastItem = std::max(columnFirstItem, std::min(this->FindItemByXValue(x, 0), lastItem));
+        }
+        if (columnLastItem == columnFirstItem)
+        {
+            continue;
+        }
+
+        items[0] = columnFirstItem;
+        index->GetMinMaxItem(this, columnFirstItem, columnLastItem, items[1], items[2]);
+        items[3] = columnLastItem - 1;
+        std::sort(items, items + 4);
+        for (i = 0; i < 4; i++)
+        {
+            if (i == 0 || items[i] != items[i - 1])
+            {
+                pts->InsertNextPoint(this->GetXValue(items[i]), this->GetYValue(items[i]), 0);
+            }
+        }
+        columnFirstItem = columnLastItem;
+    }
+
+    if (lastItem < numItems)
+    {
+        pts->InsertNextPoint(this->GetXValue(lastItem), this->GetYValue(lastItem), 0);
+    }
+
+    return 1;
+}
+
 int vtkXYPlotData::GetNumberOfKeyframes()
 {
-    return this->pointSet->GetNumberOfItems();
+    return static_cast<int>(this->xdataSet.size());
 }
 
 void vtkXYPlotData::GetDataRange(double range[2], int dim)
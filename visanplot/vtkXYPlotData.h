@@ -33,8 +33,14 @@
 #define __vtkXYPlotData_h
 
 #include "vtkPlotData.h"
+#include "vtkDataArray.h"
 #include "visanplotModule.h"
 
+#include <memory>
+#include <vector>
+
+class vtkXYPlotDataLevelOfDetailIndex;
+
 class VISANPLOT_EXPORT vtkXYPlotData : public vtkPlotData
 {
     public:
@@ -45,19 +51,31 @@ class VISANPLOT_EXPORT vtkXYPlotData : public vtkPlotData
         void SetKeyframe(int keyframe);
         int GetNumberOfKeyframes();
 
-        void AddData(vtkDoubleArray *xdata, vtkDoubleArray *ydata);
-        void SetData(vtkDoubleArray *xdata, vtkDoubleArray *ydata);
+        // Add the x/y values for a new keyframe.
+        // The arrays should have a single component. They are not copied; a reference is kept instead, so the
+        // array contents should not be modified afterwards. Any numeric array type is supported, but double and
+        // float arrays (e.g. wrapped numpy buffers) are used without conversion.
+        // If xdata (or ydata) is null then the index of each value will be used for that dimension.
+        void AddData(vtkDataArray *xdata, vtkDataArray *ydata);
+        void SetData(vtkDataArray *xdata, vtkDataArray *ydata);
+
+        // Add a block of keyframes at once.
+        // Each keyframe has numItems x/y values. The xdata and ydata arrays should either contain numItems values
+        // (which are then shared by all keyframes) or numKeyframes * numItems values (stored keyframe after
+        // keyframe). As with AddData() the arrays are referenced and not copied and a null array means that the
+        // index of each value is used. The data ranges are computed in a single pass over the block.
+        void AddKeyframes(vtkDataArray *xdata, vtkDataArray *ydata, int numKeyframes, int numItems);
 
         void GetDataRange(double range[2], int dim) override;
         void GetDataRangeAbove0(double range[2], int dim) override;
 
         double GetXValue(int i) override
         {
-            return this->currentPoints->GetPoint(i)[0];
+            return this->currentXData == nullptr ? i : this->currentXData->GetComponent(this->currentXOffset + i, 0);
         }
         double GetYValue(int i) override
         {
-            return this->currentPoints->GetPoint(i)[1];
+            return this->currentYData == nullptr ? i : this->currentYData->GetComponent(this->currentYOffset + i, 0);
         }
         double GetZValue(int) override
         {
@@ -65,11 +83,21 @@ class VISANPLOT_EXPORT vtkXYPlotData : public vtkPlotData
         }
         int GetNumberOfItems() override
         {
-            return this->currentPoints->GetNumberOfPoints();
+            return this->currentNumberOfItems;
         }
 
     protected:
         vtkXYPlotData();
+        ~vtkXYPlotData() override;
+
+        // Reduce the data to the first, last, minimum and maximum point per pixel column (of the x-axis).
+        // This is only done if the x values are sorted and all values are finite.
+        // The minimum/maximum search uses a multi-resolution index that is built on first use for each keyframe.
+        int ComputeLevelOfDetailPoints(vtkPoints *pts, double dataBounds[6]) override;
+
+        // Returns the index of the first item with an x value >= x (or > x if 'upper' is set).
+        // Should only be used when the x values are sorted.
+        vtkIdType FindItemByXValue(double x, int upper);
 
     protected:
         double xrange[2];
@@ -77,8 +105,20 @@ class VISANPLOT_EXPORT vtkXYPlotData : public vtkPlotData
         double xrangeAbove0[2];
         double yrangeAbove0[2];
 
-        vtkSmartPointer<vtkCollection> pointSet;
-        vtkPoints *currentPoints;
+        // For each keyframe the x/y arrays, the offset of the first value of the keyframe within these arrays,
+        // and the number of items
+        std::vector<vtkSmartPointer<vtkDataArray>> xdataSet;
+        std::vector<vtkSmartPointer<vtkDataArray>> ydataSet;
+        std::vector<vtkIdType> xoffsetSet;
+        std::vector<vtkIdType> yoffsetSet;
+        std::vector<int> numberOfItemsSet;
+        std::vector<std::unique_ptr<vtkXYPlotDataLevelOfDetailIndex>> levelOfDetailIndex;
+        vtkDataArray *currentXData;
+        vtkDataArray *currentYData;
+        vtkIdType currentXOffset;
+        vtkIdType currentYOffset;
+        int currentNumberOfItems;
+        int currentKeyframe;
 
     private:
         vtkXYPlotData(const vtkXYPlotData&) = delete;